@@ -1,9 +1,9 @@
 import os
 import json
 import asyncio
-import aiohttp
 from dotenv import load_dotenv
 from utils.logger import logger
+from utils.http_client import shared_http_client
 
 # Load environment variables
 load_dotenv()
@@ -38,71 +38,70 @@ async def process(input_data):
             logger.info("No action provided, using default 'get_transactions' for testing")
             action = "get_transactions"
         
-        async with aiohttp.ClientSession() as session:
-            if action == "get_transactions":
-                # Get all transactions
-                async with session.get(f"{api_url}/transactions") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            "success": True,
-                            "transactions": data.get("transactions", [])
-                        }
-                    else:
-                        return {
-                            "success": False,
-                            "error": f"Failed to fetch transactions: HTTP {response.status}"
-                        }
-                        
-            elif action == "add_transaction":
-                # Add a new transaction
-                transaction = input_data.get("transaction", {})
-                if not transaction:
-                    return {"error": "No transaction data provided"}
-                
-                # Validate transaction data
-                required_fields = ["amount", "description", "type"]
-                for field in required_fields:
-                    if field not in transaction:
-                        return {"error": f"Missing required field '{field}' in transaction data"}
-                
-                async with session.post(
-                    f"{api_url}/transactions", 
-                    json={
-                        "amount": transaction["amount"],
-                        "description": transaction["description"],
-                        "type": transaction["type"]
-                    }
-                ) as response:
-                    if response.status == 200 or response.status == 201:
-                        data = await response.json()
-                        return {
-                            "success": True,
-                            "transaction": data
-                        }
-                    else:
-                        return {
-                            "success": False,
-                            "error": f"Failed to add transaction: HTTP {response.status}"
-                        }
-                        
-            elif action == "get_report":
-                # Get AI-generated financial report
-                async with session.get(f"{api_url}/reports") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            "success": True,
-                            "report": data.get("report", "No report available.")
-                        }
-                    else:
-                        return {
-                            "success": False,
-                            "error": f"Failed to fetch report: HTTP {response.status}"
-                        }
+        if action == "get_transactions":
+            # Get all transactions (GETs are coalesced across concurrent baskets)
+            response = await shared_http_client.get(f"{api_url}/transactions")
+            if response.status_code == 200:
+                data = response.json()
+                return {
+                    "success": True,
+                    "transactions": data.get("transactions", [])
+                }
             else:
-                return {"error": f"Unknown action: {action}. Use 'get_transactions', 'add_transaction', or 'get_report'"}
-                
+                return {
+                    "success": False,
+                    "error": f"Failed to fetch transactions: HTTP {response.status_code}"
+                }
+
+        elif action == "add_transaction":
+            # Add a new transaction
+            transaction = input_data.get("transaction", {})
+            if not transaction:
+                return {"error": "No transaction data provided"}
+
+            # Validate transaction data
+            required_fields = ["amount", "description", "type"]
+            for field in required_fields:
+                if field not in transaction:
+                    return {"error": f"Missing required field '{field}' in transaction data"}
+
+            response = await shared_http_client.post(
+                f"{api_url}/transactions",
+                json={
+                    "amount": transaction["amount"],
+                    "description": transaction["description"],
+                    "type": transaction["type"]
+                }
+            )
+            if response.status_code == 200 or response.status_code == 201:
+                data = response.json()
+                return {
+                    "success": True,
+                    "transaction": data
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": f"Failed to add transaction: HTTP {response.status_code}"
+                }
+
+        elif action == "get_report":
+            # Get AI-generated financial report
+            response = await shared_http_client.get(f"{api_url}/reports")
+            if response.status_code == 200:
+                data = response.json()
+                return {
+                    "success": True,
+                    "report": data.get("report", "No report available.")
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": f"Failed to fetch report: HTTP {response.status_code}"
+                }
+        else:
+            return {"error": f"Unknown action: {action}. Use 'get_transactions', 'add_transaction', or 'get_report'"}
+
     except Exception as e:
         logger.error(f"Financial Coordinator API error: {str(e)}")
         return {"error": f"Financial Coordinator processing failed: {str(e)}"}
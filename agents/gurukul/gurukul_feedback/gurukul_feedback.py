@@ -2,6 +2,7 @@ import os
 import httpx
 from typing import Dict
 from utils.logger import logger
+from utils.http_client import shared_http_client
 
 async def process(input_data: Dict) -> Dict:
     try:
@@ -15,12 +16,12 @@ async def process(input_data: Dict) -> Dict:
             }
         
         logger.debug(f"Calling gurukul_feedback API: {api_url} with input: {input_data}")
-        async with httpx.AsyncClient() as client:
-            response = await client.post(api_url, json=input_data, timeout=30)
-            response.raise_for_status()
-            result = response.json()
-            logger.debug(f"Received response: {result}")
-            return result
+        # Pooled connection (not coalesced: the POST may not be idempotent)
+        response = await shared_http_client.post(api_url, json=input_data, timeout=30)
+        response.raise_for_status()
+        result = response.json()
+        logger.debug(f"Received response: {result}")
+        return result
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error calling gurukul_feedback API: {e.response.status_code} - {e.response.text}")
         return {"error": f"HTTP {e.response.status_code}: {e.response.text}"}
@@ -17,12 +17,14 @@ import time
 import logging
 import traceback
 import asyncio
+import copy
+from collections import OrderedDict
 from datetime import datetime
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional
 import uuid
 import json
-import aiohttp
-import requests
+import httpx
 
 # Add the current directory to Python path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -42,6 +44,20 @@ except ImportError:
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
 
+try:
+    from agents.law_agent.legal_domain_index import LEGAL_DOMAIN_KEYWORDS, classify, classify_many, score_domains
+    from agents.law_agent.learning_store import get_learning_store
+except ImportError:
+    # Standalone server (python law_agent.py): the package is not importable
+    from legal_domain_index import LEGAL_DOMAIN_KEYWORDS, classify, classify_many, score_domains
+    from learning_store import get_learning_store
+
+try:
+    from utils.http_client import shared_http_client
+except ImportError:
+    # Standalone server without the bucket utils: one pooled client of our own
+    shared_http_client = None
+
 # ============================================================================
 # Pydantic Models for FastAPI (if FastAPI available)
 # ============================================================================
@@ -184,27 +200,14 @@ class BasicLegalAgent:
     """Basic legal agent for domain classification and guidance"""
 
     def __init__(self):
-        self.domains = {
-            "tenant_rights": ["rent", "landlord", "tenant", "eviction", "lease"],
-            "employment_law": ["job", "termination", "fired", "workplace", "salary", "contract"],
-            "family_law": ["divorce", "child custody", "marriage", "alimony", "adoption"],
-            "consumer_protection": ["warranty", "refund", "consumer", "purchase", "defective"],
-            "criminal_law": ["arrest", "police", "criminal", "charge", "court"],
-            "civil_rights": ["discrimination", "rights", "constitution", "freedom"],
-            "immigration_law": ["visa", "immigration", "citizenship", "green card"],
-            "business_law": ["contract", "business", "partnership", "corporation"],
-            "intellectual_property": ["copyright", "patent", "trademark", "IP"],
-            "environmental_law": ["environment", "pollution", "regulation", "compliance"],
-            "tax_law": ["tax", "IRS", "income tax", "deduction"],
-            "bankruptcy_law": ["bankruptcy", "debt", "creditor", "chapter"]
-        }
+        self.domains = LEGAL_DOMAIN_KEYWORDS
 
     def process_query(self, query_input: LegalQueryInput) -> Dict[str, Any]:
         """Process a legal query using basic analysis"""
         try:
-            query = query_input.user_input.lower()
-            domain = self._classify_domain(query)
-            confidence = self._calculate_confidence(query, domain)
+            classification = classify(query_input.user_input)
+            domain = classification["domain"]
+            confidence = classification["confidence"]
 
             response = {
                 "session_id": query_input.session_id,
@@ -226,15 +229,25 @@ class BasicLegalAgent:
             logger.error(f"Basic agent error: {e}")
             raise
 
+    def classify_many(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """Classify a batch of queries (domain, confidence and per-domain scores)"""
+        return classify_many(queries)
+
 
 class AdaptiveLegalAgent(BasicLegalAgent):
     """Adaptive legal agent with learning capabilities"""
 
     def __init__(self):
         super().__init__()
-        self.learning_data = {}
+        # Learning aggregates are shared across workers through Redis
+        self.learning_store = get_learning_store()
         self.confidence_history = []
 
+    @property
+    def learning_data(self) -> Dict[str, Dict[str, Any]]:
+        """Per-domain feedback count and average confidence (snapshot, never blocks)"""
+        return self.learning_store.get_learning_data()
+
     def process_query_with_learning(self, query_input: LegalQueryInput) -> Dict[str, Any]:
         """Process query with adaptive learning"""
         try:
@@ -328,20 +341,172 @@ def create_enhanced_legal_agent() -> EnhancedLegalAgent:
 # Basket System Integration
 # ============================================================================
 
+# Execution mode: "local" serves queries in-process, "remote" forwards them to
+# the hosted legal API, "auto" runs locally and falls back to the remote API
+LAW_AGENT_MODE = os.getenv("LAW_AGENT_MODE", "local").lower()
+LAW_AGENT_API_URL = os.getenv("LAW_AGENT_API_URL", "https://legal-agent-api-3yqg.onrender.com")
+LAW_AGENT_REMOTE_TIMEOUT = float(os.getenv("LAW_AGENT_REMOTE_TIMEOUT", "30"))
+LAW_AGENT_CACHE_MAX_ENTRIES = int(os.getenv("LAW_AGENT_CACHE_MAX_ENTRIES", "1024"))
+LAW_AGENT_CACHE_TTL_SEC = float(os.getenv("LAW_AGENT_CACHE_TTL_SEC", "300"))
+
+REMOTE_ENDPOINTS = {
+    "basic": "/basic-query",
+    "adaptive": "/adaptive-query",
+    "enhanced": "/enhanced-query"
+}
+
+
+class LegalResponseCache:
+    """TTL + LRU cache of legal responses keyed by normalised query, agent type and location.
+    Only the query-derived analysis is shared: session_id, timestamp and raw_query
+    belong to each caller and are regenerated on every hit."""
+
+    PER_CALL_FIELDS = ("session_id", "timestamp", "raw_query")
+
+    def __init__(self, max_entries: int = LAW_AGENT_CACHE_MAX_ENTRIES, ttl_seconds: float = LAW_AGENT_CACHE_TTL_SEC):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(query: str, agent_type: str, location: Optional[str]) -> tuple:
+        return (" ".join(query.lower().split()), agent_type, " ".join((location or "").lower().split()))
+
+    def get(self, key: tuple, query: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Cached analysis stamped with a fresh session_id and timestamp (and the caller's query)"""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        _, body, per_call = entry
+        response = copy.deepcopy(body)
+        if "session_id" in per_call:
+            prefix = str(per_call["session_id"]).rpartition("_")[0] or "session"
+            response["session_id"] = f"{prefix}_{uuid.uuid4().hex[:12]}"
+        if "timestamp" in per_call:
+            response["timestamp"] = datetime.now().isoformat()
+        if "raw_query" in per_call:
+            response["raw_query"] = query if query is not None else per_call["raw_query"]
+        return response
+
+    def set(self, key: tuple, response: Dict[str, Any]):
+        body = copy.deepcopy({k: v for k, v in response.items() if k not in self.PER_CALL_FIELDS})
+        per_call = {k: response[k] for k in self.PER_CALL_FIELDS if k in response}
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, body, per_call)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+_response_cache = LegalResponseCache()
+_remote_client: Optional[httpx.AsyncClient] = None
+
+
+def get_response_cache() -> LegalResponseCache:
+    """Get the shared legal response cache"""
+    return _response_cache
+
+
+async def _post_remote(endpoint: str, payload: Dict[str, Any], coalesce: bool) -> httpx.Response:
+    """POST through the bucket's shared pooled client (or a module-level pool when standalone)"""
+    global _remote_client
+    if shared_http_client is not None:
+        return await shared_http_client.post(endpoint, json=payload, timeout=LAW_AGENT_REMOTE_TIMEOUT, coalesce=coalesce)
+    if _remote_client is None or _remote_client.is_closed:
+        _remote_client = httpx.AsyncClient(
+            timeout=LAW_AGENT_REMOTE_TIMEOUT,
+            limits=httpx.Limits(max_connections=20, keepalive_expiry=60)
+        )
+    return await _remote_client.post(endpoint, json=payload)
+
+
+def _process_local(query: str, agent_type: str, location: Optional[str], feedback: Any) -> Dict[str, Any]:
+    """Serve a query with the in-process legal agents"""
+    session_id = f"basket_{uuid.uuid4().hex[:12]}"
+    if agent_type == "enhanced":
+        return get_enhanced_agent().process_enhanced_query(query, location)
+    query_input = LegalQueryInput(
+        user_input=query,
+        feedback=str(feedback) if feedback else None,
+        session_id=session_id
+    )
+    if agent_type == "adaptive":
+        return get_adaptive_agent().process_query_with_learning(query_input)
+    return get_basic_agent().process_query(query_input)
+
+
+async def _process_remote(query: str, agent_type: str, location: Optional[str], feedback: Any) -> Dict[str, Any]:
+    """Forward a query to the hosted legal API"""
+    endpoint = f"{LAW_AGENT_API_URL}{REMOTE_ENDPOINTS.get(agent_type, REMOTE_ENDPOINTS['basic'])}"
+    payload = {
+        "user_input": query,
+        "feedback": str(feedback) if feedback else None
+    }
+    if agent_type == "enhanced":
+        payload["location"] = location
+    elif agent_type == "adaptive":
+        payload["enable_learning"] = True
+
+    if feedback:
+        # Feedback drives remote learning, so it gets its own session and call
+        payload["session_id"] = f"basket_{uuid.uuid4().hex[:12]}"
+
+    logger.info(f"Making request to {endpoint} with payload: {payload}")
+    try:
+        # Without a per-call session id, identical concurrent queries share one upstream call
+        response = await _post_remote(endpoint, payload, coalesce=not feedback)
+        if response.status_code == 200:
+            result = response.json()
+            logger.info(f"Successfully received response from Render API for {agent_type} agent")
+            return result
+        error_text = response.text
+        logger.error(f"Render API error {response.status_code}: {error_text}")
+        return {
+            "error": f"Render API error: {response.status_code}",
+            "details": error_text,
+            "agent_type": "law_agent"
+        }
+    except httpx.TimeoutException:
+        logger.error("Timeout connecting to Render API")
+        return {"error": "Timeout connecting to legal service", "agent_type": "law_agent"}
+
+
 async def process(input_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Main processing function for basket system integration
-    Now makes HTTP requests to Render API instead of local processing
+    Serves queries in-process by default; LAW_AGENT_MODE=remote forwards them to
+    the Render API and LAW_AGENT_MODE=auto falls back to it when local processing fails
 
     Args:
         input_data: Dictionary containing query parameters
 
     Returns:
-        Dictionary containing legal analysis results from Render API
+        Dictionary containing legal analysis results
     """
     try:
-        logger.info("Law Agent forwarding request to Render API")
-
         # Extract parameters
         query = input_data.get("query", "")
         agent_type = input_data.get("agent_type", "basic")
@@ -351,57 +516,30 @@ async def process(input_data: Dict[str, Any]) -> Dict[str, Any]:
         if not query:
             return {"error": "No query provided"}
 
-        # Render API base URL
-        base_url = "https://legal-agent-api-3yqg.onrender.com"
-        
-        # Determine endpoint based on agent type
-        if agent_type == "enhanced":
-            endpoint = f"{base_url}/enhanced-query"
-            payload = {
-                "user_input": query,
-                "location": location,
-                "feedback": str(feedback) if feedback else None,
-                "session_id": f"basket_{uuid.uuid4().hex[:12]}"
-            }
-        elif agent_type == "adaptive":
-            endpoint = f"{base_url}/adaptive-query"
-            payload = {
-                "user_input": query,
-                "enable_learning": True,
-                "feedback": str(feedback) if feedback else None,
-                "session_id": f"basket_{uuid.uuid4().hex[:12]}"
-            }
-        else:  # basic
-            endpoint = f"{base_url}/basic-query"
-            payload = {
-                "user_input": query,
-                "feedback": str(feedback) if feedback else None,
-                "session_id": f"basket_{uuid.uuid4().hex[:12]}"
-            }
+        # Feedback drives adaptive learning, so those calls are never served from cache
+        cache_key = None if feedback else _response_cache.make_key(query, agent_type, location)
+        if cache_key is not None:
+            cached = _response_cache.get(cache_key, query)
+            if cached is not None:
+                return cached
+
+        if LAW_AGENT_MODE == "remote":
+            result = await _process_remote(query, agent_type, location, feedback)
+        else:
+            try:
+                result = _process_local(query, agent_type, location, feedback)
+            except Exception as e:
+                if LAW_AGENT_MODE != "auto":
+                    raise
+                logger.warning(f"Local law agent failed, falling back to Render API: {e}")
+                result = await _process_remote(query, agent_type, location, feedback)
+
+        if cache_key is not None and "error" not in result:
+            _response_cache.set(cache_key, result)
+        return result
 
-        # Make HTTP request to Render API
-        logger.info(f"Making request to {endpoint} with payload: {payload}")
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(endpoint, json=payload, timeout=30) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    logger.info(f"Successfully received response from Render API for {agent_type} agent")
-                    return result
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Render API error {response.status}: {error_text}")
-                    return {
-                        "error": f"Render API error: {response.status}",
-                        "details": error_text,
-                        "agent_type": "law_agent"
-                    }
-
-    except aiohttp.ClientTimeout:
-        logger.error("Timeout connecting to Render API")
-        return {"error": "Timeout connecting to legal service", "agent_type": "law_agent"}
     except Exception as e:
-        logger.error(f"Law Agent API forwarding error: {e}")
+        logger.error(f"Law Agent processing error: {e}")
         return {"error": str(e), "agent_type": "law_agent"}
 
 
@@ -415,11 +553,7 @@ _adaptive_agent = None
 _enhanced_agent = None
 
 _stats = {
-    "total_queries": 0,
-    "queries_by_agent": {"basic": 0, "adaptive": 0, "enhanced": 0},
-    "start_time": datetime.now(),
-    "feedback_count": 0,
-    "error_count": 0
+    "start_time": datetime.now()
 }
 
 def get_basic_agent():
@@ -464,8 +598,9 @@ def generate_session_id() -> str:
 
 def update_stats(agent_type: str):
     """Update usage statistics"""
-    _stats["total_queries"] += 1
-    _stats["queries_by_agent"][agent_type] += 1
+    store = get_learning_store()
+    store.incr_stat("total_queries")
+    store.incr_stat(f"queries:{agent_type}")
 
 # ============================================================================
 # Standalone FastAPI Server (if FastAPI available)
@@ -596,12 +731,13 @@ if FASTAPI_AVAILABLE:
             uptime_hours = uptime_seconds / 3600
             uptime_str = f"{uptime_hours:.1f} hours"
 
+            stats = get_learning_store().get_stats()
             return StatsResponse(
-                total_queries=_stats["total_queries"],
-                queries_by_agent=_stats["queries_by_agent"],
+                total_queries=stats.get("total_queries", 0),
+                queries_by_agent={agent: stats.get(f"queries:{agent}", 0) for agent in ("basic", "adaptive", "enhanced")},
                 average_confidence=0.75,
                 top_domains=[],
-                feedback_stats={"total_feedback": _stats["feedback_count"]},
+                feedback_stats={"total_feedback": stats.get("feedback_count", 0)},
                 uptime=uptime_str,
                 last_updated=datetime.now()
             )
@@ -624,54 +760,44 @@ else:
 # Add helper methods to BasicLegalAgent
 def _classify_domain(self, query: str) -> str:
     """Classify the legal domain based on query content"""
-    max_score = 0
-    best_domain = "general_law"
-
-    for domain, keywords in self.domains.items():
-        score = sum(1 for keyword in keywords if keyword in query)
-        if score > max_score:
-            max_score = score
-            best_domain = domain
-
-    return best_domain
+    return classify(query)["domain"]
 
 def _calculate_confidence(self, query: str, domain: str) -> float:
     """Calculate confidence score for domain classification"""
-    keywords = self.domains.get(domain, [])
-    matched_keywords = sum(1 for keyword in keywords if keyword in query)
-    total_keywords = len(keywords)
-
-    if total_keywords == 0:
+    keywords = self.domains.get(domain, ())
+    if not keywords:
         return 0.5
-
-    confidence = min(matched_keywords / total_keywords, 1.0)
+    matched_keywords = score_domains(query).get(domain, 0)
+    confidence = min(matched_keywords / len(keywords), 1.0)
     return max(confidence, 0.3)  # Minimum confidence of 0.3
 
+LEGAL_ROUTES = MappingProxyType({
+    "tenant_rights": "File complaint with housing authority or small claims court",
+    "employment_law": "File complaint with labor department or EEOC",
+    "family_law": "Consult family law attorney or file petition in family court",
+    "criminal_law": "Contact criminal defense attorney immediately",
+    "civil_rights": "File complaint with civil rights commission",
+    "business_law": "Consult business attorney for contract review",
+    "tax_law": "Consult tax professional or file appeal with IRS"
+})
+
 def _get_legal_route(self, domain: str) -> str:
     """Get recommended legal route for domain"""
-    routes = {
-        "tenant_rights": "File complaint with housing authority or small claims court",
-        "employment_law": "File complaint with labor department or EEOC",
-        "family_law": "Consult family law attorney or file petition in family court",
-        "criminal_law": "Contact criminal defense attorney immediately",
-        "civil_rights": "File complaint with civil rights commission",
-        "business_law": "Consult business attorney for contract review",
-        "tax_law": "Consult tax professional or file appeal with IRS"
-    }
-    return routes.get(domain, "Consult with legal professional")
+    return LEGAL_ROUTES.get(domain, "Consult with legal professional")
+
+LEGAL_TIMELINES = MappingProxyType({
+    "tenant_rights": "30-90 days",
+    "employment_law": "60-180 days",
+    "family_law": "90-365 days",
+    "criminal_law": "30-365 days",
+    "civil_rights": "90-365 days",
+    "business_law": "30-180 days",
+    "tax_law": "60-365 days"
+})
 
 def _get_timeline(self, domain: str) -> str:
     """Get typical timeline for legal process"""
-    timelines = {
-        "tenant_rights": "30-90 days",
-        "employment_law": "60-180 days",
-        "family_law": "90-365 days",
-        "criminal_law": "30-365 days",
-        "civil_rights": "90-365 days",
-        "business_law": "30-180 days",
-        "tax_law": "60-365 days"
-    }
-    return timelines.get(domain, "Varies by case complexity")
+    return LEGAL_TIMELINES.get(domain, "Varies by case complexity")
 
 def _get_outcome_prediction(self, domain: str, confidence: float) -> str:
     """Predict possible outcomes based on domain and confidence"""
@@ -682,37 +808,39 @@ def _get_outcome_prediction(self, domain: str, confidence: float) -> str:
     else:
         return "Case depends on specific circumstances"
 
+PROCESS_STEPS = MappingProxyType({
+    "tenant_rights": ["Gather evidence", "Document communications", "File complaint", "Attend hearing", "Follow up"],
+    "employment_law": ["Document incidents", "File complaint", "Mediation", "Investigation", "Resolution"],
+    "family_law": ["Gather documents", "File petition", "Serve other party", "Discovery", "Trial/Settlement"],
+    "criminal_law": ["Contact attorney", "Prepare defense", "Pre-trial motions", "Trial", "Sentencing"],
+    "civil_rights": ["Document discrimination", "File complaint", "Investigation", "Mediation", "Resolution"]
+})
+
 def _get_process_steps(self, domain: str) -> List[str]:
     """Get typical process steps for domain"""
-    steps = {
-        "tenant_rights": ["Gather evidence", "Document communications", "File complaint", "Attend hearing", "Follow up"],
-        "employment_law": ["Document incidents", "File complaint", "Mediation", "Investigation", "Resolution"],
-        "family_law": ["Gather documents", "File petition", "Serve other party", "Discovery", "Trial/Settlement"],
-        "criminal_law": ["Contact attorney", "Prepare defense", "Pre-trial motions", "Trial", "Sentencing"],
-        "civil_rights": ["Document discrimination", "File complaint", "Investigation", "Mediation", "Resolution"]
+    return list(PROCESS_STEPS.get(domain, ["Consult legal professional", "Gather evidence", "File appropriate paperwork", "Follow legal process"]))
+
+GLOSSARY_TERMS = MappingProxyType({
+    "tenant_rights": {
+        "eviction": "Legal process to remove a tenant from rental property",
+        "lease": "Contract between landlord and tenant",
+        "security_deposit": "Money held by landlord as guarantee"
+    },
+    "employment_law": {
+        "wrongful_termination": "Termination that violates employment laws",
+        "at-will_employment": "Employment that can be terminated by either party",
+        "constructive_discharge": "Work conditions so intolerable employee resigns"
+    },
+    "criminal_law": {
+        "due_process": "Legal requirement for fair treatment through normal judicial system",
+        "probable_cause": "Reasonable belief that crime has been committed",
+        "arraignment": "First court appearance where charges are read"
     }
-    return steps.get(domain, ["Consult legal professional", "Gather evidence", "File appropriate paperwork", "Follow legal process"])
+})
 
 def _get_glossary_terms(self, domain: str) -> Dict[str, str]:
     """Get relevant legal glossary terms for domain"""
-    glossaries = {
-        "tenant_rights": {
-            "eviction": "Legal process to remove a tenant from rental property",
-            "lease": "Contract between landlord and tenant",
-            "security_deposit": "Money held by landlord as guarantee"
-        },
-        "employment_law": {
-            "wrongful_termination": "Termination that violates employment laws",
-            "at-will_employment": "Employment that can be terminated by either party",
-            "constructive_discharge": "Work conditions so intolerable employee resigns"
-        },
-        "criminal_law": {
-            "due_process": "Legal requirement for fair treatment through normal judicial system",
-            "probable_cause": "Reasonable belief that crime has been committed",
-            "arraignment": "First court appearance where charges are read"
-        }
-    }
-    return glossaries.get(domain, {})
+    return dict(GLOSSARY_TERMS.get(domain, {}))
 
 # Add methods to BasicLegalAgent class
 BasicLegalAgent._classify_domain = _classify_domain
@@ -726,20 +854,14 @@ BasicLegalAgent._get_glossary_terms = _get_glossary_terms
 # Add adaptive methods
 def _learn_from_feedback(self, query_input: LegalQueryInput, response: Dict[str, Any]):
     """Learn from user feedback to improve future responses"""
-    domain = response["domain"]
-    if domain not in self.learning_data:
-        self.learning_data[domain] = {"feedback_count": 0, "avg_confidence": 0}
-
-    self.learning_data[domain]["feedback_count"] += 1
-    self.learning_data[domain]["avg_confidence"] = (
-        (self.learning_data[domain]["avg_confidence"] * (self.learning_data[domain]["feedback_count"] - 1)) +
-        response["confidence"]
-    ) / self.learning_data[domain]["feedback_count"]
+    self.learning_store.record_feedback(response["domain"], response["confidence"])
+    self.learning_store.incr_stat("feedback_count")
 
 def _calculate_confidence_improvement(self, domain: str) -> Optional[float]:
     """Calculate confidence improvement from learning"""
-    if domain in self.learning_data and self.learning_data[domain]["feedback_count"] > 1:
-        return self.learning_data[domain]["avg_confidence"] - 0.5  # Compare to baseline
+    data = self.learning_data.get(domain)
+    if data and data["feedback_count"] > 1:
+        return data["avg_confidence"] - 0.5  # Compare to baseline
     return None
 
 def _get_alternative_domains(self, domain: str) -> Optional[List[str]]:
@@ -755,29 +877,30 @@ AdaptiveLegalAgent._calculate_confidence_improvement = _calculate_confidence_imp
 AdaptiveLegalAgent._get_alternative_domains = _get_alternative_domains
 
 # Add enhanced methods
+CONSTITUTIONAL_ARTICLES = MappingProxyType({
+    "employment_law": ["Article I, Section 8", "Fourteenth Amendment"],
+    "civil_rights": ["First Amendment", "Fourteenth Amendment", "Fifteenth Amendment"],
+    "criminal_law": ["Fourth Amendment", "Fifth Amendment", "Sixth Amendment", "Eighth Amendment"],
+    "family_law": ["Fourteenth Amendment", "Nineteenth Amendment"]
+})
+
 def _get_constitutional_articles(self, domain: str) -> List[str]:
     """Get constitutional articles relevant to domain"""
-    articles = {
-        "employment_law": ["Article I, Section 8", "Fourteenth Amendment"],
-        "civil_rights": ["First Amendment", "Fourteenth Amendment", "Fifteenth Amendment"],
-        "criminal_law": ["Fourth Amendment", "Fifth Amendment", "Sixth Amendment", "Eighth Amendment"],
-        "family_law": ["Fourteenth Amendment", "Nineteenth Amendment"]
-    }
-    return articles.get(domain, [])
+    return list(CONSTITUTIONAL_ARTICLES.get(domain, []))
+
+BASE_COST_RANGES = MappingProxyType({
+    "tenant_rights": (500, 2000),
+    "employment_law": (2000, 10000),
+    "family_law": (3000, 15000),
+    "criminal_law": (5000, 25000),
+    "civil_rights": (3000, 20000),
+    "business_law": (2000, 50000),
+    "tax_law": (1000, 10000)
+})
 
 def _calculate_cost_estimate(self, domain: str, confidence: float) -> tuple:
     """Calculate estimated cost range for legal process"""
-    base_costs = {
-        "tenant_rights": (500, 2000),
-        "employment_law": (2000, 10000),
-        "family_law": (3000, 15000),
-        "criminal_law": (5000, 25000),
-        "civil_rights": (3000, 20000),
-        "business_law": (2000, 50000),
-        "tax_law": (1000, 10000)
-    }
-
-    base_range = base_costs.get(domain, (1000, 5000))
+    base_range = BASE_COST_RANGES.get(domain, (1000, 5000))
     # Adjust based on confidence (higher confidence might mean simpler cases)
     adjustment = 1 - (confidence - 0.5) * 0.4 if confidence > 0.5 else 1 + (0.5 - confidence) * 0.4
 
@@ -786,53 +909,57 @@ def _calculate_cost_estimate(self, domain: str, confidence: float) -> tuple:
         int(base_range[1] * adjustment)
     )
 
+SUCCESS_RATES = MappingProxyType({
+    "tenant_rights": 0.7,
+    "employment_law": 0.6,
+    "family_law": 0.65,
+    "criminal_law": 0.5,
+    "civil_rights": 0.55,
+    "business_law": 0.75,
+    "tax_law": 0.8
+})
+
 def _calculate_success_rate(self, domain: str) -> float:
     """Calculate success rate for domain"""
-    success_rates = {
-        "tenant_rights": 0.7,
-        "employment_law": 0.6,
-        "family_law": 0.65,
-        "criminal_law": 0.5,
-        "civil_rights": 0.55,
-        "business_law": 0.75,
-        "tax_law": 0.8
-    }
-    return success_rates.get(domain, 0.6)
+    return SUCCESS_RATES.get(domain, 0.6)
+
+ALTERNATIVE_ROUTES = MappingProxyType({
+    "tenant_rights": ["Mediation", "Rent escrow", "Repair and deduct", "Small claims court"],
+    "employment_law": ["Direct negotiation", "Mediation", "Arbitration", "Class action lawsuit"],
+    "family_law": ["Mediation", "Collaborative law", "Arbitration", "Litigation"],
+    "criminal_law": ["Plea bargain", "Trial", "Appeal"],
+    "civil_rights": ["Administrative complaint", "Federal lawsuit", "State court action"]
+})
 
 def _get_alternative_routes(self, domain: str) -> List[str]:
     """Get alternative legal routes for domain"""
-    alternatives = {
-        "tenant_rights": ["Mediation", "Rent escrow", "Repair and deduct", "Small claims court"],
-        "employment_law": ["Direct negotiation", "Mediation", "Arbitration", "Class action lawsuit"],
-        "family_law": ["Mediation", "Collaborative law", "Arbitration", "Litigation"],
-        "criminal_law": ["Plea bargain", "Trial", "Appeal"],
-        "civil_rights": ["Administrative complaint", "Federal lawsuit", "State court action"]
-    }
-    return alternatives.get(domain, ["Consult legal professional for options"])
+    return list(ALTERNATIVE_ROUTES.get(domain, ["Consult legal professional for options"]))
+
+REQUIRED_DOCUMENTS = MappingProxyType({
+    "tenant_rights": ["Lease agreement", "Rent payment records", "Correspondence with landlord", "Photos of issues"],
+    "employment_law": ["Employment contract", "Pay stubs", "Performance reviews", "Termination letter", "Witness statements"],
+    "family_law": ["Marriage certificate", "Financial statements", "Child custody agreements", "Property deeds"],
+    "criminal_law": ["Police report", "Arrest warrant", "Witness statements", "Evidence documentation"],
+    "business_law": ["Business contracts", "Financial records", "Partnership agreements", "Corporate documents"]
+})
 
 def _get_required_documents(self, domain: str) -> List[str]:
     """Get required documents for legal process"""
-    documents = {
-        "tenant_rights": ["Lease agreement", "Rent payment records", "Correspondence with landlord", "Photos of issues"],
-        "employment_law": ["Employment contract", "Pay stubs", "Performance reviews", "Termination letter", "Witness statements"],
-        "family_law": ["Marriage certificate", "Financial statements", "Child custody agreements", "Property deeds"],
-        "criminal_law": ["Police report", "Arrest warrant", "Witness statements", "Evidence documentation"],
-        "business_law": ["Business contracts", "Financial records", "Partnership agreements", "Corporate documents"]
-    }
-    return documents.get(domain, ["Gather all relevant documentation and evidence"])
+    return list(REQUIRED_DOCUMENTS.get(domain, ["Gather all relevant documentation and evidence"]))
+
+TIMELINE_RANGES_DAYS = MappingProxyType({
+    "tenant_rights": (30, 90),
+    "employment_law": (60, 180),
+    "family_law": (90, 365),
+    "criminal_law": (30, 730),
+    "civil_rights": (90, 365),
+    "business_law": (30, 180),
+    "tax_law": (60, 365)
+})
 
 def _get_timeline_range(self, domain: str) -> tuple:
     """Get timeline range in days for domain"""
-    timelines = {
-        "tenant_rights": (30, 90),
-        "employment_law": (60, 180),
-        "family_law": (90, 365),
-        "criminal_law": (30, 730),
-        "civil_rights": (90, 365),
-        "business_law": (30, 180),
-        "tax_law": (60, 365)
-    }
-    return timelines.get(domain, (30, 180))
+    return TIMELINE_RANGES_DAYS.get(domain, (30, 180))
 
 EnhancedLegalAgent._get_constitutional_articles = _get_constitutional_articles
 EnhancedLegalAgent._calculate_cost_estimate = _calculate_cost_estimate
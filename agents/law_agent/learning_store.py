@@ -0,0 +1,176 @@
+"""
+Law Agent - Shared Learning State
+
+Feedback statistics and usage counters for the legal agents, shared by every
+worker through Redis. Updates are recorded as increments (HINCRBY /
+HINCRBYFLOAT), never read-modify-write, so concurrent workers cannot lose
+updates. Queries only read a local snapshot; a background thread pushes
+pending increments and refreshes the snapshot, so the query path never waits
+on Redis. Without Redis the store keeps working as a per-process counter.
+
+The store opens its own lazy redis client instead of using utils/redis_service:
+RedisService pings Redis when it is constructed, and its API only covers
+execution logs. The law agent also has to run as a standalone server, where the
+bucket's utils package may not be importable.
+"""
+
+import os
+import threading
+import logging
+from typing import Dict, Optional
+
+try:
+    from utils.logger import logger
+except ImportError:
+    logger = logging.getLogger(__name__)
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+LEARNING_SYNC_INTERVAL_SEC = float(os.getenv("LAW_AGENT_LEARNING_SYNC_SEC", "2"))
+
+FEEDBACK_COUNT_KEY = "law_agent:learning:feedback_count"
+CONFIDENCE_SUM_KEY = "law_agent:learning:confidence_sum"
+STATS_KEY = "law_agent:stats"
+HASH_KEYS = (FEEDBACK_COUNT_KEY, CONFIDENCE_SUM_KEY, STATS_KEY)
+
+def _empty() -> Dict[str, Dict[str, float]]:
+    return {key: {} for key in HASH_KEYS}
+
+def _merge(*layers: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    merged = _empty()
+    for layer in layers:
+        for key, fields in layer.items():
+            target = merged[key]
+            for field, value in fields.items():
+                target[field] = target.get(field, 0) + value
+    return merged
+
+class LearningStore:
+    """Redis-backed learning aggregates with a locally cached snapshot"""
+
+    def __init__(self, client=None, sync_interval: float = LEARNING_SYNC_INTERVAL_SEC):
+        self.client = client
+        self.sync_interval = sync_interval
+        self._snapshot = _empty()   # last state read from Redis
+        self._inflight = _empty()   # increments being pushed right now
+        self._pending = _empty()    # increments not yet pushed
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()  # one sync at a time (background thread vs stop())
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.last_sync_error: Optional[str] = None
+
+    def attach_redis(self, client):
+        self.client = client
+
+    def _incr(self, key: str, field: str, amount: float):
+        with self._lock:
+            fields = self._pending[key]
+            fields[field] = fields.get(field, 0) + amount
+
+    def record_feedback(self, domain: str, confidence: float):
+        """Record one feedback observation for a domain"""
+        self._incr(FEEDBACK_COUNT_KEY, domain, 1)
+        self._incr(CONFIDENCE_SUM_KEY, domain, float(confidence))
+
+    def incr_stat(self, field: str, amount: int = 1):
+        self._incr(STATS_KEY, field, amount)
+
+    def _view(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return _merge(self._snapshot, self._inflight, self._pending)
+
+    def get_learning_data(self) -> Dict[str, Dict[str, float]]:
+        """Per-domain feedback count and average confidence across all workers"""
+        view = self._view()
+        sums = view[CONFIDENCE_SUM_KEY]
+        return {
+            domain: {"feedback_count": int(count), "avg_confidence": sums.get(domain, 0.0) / count}
+            for domain, count in view[FEEDBACK_COUNT_KEY].items() if count > 0
+        }
+
+    def get_stats(self) -> Dict[str, int]:
+        return {field: int(value) for field, value in self._view()[STATS_KEY].items()}
+
+    def sync(self) -> bool:
+        """Push pending increments and refresh the snapshot in one pipeline"""
+        if self.client is None:
+            return False
+        with self._sync_lock:
+            return self._sync()
+
+    def _sync(self) -> bool:
+        with self._lock:
+            self._inflight, self._pending = self._pending, _empty()
+            inflight = self._inflight
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, fields in inflight.items():
+                for field, value in fields.items():
+                    if isinstance(value, int):
+                        pipe.hincrby(key, field, value)
+                    else:
+                        pipe.hincrbyfloat(key, field, value)
+            for key in HASH_KEYS:
+                pipe.hgetall(key)
+            results = pipe.execute()[-len(HASH_KEYS):]
+        except Exception as e:
+            with self._lock:
+                # Keep the increments for the next attempt
+                self._pending = _merge(self._inflight, self._pending)
+                self._inflight = _empty()
+            if self.last_sync_error != str(e):
+                logger.warning(f"Law agent learning sync failed: {e}")
+            self.last_sync_error = str(e)
+            return False
+        snapshot = {key: {field: float(value) for field, value in raw.items()} for key, raw in zip(HASH_KEYS, results)}
+        with self._lock:
+            self._snapshot = snapshot
+            self._inflight = _empty()
+        self.last_sync_error = None
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.sync_interval):
+            self.sync()
+
+    def start(self):
+        """Sync with Redis periodically on a background thread"""
+        if self.client is None or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="law-agent-learning-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=self.sync_interval + 1)
+            self._thread = None
+            self.sync()
+
+def _redis_client():
+    if redis is None:
+        return None
+    # Connections are lazy: nothing touches the network until the first sync
+    return redis.Redis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+        password=os.getenv("REDIS_PASSWORD", None),
+        decode_responses=True,
+        socket_timeout=5,
+        socket_connect_timeout=5
+    )
+
+_learning_store: Optional[LearningStore] = None
+
+def get_learning_store() -> LearningStore:
+    """Get the process-wide learning store, syncing with Redis in the background"""
+    global _learning_store
+    if _learning_store is None:
+        _learning_store = LearningStore(_redis_client())
+        _learning_store.start()
+    return _learning_store
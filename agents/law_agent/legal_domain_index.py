@@ -0,0 +1,89 @@
+"""
+Law Agent - Legal Domain Keyword Index
+
+Precompiled keyword index used by the legal agents for domain classification.
+Queries are tokenized once on word boundaries; single words and multi-word
+phrases ("child custody", "green card") are looked up in one frozen index that
+yields the scores of every domain in a single pass.
+"""
+
+import re
+from types import MappingProxyType
+from typing import Dict, Any, List, Iterable, Mapping, Tuple
+
+GENERAL_DOMAIN = "general_law"
+GENERAL_CONFIDENCE = 0.5
+MIN_CONFIDENCE = 0.3
+
+LEGAL_DOMAIN_KEYWORDS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "tenant_rights": ("rent", "landlord", "tenant", "eviction", "lease"),
+    "employment_law": ("job", "termination", "fired", "workplace", "salary", "contract"),
+    "family_law": ("divorce", "child custody", "marriage", "alimony", "adoption"),
+    "consumer_protection": ("warranty", "refund", "consumer", "purchase", "defective"),
+    "criminal_law": ("arrest", "police", "criminal", "charge", "court"),
+    "civil_rights": ("discrimination", "rights", "constitution", "freedom"),
+    "immigration_law": ("visa", "immigration", "citizenship", "green card"),
+    "business_law": ("contract", "business", "partnership", "corporation"),
+    "intellectual_property": ("copyright", "patent", "trademark", "IP"),
+    "environmental_law": ("environment", "pollution", "regulation", "compliance"),
+    "tax_law": ("tax", "IRS", "income tax", "deduction"),
+    "bankruptcy_law": ("bankruptcy", "debt", "creditor", "chapter")
+})
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+def _build_index(domains: Mapping[str, Tuple[str, ...]]) -> Tuple[Mapping[str, Tuple[str, ...]], int]:
+    """Map each normalized keyword to the domains it scores for"""
+    index: Dict[str, List[str]] = {}
+    longest = 1
+    for domain, keywords in domains.items():
+        for keyword in keywords:
+            tokens = _TOKEN_PATTERN.findall(keyword.lower())
+            longest = max(longest, len(tokens))
+            index.setdefault(" ".join(tokens), []).append(domain)
+    return MappingProxyType({key: tuple(values) for key, values in index.items()}), longest
+
+KEYWORD_INDEX, MAX_PHRASE_WORDS = _build_index(LEGAL_DOMAIN_KEYWORDS)
+
+def _matched_keywords(query: str) -> set:
+    """Distinct index keywords present in the query as whole words or phrases"""
+    tokens = _TOKEN_PATTERN.findall(query.lower())
+    matched = set()
+    for i, token in enumerate(tokens):
+        if token in KEYWORD_INDEX:
+            matched.add(token)
+        elif token.endswith("s") and token[:-1] in KEYWORD_INDEX:
+            # Simple plurals: "landlords", "charges"
+            matched.add(token[:-1])
+        for n in range(2, MAX_PHRASE_WORDS + 1):
+            phrase = " ".join(tokens[i:i + n])
+            if phrase in KEYWORD_INDEX:
+                matched.add(phrase)
+    return matched
+
+def score_domains(query: str) -> Dict[str, int]:
+    """Number of distinct keywords matched per domain (domains without matches omitted)"""
+    scores: Dict[str, int] = {}
+    for keyword in _matched_keywords(query):
+        for domain in KEYWORD_INDEX[keyword]:
+            scores[domain] = scores.get(domain, 0) + 1
+    return scores
+
+def classify(query: str) -> Dict[str, Any]:
+    """Best domain, its confidence and all domain scores from one pass over the query"""
+    scores = score_domains(query)
+    domain = GENERAL_DOMAIN
+    best = 0
+    # Ties go to the domain listed first, as in the original linear scan
+    for candidate in LEGAL_DOMAIN_KEYWORDS:
+        if scores.get(candidate, 0) > best:
+            domain, best = candidate, scores[candidate]
+    if domain == GENERAL_DOMAIN:
+        confidence = GENERAL_CONFIDENCE
+    else:
+        confidence = max(min(best / len(LEGAL_DOMAIN_KEYWORDS[domain]), 1.0), MIN_CONFIDENCE)
+    return {"domain": domain, "confidence": confidence, "scores": scores}
+
+def classify_many(queries: Iterable[str]) -> List[Dict[str, Any]]:
+    """Classify a batch of queries"""
+    return [classify(query) for query in queries]
@@ -0,0 +1,111 @@
+"""Batch generate+evaluate for the Prompt-to-JSON API
+
+Prompts run on a bounded thread pool and results are streamed as NDJSON, one
+line per prompt as it completes, followed by a summary line. Identical prompts
+are generated and evaluated once.
+
+Nothing guarantees the prompt and evaluator agents are thread-safe, so the pool
+never shares them: each worker thread builds its own pair on first use. Memory
+therefore grows with BATCH_EVALUATE_MAX_WORKERS agent pairs, not with the batch
+size, which is capped at BATCH_EVALUATE_MAX_PROMPTS.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, AsyncIterator, Callable, List, Optional, Tuple
+
+BATCH_EVALUATE_MAX_WORKERS = int(os.getenv("BATCH_EVALUATE_MAX_WORKERS", "4"))
+BATCH_EVALUATE_MAX_PROMPTS = int(os.getenv("BATCH_EVALUATE_MAX_PROMPTS", "100"))
+
+def _dump(value):
+    return value.model_dump() if hasattr(value, "model_dump") else value
+
+class BatchEvaluator:
+    """Runs generate+evaluate for many prompts with per-worker agents"""
+
+    def __init__(self, prompt_agent_factory: Callable[[], Any], evaluator_agent_factory: Callable[[], Any],
+                 max_workers: int = BATCH_EVALUATE_MAX_WORKERS, max_prompts: int = BATCH_EVALUATE_MAX_PROMPTS):
+        self.prompt_agent_factory = prompt_agent_factory
+        self.evaluator_agent_factory = evaluator_agent_factory
+        self.max_workers = max_workers
+        self.max_prompts = max_prompts
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch-evaluate")
+        return self._executor
+
+    def _agents(self) -> Tuple[Any, Any]:
+        """This worker thread's own prompt and evaluator agents"""
+        agents = getattr(self._local, "agents", None)
+        if agents is None:
+            agents = self._local.agents = (self.prompt_agent_factory(), self.evaluator_agent_factory())
+        return agents
+
+    def generate_and_evaluate(self, prompt: str) -> Dict[str, Any]:
+        """Generate and evaluate one prompt (runs in the batch pool)"""
+        prompt_agent, evaluator_agent = self._agents()
+        started = time.perf_counter()
+        spec = prompt_agent.run(prompt)
+        generated = time.perf_counter()
+        evaluation = evaluator_agent.run(spec, prompt)
+        finished = time.perf_counter()
+        return {
+            "spec": _dump(spec),
+            "evaluation": _dump(evaluation),
+            "timings_ms": {
+                "generate": round((generated - started) * 1000, 2),
+                "evaluate": round((finished - generated) * 1000, 2),
+                "total": round((finished - started) * 1000, 2)
+            }
+        }
+
+    async def stream(self, prompts: List[str]) -> AsyncIterator[str]:
+        """NDJSON lines: one per prompt in completion order, then a summary line"""
+        loop = asyncio.get_running_loop()
+        positions: Dict[str, List[int]] = {}
+        for index, prompt in enumerate(prompts):
+            positions.setdefault(prompt, []).append(index)
+
+        async def run(prompt: str):
+            try:
+                return prompt, await loop.run_in_executor(self._pool(), self.generate_and_evaluate, prompt), None
+            except Exception as e:
+                return prompt, None, str(e)
+
+        started = time.perf_counter()
+        failed = 0
+        tasks = [asyncio.ensure_future(run(prompt)) for prompt in positions]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                prompt, result, error = await next_done
+                for position, index in enumerate(positions[prompt]):
+                    line = {"index": index, "prompt": prompt, "success": error is None, "deduplicated": position > 0}
+                    if error is None:
+                        line.update(result)
+                    else:
+                        failed += 1
+                        line["error"] = error
+                    yield json.dumps(line, default=str) + "\n"
+            yield json.dumps({
+                "summary": True,
+                "count": len(prompts),
+                "unique_prompts": len(positions),
+                "failed": failed,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+            }) + "\n"
+        finally:
+            # Client went away: drop work that has not started yet
+            for task in tasks:
+                task.cancel()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
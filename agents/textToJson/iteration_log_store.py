@@ -0,0 +1,147 @@
+"""Indexed iteration log store for the Prompt-to-JSON API
+
+Iteration logs are appended to a SQLite table indexed by session_id, so one
+session's logs are read with an index seek instead of parsing the whole history.
+The legacy logs/iteration_logs.json file, which the RL loop still appends to,
+is imported incrementally by a background thread started with the API: every
+ITERATION_LEGACY_IMPORT_SEC only entries past the last imported count are
+inserted, and a file that shrank was replaced, so it is imported afresh. Reads
+never touch the JSON file; they are a single indexed SELECT.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ITERATION_DB_PATH = os.getenv("ITERATION_LOG_DB", "logs/iteration_logs.db")
+LEGACY_JSON_PATH = "logs/iteration_logs.json"
+LEGACY_IMPORT_INTERVAL_SEC = float(os.getenv("ITERATION_LEGACY_IMPORT_SEC", "5"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS iteration_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT 'store',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_iteration_logs_session ON iteration_logs (session_id, id);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+class IterationLogStore:
+    """Append-only, session-indexed iteration log storage"""
+
+    def __init__(self, db_path: str = ITERATION_DB_PATH, legacy_path: Optional[str] = LEGACY_JSON_PATH,
+                 legacy_import_interval: float = LEGACY_IMPORT_INTERVAL_SEC):
+        self.db_path = db_path
+        self.legacy_path = legacy_path
+        self.legacy_import_interval = legacy_import_interval
+        self._import_thread: Optional[threading.Thread] = None
+        self._import_stop = threading.Event()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection, committed on success and always closed"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            if not self._initialized:
+                with self._init_lock:
+                    if not self._initialized:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(_SCHEMA)
+                        self._initialized = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def append(self, log: Dict[str, Any]):
+        """Append one iteration log entry"""
+        self.append_many([log])
+
+    def append_many(self, logs: Iterable[Dict[str, Any]], source: str = "store"):
+        rows = [(str(log.get("session_id", "")), source, json.dumps(log, default=str)) for log in logs]
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executemany("INSERT INTO iteration_logs (session_id, source, data) VALUES (?, ?, ?)", rows)
+
+    def get_session(self, session_id: str) -> List[Dict[str, Any]]:
+        """All logs for a session: imported history first, then appended entries in order"""
+        if not Path(self.db_path).exists():
+            return []
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT data FROM iteration_logs WHERE session_id = ? ORDER BY source = 'store', id", (session_id,)
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def import_legacy(self) -> bool:
+        """Import entries added to the legacy JSON file since the last import"""
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return False
+        stat = os.stat(self.legacy_path)
+        signature = f"{stat.st_mtime_ns}:{stat.st_size}"
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            # Write lock up front: concurrent importers must not insert the same entries
+            conn.execute("BEGIN IMMEDIATE")
+            meta = dict(conn.execute(
+                "SELECT key, value FROM store_meta WHERE key IN ('legacy_signature', 'legacy_count')"
+            ).fetchall())
+            if meta.get("legacy_signature") == signature:
+                return False
+            with open(self.legacy_path, "r") as f:
+                logs = [log for log in json.load(f) if isinstance(log, dict)]
+            imported = int(meta.get("legacy_count", -1))
+            if imported < 0 or len(logs) < imported:
+                # First import, or the file was replaced: start over
+                conn.execute("DELETE FROM iteration_logs WHERE source = 'legacy'")
+                imported = 0
+            conn.executemany(
+                "INSERT INTO iteration_logs (session_id, source, data) VALUES (?, 'legacy', ?)",
+                [(str(log.get("session_id", "")), json.dumps(log, default=str)) for log in logs[imported:]]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+                [("legacy_signature", signature), ("legacy_count", str(len(logs)))]
+            )
+        return True
+
+    def start(self):
+        """Import the legacy file now and then every legacy_import_interval seconds in the background"""
+        if self._import_thread is not None or not self.legacy_path:
+            return
+        self._import_stop.clear()
+        self._import_thread = threading.Thread(target=self._import_loop, name="iteration-legacy-import", daemon=True)
+        self._import_thread.start()
+
+    def stop(self):
+        """Stop the background legacy import"""
+        if self._import_thread is not None:
+            self._import_stop.set()
+            self._import_thread.join(timeout=5)
+            self._import_thread = None
+
+    def _import_loop(self):
+        while True:
+            try:
+                self.import_legacy()
+            except Exception as e:
+                logger.warning(f"Legacy iteration log import failed: {e}")
+            if self._import_stop.wait(self.legacy_import_interval):
+                return
+
+# Global iteration log store instance
+iteration_log_store = IterationLogStore()
@@ -2,6 +2,7 @@
 
 from fastapi import FastAPI, HTTPException, Request, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import APIKeyHeader
 from pydantic import BaseModel
 from typing import Dict, Any, List, Optional
@@ -11,6 +12,8 @@ import os
 import secrets
 import logging
 import time
+import json
+import asyncio
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -25,6 +28,8 @@ from src.cache import cache
 from src.auth import create_access_token, get_current_user
 from src import error_handlers
 from src.universal_schema import UniversalDesignSpec
+from iteration_log_store import iteration_log_store
+from batch_evaluate import BatchEvaluator, BATCH_EVALUATE_MAX_PROMPTS
 
 from fastapi.security import HTTPBearer
 
@@ -651,32 +656,27 @@ async def log_values(request: Request, log_request: LogValuesRequest, api_key: s
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Each batch worker thread gets its own agents of the same classes as the
+# shared ones (the agents are not known to be thread-safe)
+batch_evaluator = BatchEvaluator(type(prompt_agent), type(evaluator_agent))
+
 @app.post("/batch-evaluate")
 @limiter.limit("20/minute")
 async def batch_evaluate(request: Request, prompts: List[str], api_key: str = Depends(verify_api_key), user=Depends(get_current_user)):
-    """Process multiple specs/prompts and store evaluations"""
-    try:
-        results = []
-        for prompt in prompts:
-            # Generate spec
-            spec = prompt_agent.run(prompt)
-            # Evaluate spec
-            evaluation = evaluator_agent.run(spec, prompt)
-
-            results.append({
-                "prompt": prompt,
-                "spec": spec.model_dump(),
-                "evaluation": evaluation.model_dump()
-            })
+    """Process multiple prompts in parallel, streaming one NDJSON line per prompt as it completes"""
+    if len(prompts) > BATCH_EVALUATE_MAX_PROMPTS:
+        raise HTTPException(status_code=413, detail=f"Batch of {len(prompts)} prompts exceeds limit of {BATCH_EVALUATE_MAX_PROMPTS}")
+    return StreamingResponse(batch_evaluator.stream(prompts), media_type="application/x-ndjson")
 
-        return {
-            "success": True,
-            "results": results,
-            "count": len(results),
-            "message": f"Batch processed {len(results)} prompts"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@app.on_event("startup")
+def start_iteration_log_import():
+    # Keep the session-indexed store in step with the RL loop's JSON log off the request path
+    iteration_log_store.start()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    iteration_log_store.stop()
+    batch_evaluator.shutdown()
 
 @app.get("/iterations/{session_id}")
 @limiter.limit("20/minute")
@@ -686,18 +686,9 @@ async def get_iteration_logs(request: Request, session_id: str, api_key: str = D
         # Try database first
         logs = db.get_iteration_logs(session_id)
 
-        # If no logs in DB, check fallback files
+        # If no logs in DB, read the session-indexed fallback store
         if not logs:
-            from pathlib import Path
-            import json
-
-            iteration_file = Path("logs/iteration_logs.json")
-            if iteration_file.exists():
-                with open(iteration_file, 'r') as f:
-                    all_logs = json.load(f)
-
-                # Filter by session_id using list comprehension
-                logs = [log for log in all_logs if log.get('session_id') == session_id]
+            logs = await asyncio.to_thread(iteration_log_store.get_session, session_id)
 
         if not logs:
             raise HTTPException(status_code=404, detail="No iteration logs found for this session")
@@ -708,6 +699,8 @@ async def get_iteration_logs(request: Request, session_id: str, api_key: str = D
             "total_iterations": len(logs),
             "iterations": logs
         }
+    except HTTPException:
+        raise
     except Exception as e:
         import logging
         logging.error(f"Failed to retrieve iteration logs for session {session_id}: {e}")
@@ -4,30 +4,59 @@ Calls the deployed Prompt-to-JSON API endpoints
 """
 
 import os
+import json
+import time
+import base64
 import asyncio
-import aiohttp
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from utils.logger import logger
+from utils.http_client import shared_http_client
 
 # API Configuration
 BASE_URL = "https://prompt-to-json-backend.onrender.com"
 API_KEY = os.getenv("PROMPT_TO_JSON_API_KEY", "test-api-key")  # Set this in environment
 JWT_TOKEN = None  # Will be obtained via /token endpoint
 
+# Cached across invocations: JWT until shortly before expiry, health for a short TTL
+JWT_REFRESH_MARGIN_SEC = 60
+JWT_DEFAULT_TTL_SEC = 900
+HEALTH_CACHE_TTL_SEC = 30
+_jwt_cache: Dict[str, Any] = {"token": None, "expires_at": 0.0}
+_health_cache: Dict[str, Any] = {"result": None, "checked_at": 0.0}
+
+def _token_expiry(token: str, expires_in: Optional[float]) -> float:
+    """Expiry time of a JWT from expires_in, else its exp claim, else a default TTL"""
+    if expires_in:
+        return time.time() + float(expires_in)
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except Exception:
+        return time.time() + JWT_DEFAULT_TTL_SEC
+
+def get_cached_jwt() -> Optional[str]:
+    """Cached JWT if it is not about to expire"""
+    if _jwt_cache["token"] and _jwt_cache["expires_at"] - JWT_REFRESH_MARGIN_SEC > time.time():
+        return _jwt_cache["token"]
+    return None
+
+def clear_jwt_cache():
+    _jwt_cache.update(token=None, expires_at=0.0)
+
 class APIClient:
     def __init__(self, jwt_token=None):
         self.base_url = BASE_URL
         self.api_key = API_KEY
         self.jwt_token = jwt_token
-        self.session = None
+        # Connections are pooled per host and shared by every client instance
+        self.http = shared_http_client
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        pass
 
     async def _get_headers(self, include_jwt: bool = True, include_api_key: bool = True):
         """Get headers for API requests"""
@@ -53,18 +82,21 @@ class APIClient:
             }
 
             headers = await self._get_headers(include_jwt=False, include_api_key=False)
-            async with self.session.post(f"{self.base_url}/token", json=auth_data, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    self.jwt_token = data.get("access_token")
-                    logger.info("Successfully authenticated with API")
-                    return True
-                else:
-                    logger.warning(f"Authentication failed: {response.status}")
-                    return False
-    except Exception as e:
-        logger.error(f"Authentication error: {e}")
-        return False
+            # Concurrent logins with the same credentials share one token request
+            response = await self.http.post(f"{self.base_url}/token", json=auth_data, headers=headers, coalesce=True)
+            if response.status_code == 200:
+                data = response.json()
+                self.jwt_token = data.get("access_token")
+                if self.jwt_token:
+                    _jwt_cache.update(token=self.jwt_token, expires_at=_token_expiry(self.jwt_token, data.get("expires_in")))
+                logger.info("Successfully authenticated with API")
+                return True
+            else:
+                logger.warning(f"Authentication failed: {response.status_code}")
+                return False
+        except Exception as e:
+            logger.error(f"Authentication error: {e}")
+            return False
 
     async def call_endpoint(self, endpoint: str, method: str = "GET", data: Dict = None) -> Dict:
         """Call a specific API endpoint"""
@@ -75,13 +107,12 @@ class APIClient:
             logger.info(f"Calling {method} {url}")
 
             if method == "GET":
-                async with self.session.get(url, headers=headers) as response:
-                    return await self._handle_response(response, endpoint)
+                response = await self.http.get(url, headers=headers)
             elif method == "POST":
-                async with self.session.post(url, json=data, headers=headers) as response:
-                    return await self._handle_response(response, endpoint)
+                response = await self.http.post(url, json=data, headers=headers)
             else:
                 return {"error": f"Unsupported method: {method}"}
+            return await self._handle_response(response, endpoint)
 
         except Exception as e:
             logger.error(f"Error calling {endpoint}: {e}")
@@ -90,14 +121,14 @@ class APIClient:
     async def _handle_response(self, response, endpoint: str) -> Dict:
         """Handle API response"""
         try:
-            if response.status == 200:
-                data = await response.json()
+            if response.status_code == 200:
+                data = response.json()
                 logger.info(f"Successfully called {endpoint}")
                 return {"success": True, "data": data}
             else:
-                error_text = await response.text()
-                logger.error(f"API call to {endpoint} failed: {response.status} - {error_text}")
-                return {"success": False, "error": f"HTTP {response.status}: {error_text}"}
+                error_text = response.text
+                logger.error(f"API call to {endpoint} failed: {response.status_code} - {error_text}")
+                return {"success": False, "error": f"HTTP {response.status_code}: {error_text}"}
         except Exception as e:
             logger.error(f"Error handling response from {endpoint}: {e}")
             return {"success": False, "error": str(e)}
@@ -125,45 +156,53 @@ async def call_metrics(client: APIClient) -> Dict:
     """Call /basic-metrics endpoint"""
     return await client.call_endpoint("/basic-metrics", "GET")
 
-async def call_all_endpoints(client: APIClient, input_data: Dict) -> Dict:
-    """Call all relevant endpoints based on input"""
-    results = {}
-    errors = []
-
-    # Always call health
-    health_result = await call_health(client)
-    results["health"] = health_result
+async def call_cached_health(client: APIClient) -> Dict:
+    """Call /health, reusing a recent successful result"""
+    if _health_cache["result"] is not None and time.time() - _health_cache["checked_at"] < HEALTH_CACHE_TTL_SEC:
+        return _health_cache["result"]
+    result = await call_health(client)
+    if result.get("success"):
+        _health_cache.update(result=result, checked_at=time.time())
+    return result
 
+async def call_all_endpoints(client: APIClient, input_data: Dict) -> Dict:
+    """Call all relevant endpoints based on input; independent calls run concurrently"""
     action = input_data.get("action", "all")
+    calls = {}
+
+    # Health is served from a short-lived cache unless skipped entirely
+    if not input_data.get("skip_health"):
+        calls["health"] = call_cached_health(client)
 
     if action in ["generate", "all"]:
         prompt = input_data.get("prompt", "Create a modern web application specification")
-        generate_result = await call_generate(client, prompt)
-        results["generate"] = generate_result
-        if not generate_result.get("success"):
-            errors.append(f"Generate failed: {generate_result.get('error')}")
+        calls["generate"] = call_generate(client, prompt)
 
     if action in ["evaluate", "all"] and "spec" in input_data:
         spec = input_data.get("spec", {})
         prompt = input_data.get("prompt", "Evaluate this specification")
-        evaluate_result = await call_evaluate(client, spec, prompt)
-        results["evaluate"] = evaluate_result
-        if not evaluate_result.get("success"):
-            errors.append(f"Evaluate failed: {evaluate_result.get('error')}")
+        calls["evaluate"] = call_evaluate(client, spec, prompt)
 
     if action in ["iterate", "all"]:
         prompt = input_data.get("prompt", "Create an optimal specification through reinforcement learning")
         n_iter = input_data.get("n_iter", 3)
-        iterate_result = await call_iterate(client, prompt, n_iter)
-        results["iterate"] = iterate_result
-        if not iterate_result.get("success"):
-            errors.append(f"Iterate failed: {iterate_result.get('error')}")
+        calls["iterate"] = call_iterate(client, prompt, n_iter)
 
     if action in ["metrics", "all"]:
-        metrics_result = await call_metrics(client)
-        results["metrics"] = metrics_result
-        if not metrics_result.get("success"):
-            errors.append(f"Metrics failed: {metrics_result.get('error')}")
+        calls["metrics"] = call_metrics(client)
+
+    results = dict(zip(calls, await asyncio.gather(*calls.values())))
+    errors = [
+        f"{name.capitalize()} failed: {result.get('error')}"
+        for name, result in results.items()
+        if name != "health" and not result.get("success")
+    ]
+
+    rejected = any(str(result.get("error", "")).startswith("HTTP 401") for result in results.values())
+    if rejected and client.jwt_token and client.jwt_token == _jwt_cache["token"]:
+        # Cached token rejected: authenticate again on the next invocation.
+        # A caller-supplied token being rejected says nothing about the cached one.
+        clear_jwt_cache()
 
     return {
         "result": results,
@@ -179,9 +218,9 @@ async def process(input_data: Dict[str, Any]) -> Dict[str, Any]:
     try:
         logger.info(f"Processing textToJson request: {input_data.get('action', 'all')}")
 
-        jwt_token = input_data.get("jwt_token")
+        jwt_token = input_data.get("jwt_token") or get_cached_jwt()
         async with APIClient(jwt_token=jwt_token) as client:
-            # Try to authenticate if no JWT token provided
+            # Authenticate only when no token was provided or cached
             if not jwt_token:
                 await client.authenticate()
 
@@ -0,0 +1,92 @@
+"""
+Workflow Agent - Department Agent Pool
+
+Department agents are created on first use and evicted after sitting idle, so
+memory no longer grows with the number of departments. Agents built by the
+factory share the pool owner's Mongo and LLM clients, so connection count stays
+constant as well.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Iterable, Optional
+from utils.logger import logger
+
+AGENT_IDLE_TTL_SEC = float(os.getenv("WORKFLOW_AGENT_IDLE_TTL_SEC", "900"))
+AGENT_POOL_MAX_AGENTS = int(os.getenv("WORKFLOW_AGENT_POOL_MAX_AGENTS", "64"))
+
+class DepartmentAgentPool:
+    """Lazily created, idle-evicted agents keyed by department name"""
+
+    def __init__(self, factory: Callable[[Any], Any],
+                 idle_ttl_sec: float = AGENT_IDLE_TTL_SEC, max_agents: int = AGENT_POOL_MAX_AGENTS):
+        self.factory = factory
+        self.idle_ttl_sec = idle_ttl_sec
+        self.max_agents = max_agents
+        self._departments: Dict[str, Any] = {}
+        self._agents: "OrderedDict[str, list]" = OrderedDict()  # name -> [agent, last_used]
+        self.created = 0
+        self.evicted = 0
+
+    def register(self, name: str, department_id: Any):
+        """Record a department without building its agent"""
+        self._departments[name] = department_id
+
+    def register_many(self, departments: Iterable[tuple]):
+        for name, department_id in departments:
+            self.register(name, department_id)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Agent for a registered department, created on first use; default otherwise"""
+        now = time.monotonic()
+        self.evict_idle(now)
+        entry = self._agents.get(name)
+        if entry is not None:
+            entry[1] = now
+            self._agents.move_to_end(name)
+            return entry[0]
+
+        department_id = self._departments.get(name)
+        if department_id is None:
+            return default
+
+        agent = self.factory(department_id)
+        self._agents[name] = [agent, now]
+        self.created += 1
+        while len(self._agents) > self.max_agents:
+            evicted, _ = self._agents.popitem(last=False)
+            self.evicted += 1
+            logger.debug(f"Evicted least recently used agent for department {evicted}")
+        return agent
+
+    def __getitem__(self, name: str) -> Any:
+        agent = self.get(name)
+        if agent is None:
+            raise KeyError(name)
+        return agent
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._departments
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Drop agents unused for longer than the idle TTL"""
+        cutoff = (now if now is not None else time.monotonic()) - self.idle_ttl_sec
+        idle = [name for name, (_, last_used) in self._agents.items() if last_used < cutoff]
+        for name in idle:
+            del self._agents[name]
+        self.evicted += len(idle)
+        return len(idle)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "departments": len(self._departments),
+            "active_agents": len(self._agents),
+            "created": self.created,
+            "evicted": self.evicted,
+            "idle_ttl_sec": self.idle_ttl_sec,
+            "max_agents": self.max_agents
+        }
@@ -3,11 +3,12 @@ import asyncio
 import socketio
 from bson import ObjectId
 from datetime import datetime
-from groq import AsyncGroq
 import os
 from dotenv import load_dotenv
 from database.mongo_db import MongoDBClient
 from utils.logger import logger
+from agents.workflow.llm_cache import llm_coordinator, prompt_key
+from agents.workflow.agent_pool import DepartmentAgentPool
 from pathlib import Path
 import traceback
 
@@ -17,22 +18,49 @@ load_dotenv()
 # Socket.IO client
 sio = socketio.AsyncClient()
 
-class AIAgent:
-    def __init__(self, department, db):
-        self.department = department
-        self.mongo_client = MongoDBClient()
+SYSTEM_PROMPT = (
+    "You are a workflow optimization assistant. Always return a JSON object with a 'recommendations' array, "
+    "where each item has 'taskId', 'category', 'description', 'impact', and 'actions' (array of objects with 'action' and 'justification')."
+)
+
+# Task fields used when building optimization prompts
+TASK_PROJECTION = {"title": 1, "dueDate": 1, "status": 1, "priority": 1, "assignee": 1, "dependencies": 1}
+
+_llm_client = None
+
+def get_llm_client():
+    """Groq client shared by every department agent"""
+    global _llm_client
+    if _llm_client is None:
         api_key = os.getenv("GROQ_API_KEY")
         if not api_key:
             raise ValueError("GROQ_API_KEY not set in .env")
-        self.client = AsyncGroq(api_key=api_key)
+        from groq import AsyncGroq
+        _llm_client = AsyncGroq(api_key=api_key)
+    return _llm_client
+
+class AIAgent:
+    def __init__(self, department, db=None, llm_client=None):
+        self.department = department
+        # Agents reuse the caller's Mongo client and the shared LLM client
+        self.mongo_client = db if db is not None else MongoDBClient()
+        self.client = llm_client or get_llm_client()
 
     async def run_llm(self, prompt, retry_count=0, max_retries=2):
+        """Cached, coalesced and concurrency-limited LLM call"""
+        model = os.getenv("GROQ_MODEL", "llama3-70b-8192")
+        return await llm_coordinator.run(
+            prompt_key(model, SYSTEM_PROMPT, prompt),
+            lambda: self._complete(model, prompt, retry_count, max_retries)
+        )
+
+    async def _complete(self, model, prompt, retry_count=0, max_retries=2):
+        """One Groq completion with parse retries; returns (response, cacheable)"""
         try:
-            model = os.getenv("GROQ_MODEL", "llama3-70b-8192")
             completion = await self.client.chat.completions.create(
                 model=model,
                 messages=[
-                    {"role": "system", "content": "You are a workflow optimization assistant. Always return a JSON object with a 'recommendations' array, where each item has 'taskId', 'category', 'description', 'impact', and 'actions' (array of objects with 'action' and 'justification')."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=1500,
@@ -52,14 +80,14 @@ class AIAgent:
                             "impact": "Low",
                             "actions": [{"action": "Manual review", "justification": "No recommendations provided"}]
                         }]
-                    }
-                return parsed_response
+                    }, False
+                return parsed_response, True
             except (json.JSONDecodeError, ValueError) as e:
                 logger.error(f"Invalid JSON or format: {str(e)}")
                 if retry_count < max_retries:
                     logger.info(f"Retrying with refined prompt (attempt {retry_count + 1})")
                     refined_prompt = prompt + "\nReturn a JSON object with a 'recommendations' array."
-                    return await self.run_llm(refined_prompt, retry_count + 1, max_retries)
+                    return await self._complete(model, refined_prompt, retry_count + 1, max_retries)
                 return {
                     "recommendations": [{
                         "taskId": "",
@@ -68,7 +96,7 @@ class AIAgent:
                         "impact": "High",
                         "actions": [{"action": "Manual review", "justification": "Response parsing failed"}]
                     }]
-                }
+                }, False
         except Exception as e:
             logger.error(f"Groq API failed: {str(e)}")
             return {
@@ -79,108 +107,15 @@ class AIAgent:
                     "impact": "High",
                     "actions": [{"action": "Manual review", "justification": "API request failed"}]
                 }]
-            }
+            }, False
 
     async def optimize_tasks(self):
         try:
-            dept = self.mongo_client.db.departments.find_one({"_id": ObjectId(self.department)})
-            if not dept:
-                raise ValueError(f"Department {self.department} not found")
-            tasks = list(self.mongo_client.db.tasks.find({"department": ObjectId(self.department), "status": {"$ne": "Completed"}}))
-            logger.debug(f"Found {len(tasks)} tasks for department {self.department}")
-            if not tasks:
-                return {
-                    "recommendations": [{
-                        "taskId": "",
-                        "category": "General",
-                        "description": "No tasks available for optimization.",
-                        "impact": "Low",
-                        "actions": [{"action": "No action required", "justification": "No tasks are currently assigned."}]
-                    }]
-                }
-
-            task_ids = []
-            valid_tasks = []
-            for task in tasks:
-                try:
-                    if not task.get("assignee") or not task.get("dueDate"):
-                        logger.warning(f"Task {task['_id']} missing assignee or dueDate")
-                        continue
-                    if not self.mongo_client.db.users.find_one({"_id": ObjectId(task["assignee"])}):
-                        logger.warning(f"Task {task['_id']} has invalid assignee")
-                        continue
-                    task_ids.append(str(task["_id"]))
-                    valid_tasks.append(task)
-                except Exception as e:
-                    logger.warning(f"Error processing task {task.get('_id')}: {str(e)}")
-
-            if not valid_tasks:
-                return {
-                    "recommendations": [{
-                        "taskId": "",
-                        "category": "General",
-                        "description": "No valid tasks available for optimization.",
-                        "impact": "Low",
-                        "actions": [{"action": "Review task assignments", "justification": "Ensure tasks have valid assignees and due dates"}]
-                    }]
-                }
-
-            progresses = list(self.mongo_client.db.progress.find({"task": {"$in": [ObjectId(id) for id in task_ids]}}))
-            users = list(self.mongo_client.db.users.find({"department": ObjectId(self.department)}))
-            logger.debug(f"Found {len(progresses)} progress entries and {len(users)} users")
-
-            for task in valid_tasks:
-                task["_id"] = str(task["_id"])
-                task["department"] = str(task["department"])
-                task["assignee"] = str(task["assignee"])
-                task["dependencies"] = [str(dep) for dep in task.get("dependencies", [])]
-                task["createdBy"] = str(task.get("createdBy", ""))
-
-            for progress in progresses:
-                progress["_id"] = str(progress["_id"])
-                progress["task"] = str(progress["task"])
-                progress["user"] = str(progress["user"])
-
-            for user in users:
-                user["_id"] = str(user["_id"])
-                user["department"] = str(user.get("department", ""))
-
-            prompt = json.dumps({
-                "tasks": [
-                    {
-                        "taskId": task["_id"],
-                        "title": task["title"],
-                        "dueDate": task["dueDate"].isoformat() if task.get("dueDate") else "",
-                        "status": task["status"],
-                        "priority": task["priority"],
-                        "assignee": self.mongo_client.db.users.find_one({"_id": ObjectId(task["assignee"])})["name"] if self.mongo_client.db.users.find_one({"_id": ObjectId(task["assignee"])}) else "Unknown",
-                        "dependencies": [
-                            self.mongo_client.db.tasks.find_one({"_id": ObjectId(dep)})["title"]
-                            for dep in task.get("dependencies", []) if self.mongo_client.db.tasks.find_one({"_id": ObjectId(dep)})
-                        ]
-                    } for task in valid_tasks
-                ],
-                "progresses": [
-                    {
-                        "taskId": progress["task"],
-                        "progressPercentage": progress["progressPercentage"],
-                        "blockers": progress.get("blockers", "")
-                    } for progress in progresses
-                ],
-                "users": [
-                    {
-                        "name": user["name"],
-                        "role": user["role"],
-                        "workload": len([p for p in progresses if str(p["user"]) == str(user["_id"])])
-                    } for user in users
-                ],
-                "instruction": (
-                    "Analyze tasks, progresses, and user workloads. Identify issues such as overdue tasks, low progress, high workload, or dependency delays. "
-                    "Return a JSON object with a 'recommendations' array, each item containing: taskId, category, description, impact, actions (array of {action, justification})."
-                )
-            }, indent=2)
-
-            recommendations = await self.run_llm(prompt)
+            # All Mongo reads and prompt building run off the event loop
+            prepared = await asyncio.to_thread(self._prepare_optimization)
+            if isinstance(prepared, dict):
+                return prepared
+            recommendations = await self.run_llm(prepared)
             return recommendations
 
         except Exception as e:
@@ -195,6 +130,123 @@ class AIAgent:
                 }]
             }
 
+    def _prepare_optimization(self):
+        """Load tasks, assignees, dependencies, progress and users with one query per
+        collection; returns the LLM prompt, or a recommendations dict when there is
+        nothing to optimize"""
+        db = self.mongo_client.db
+        dept = db.departments.find_one({"_id": ObjectId(self.department)}, {"_id": 1})
+        if not dept:
+            raise ValueError(f"Department {self.department} not found")
+        tasks = list(db.tasks.find(
+            {"department": ObjectId(self.department), "status": {"$ne": "Completed"}},
+            TASK_PROJECTION
+        ))
+        logger.debug(f"Found {len(tasks)} tasks for department {self.department}")
+        if not tasks:
+            return {
+                "recommendations": [{
+                    "taskId": "",
+                    "category": "General",
+                    "description": "No tasks available for optimization.",
+                    "impact": "Low",
+                    "actions": [{"action": "No action required", "justification": "No tasks are currently assigned."}]
+                }]
+            }
+
+        # Resolve every referenced assignee in one $in query instead of one find_one per task
+        candidates = []
+        for task in tasks:
+            try:
+                if not task.get("assignee") or not task.get("dueDate"):
+                    logger.warning(f"Task {task['_id']} missing assignee or dueDate")
+                    continue
+                candidates.append((task, ObjectId(task["assignee"])))
+            except Exception as e:
+                logger.warning(f"Error processing task {task.get('_id')}: {str(e)}")
+        assignee_names = {
+            user["_id"]: user.get("name", "Unknown")
+            for user in db.users.find({"_id": {"$in": list({oid for _, oid in candidates})}}, {"name": 1})
+        }
+
+        valid_tasks = []
+        for task, assignee_id in candidates:
+            if assignee_id not in assignee_names:
+                logger.warning(f"Task {task['_id']} has invalid assignee")
+                continue
+            task["assigneeName"] = assignee_names[assignee_id]
+            valid_tasks.append(task)
+
+        if not valid_tasks:
+            return {
+                "recommendations": [{
+                    "taskId": "",
+                    "category": "General",
+                    "description": "No valid tasks available for optimization.",
+                    "impact": "Low",
+                    "actions": [{"action": "Review task assignments", "justification": "Ensure tasks have valid assignees and due dates"}]
+                }]
+            }
+
+        dependency_ids = set()
+        for task in valid_tasks:
+            for dep in task.get("dependencies", []):
+                try:
+                    dependency_ids.add(ObjectId(dep))
+                except Exception:
+                    logger.warning(f"Task {task['_id']} has invalid dependency {dep}")
+        dependency_titles = {
+            str(dep["_id"]): dep.get("title")
+            for dep in db.tasks.find({"_id": {"$in": list(dependency_ids)}}, {"title": 1})
+        } if dependency_ids else {}
+
+        progresses = list(db.progress.find(
+            {"task": {"$in": [task["_id"] for task in valid_tasks]}},
+            {"task": 1, "user": 1, "progressPercentage": 1, "blockers": 1}
+        ))
+        users = list(db.users.find({"department": ObjectId(self.department)}, {"name": 1, "role": 1}))
+        logger.debug(f"Found {len(progresses)} progress entries and {len(users)} users")
+
+        workload = {}
+        for progress in progresses:
+            user_id = str(progress.get("user"))
+            workload[user_id] = workload.get(user_id, 0) + 1
+
+        return json.dumps({
+            "tasks": [
+                {
+                    "taskId": str(task["_id"]),
+                    "title": task["title"],
+                    "dueDate": task["dueDate"].isoformat() if task.get("dueDate") else "",
+                    "status": task["status"],
+                    "priority": task["priority"],
+                    "assignee": task["assigneeName"],
+                    "dependencies": [
+                        dependency_titles[str(dep)]
+                        for dep in task.get("dependencies", []) if str(dep) in dependency_titles
+                    ]
+                } for task in valid_tasks
+            ],
+            "progresses": [
+                {
+                    "taskId": str(progress["task"]),
+                    "progressPercentage": progress["progressPercentage"],
+                    "blockers": progress.get("blockers", "")
+                } for progress in progresses
+            ],
+            "users": [
+                {
+                    "name": user["name"],
+                    "role": user["role"],
+                    "workload": workload.get(str(user["_id"]), 0)
+                } for user in users
+            ],
+            "instruction": (
+                "Analyze tasks, progresses, and user workloads. Identify issues such as overdue tasks, low progress, high workload, or dependency delays. "
+                "Return a JSON object with a 'recommendations' array, each item containing: taskId, category, description, impact, actions (array of {action, justification})."
+            )
+        }, indent=2)
+
     async def notify(self, recommendations):
         dept_name = self.mongo_client.db.departments.find_one({"_id": ObjectId(self.department)})["name"]
         notification_data = {"department": dept_name, "recommendations": recommendations}
@@ -229,16 +281,21 @@ class AIAgent:
         return {"recommendations": [{"taskId": "", "category": "General", "description": f"Unknown action: {action}", "impact": "High", "actions": [{"action": "Specify valid action", "justification": "Action not recognized"}]}]}
 
 class MultiAgentSystem:
-    def __init__(self):
-        self.agents = {}
-        self.mongo_client = MongoDBClient()
+    def __init__(self, mongo_client=None):
+        self.mongo_client = mongo_client if mongo_client is not None else MongoDBClient()
+        # Department agents are built on first use, share this Mongo client, and are evicted when idle
+        self.agents = DepartmentAgentPool(factory=lambda dept_id: AIAgent(dept_id, self.mongo_client))
 
     def initialize_agents(self, departments):
+        """Register departments (one query); agents are created lazily"""
+        found = {
+            dept["name"]: dept["_id"]
+            for dept in self.mongo_client.db.departments.find({"name": {"$in": list(departments)}}, {"name": 1})
+        }
         for dept_name in departments:
-            dept = self.mongo_client.db.departments.find_one({"name": dept_name})
-            if not dept:
+            if dept_name not in found:
                 raise ValueError(f"Department {dept_name} not found")
-            self.agents[dept_name] = AIAgent(dept["_id"], self.mongo_client)
+        self.agents.register_many(found.items())
 
     async def handle_escalation(self, task_id):
         try:
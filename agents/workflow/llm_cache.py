@@ -0,0 +1,124 @@
+"""
+Workflow Agent - LLM Call Coordination
+
+Wraps the workflow agents' LLM calls with:
+- a content-addressed response cache keyed on (model, system prompt, user prompt)
+  with TTL/LRU eviction. Invalidation is purely content-addressed: prompts embed
+  the department's task state, so a changed task set produces a new key and the
+  old entry simply ages out (this service never writes tasks itself)
+- coalescing of identical in-flight calls into one upstream request (shared
+  singleflight helper, so a cancelled caller hands the call to a waiter)
+- a concurrency limit so bursts (e.g. escalations) stay under upstream rate limits
+"""
+
+import asyncio
+import copy
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple
+from utils.logger import logger
+from utils.singleflight import SingleFlight
+
+LLM_CACHE_TTL_SEC = float(os.getenv("WORKFLOW_LLM_CACHE_TTL_SEC", "600"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("WORKFLOW_LLM_CACHE_MAX_ENTRIES", "256"))
+LLM_MAX_CONCURRENCY = int(os.getenv("WORKFLOW_LLM_MAX_CONCURRENCY", "4"))
+
+def prompt_key(model: str, system_prompt: str, prompt: str) -> Tuple[str, str, str]:
+    """Cache key for one completion request"""
+    return (
+        model,
+        hashlib.sha256(system_prompt.encode("utf-8")).hexdigest(),
+        hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    )
+
+class LLMResponseCache:
+    """TTL + LRU cache of parsed LLM responses"""
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES, ttl_seconds: float = LLM_CACHE_TTL_SEC):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry[1])
+
+    def set(self, key: Tuple, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "ttl_seconds": self.ttl_seconds}
+
+class LLMCallCoordinator:
+    """Cache, coalesce and rate-limit LLM calls"""
+
+    def __init__(self, cache: Optional[LLMResponseCache] = None, max_concurrency: int = LLM_MAX_CONCURRENCY):
+        self.cache = cache or LLMResponseCache()
+        self.max_concurrency = max_concurrency
+        self._flights = SingleFlight()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.upstream_calls = 0
+
+    @property
+    def coalesced(self) -> int:
+        return self._flights.coalesced
+
+    def _limiter(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(self, key: Tuple, call: Callable[[], Awaitable[Tuple[Any, bool]]]) -> Any:
+        """Return a cached response, join an identical in-flight call, or make the call.
+        `call` returns (response, cacheable)"""
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        limiter = self._limiter()
+
+        async def lead():
+            try:
+                async with limiter:
+                    self.upstream_calls += 1
+                    response, cacheable = await call()
+            except Exception as e:
+                logger.error(f"LLM call failed: {e}")
+                raise
+            if cacheable:
+                self.cache.set(key, response)
+            return response
+
+        return copy.deepcopy(await self._flights.do(key, lead))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.cache.get_stats(),
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "inflight": len(self._flights),
+            "max_concurrency": self.max_concurrency
+        }
+
+# Global LLM call coordinator shared by every department agent
+llm_coordinator = LLMCallCoordinator()
@@ -31,8 +31,8 @@ app.add_middleware(
 mongo_client = MongoDBClient()
 db = mongo_client.db
 
-# Initialize Multi-Agent System
-multi_agent_system = MultiAgentSystem()
+# Initialize Multi-Agent System (shares the Mongo client above)
+multi_agent_system = MultiAgentSystem(mongo_client)
 try:
     departments = [dept["name"] for dept in db.departments.find()]
     if not departments:
@@ -57,11 +57,12 @@ async def health_check():
         mongo_status = "connected"
     except Exception as e:
         mongo_status = f"failed: {str(e)}"
-    agent_count = len(multi_agent_system.agents)
+    pool_stats = multi_agent_system.agents.get_stats()
     return {
         "status": "healthy",
         "mongodb": mongo_status,
-        "agents_initialized": agent_count,
+        "agents_initialized": pool_stats["departments"],
+        "agent_pool": pool_stats,
         "timestamp": datetime.utcnow().isoformat()
     }
 
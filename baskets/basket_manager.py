@@ -6,6 +6,7 @@ from agents.agent_runner import AgentRunner
 from communication.event_bus import EventBus
 from database.mongo_db import MongoDBClient
 from utils.redis_service import RedisService
+from utils.scale_monitor import scale_monitor
 import asyncio
 from utils.logger import get_logger, get_execution_logger
 
@@ -278,6 +279,7 @@ class AgentBasket:
 
                 # Calculate execution time
                 step_duration = (datetime.now() - step_start_time).total_seconds()
+                scale_monitor.observe_execution(agent=agent_name, latency_ms=step_duration * 1000)
 
                 # Store agent output in Redis for potential use by other agents
                 if self.redis_service and self.redis_service.is_connected():
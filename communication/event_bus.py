@@ -5,6 +5,9 @@ from utils.logger import logger  # Centralized logger
 class EventBus:
     def __init__(self):
         self.subscribers: Dict[str, List[Callable]] = {}
+        # Delivery counters exposed through /metrics
+        self.pending: Dict[str, int] = {}
+        self.published: Dict[str, int] = {}
 
     def subscribe(self, event_type: str, callback: Callable):
         """Subscribe a callback to an event type."""
@@ -15,9 +18,14 @@ class EventBus:
 
     async def publish(self, event_type: str, message: Dict):
         """Publish an event to all subscribers."""
+        self.published[event_type] = self.published.get(event_type, 0) + 1
         if event_type in self.subscribers:
-            for callback in self.subscribers[event_type]:
-                try:
-                    await callback(message)
-                except Exception as e:
-                    logger.error(f"Error in callback for event {event_type}: {e}")
\ No newline at end of file
+            self.pending[event_type] = self.pending.get(event_type, 0) + 1
+            try:
+                for callback in self.subscribers[event_type]:
+                    try:
+                        await callback(message)
+                    except Exception as e:
+                        logger.error(f"Error in callback for event {event_type}: {e}")
+            finally:
+                self.pending[event_type] -= 1
\ No newline at end of file
@@ -5,6 +5,7 @@ Implements scale limits from Document 15 (Scale Readiness)
 
 from typing import Dict, Tuple, Any
 from utils.logger import get_logger
+from utils.payload_estimator import estimate_payload
 
 logger = get_logger(__name__)
 
@@ -54,6 +55,11 @@ class ScaleLimits:
     MAX_BATCH_SIZE = 500  # Maximum batch operation size
     SAFE_BATCH_SIZE = 100  # Safe batch size
     
+    # Admission Control (enforces the concurrency/throughput limits above)
+    ADMISSION_QUEUE_TIMEOUT_MS = 100  # Max queue wait, half of MAX_QUERY_LATENCY_MS
+    ADMISSION_MAX_QUEUE_DEPTH = 50  # Waiters per limiter before shedding with 429
+    ADMISSION_PRODUCT_SHARE = 0.5  # Max fraction of capacity a single product may hold
+    
     # What Scales Safely
     SCALES_SAFELY = [
         "Number of artifact types (unlimited)",
@@ -116,6 +122,11 @@ class ScaleLimits:
                 "max_latency_ms": cls.MAX_QUERY_LATENCY_MS,
                 "safe_latency_ms": cls.SAFE_QUERY_LATENCY_MS,
                 "max_result_set": cls.MAX_RESULT_SET_SIZE
+            },
+            "admission": {
+                "queue_timeout_ms": cls.ADMISSION_QUEUE_TIMEOUT_MS,
+                "max_queue_depth": cls.ADMISSION_MAX_QUEUE_DEPTH,
+                "product_share": cls.ADMISSION_PRODUCT_SHARE
             }
         }
     
@@ -194,11 +205,13 @@ def get_performance_targets_dict() -> Dict[str, Any]:
         "durability_target": 0.999999999  # 9 nines
     }
 
-def validate_operation_scale(operation_type: str, data_size: int, frequency: int) -> Tuple[bool, str]:
-    """Validate if operation is within scale limits"""
+def validate_operation_scale(operation_type: str, data_size: int, frequency: int, data: Any = None) -> Tuple[bool, str]:
+    """Validate if operation is within scale limits (data, if given, is measured instead of trusting data_size)"""
     limits = ScaleLimits()
     
     # Validate data size
+    if data is not None:
+        data_size = estimate_payload(data, limits.MAX_ARTIFACT_SIZE)["json_bytes"]
     if data_size > limits.MAX_ARTIFACT_SIZE:
         return False, f"Data size {data_size} exceeds limit of {limits.MAX_ARTIFACT_SIZE}"
     
@@ -5,6 +5,7 @@ from typing import List, Dict, Optional
 import datetime
 import time
 from utils.logger import get_logger
+from utils.metrics_registry import MongoCommandListener
 
 logger = get_logger(__name__)
 
@@ -27,7 +28,7 @@ class MongoDBClient:
         for attempt in range(self.max_retries):
             try:
                 logger.debug(f"Attempting MongoDB connection (attempt {attempt + 1})")
-                self.client = MongoClient(mongo_uri)
+                self.client = MongoClient(mongo_uri, event_listeners=[MongoCommandListener()])
                 self.db = self.client["workflow_ai"]
                 self.client.admin.command('ping')
                 logger.info("Successfully connected to MongoDB")
@@ -47,6 +47,7 @@ from .retention import (
     get_cleanup_procedures,
     get_compliance_checklist,
     calculate_retention_date,
+    plan_retention,
     get_dsar_process
 )
 
@@ -4,7 +4,8 @@ Ensures every integration respects Bucket governance
 Document Reference: 14_bucket_threat_model.md, 15_scale_readiness.md, 16_multi_product_compatibility.md
 """
 
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple, Callable
 from datetime import datetime
 from enum import Enum
 from utils.logger import get_logger
@@ -24,6 +25,10 @@ except ImportError:
     ScaleLimits = None
     validate_operation_scale = None
 
+from utils.payload_estimator import estimate_payload
+from utils.hashing import content_hash
+from governance.integration_registry import IntegrationRegistry
+
 logger = get_logger(__name__)
 
 class GovernanceDecision(Enum):
@@ -81,13 +86,92 @@ OPERATION_RULES = {
     "event_history": {"CREATE": True, "READ": True, "UPDATE": False, "DELETE": False}
 }
 
+# Decision cache (validate_operation / validate_integration memoization)
+DECISION_CACHE_MAX_ENTRIES = 10000
+
+_rules_version = 0
+
+def bump_rules_version() -> int:
+    """Invalidate cached governance decisions after PRODUCT_RULES/OPERATION_RULES change"""
+    global _rules_version
+    _rules_version += 1
+    logger.info(f"Governance rules version bumped to {_rules_version}")
+    return _rules_version
+
+def update_product_rules(product_name: str, rules: Dict[str, List[str]]):
+    """Replace a product's safety rules (doc 16) and invalidate cached decisions"""
+    PRODUCT_RULES[product_name] = rules
+    bump_rules_version()
+
+def update_operation_rules(artifact_class: str, rules: Dict[str, bool]):
+    """Replace an artifact class's operation rules (doc 04) and invalidate cached decisions"""
+    OPERATION_RULES[artifact_class] = rules
+    bump_rules_version()
+
+class DecisionCache:
+    """Bounded LRU map of governance decisions, cleared when its version changes"""
+    
+    def __init__(self, max_entries: int = DECISION_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self.version: Optional[Tuple] = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    def get_or_compute(self, version: Tuple, key: Tuple, compute: Callable[[], Any]) -> Any:
+        if version != self.version:
+            if self.entries:
+                self.invalidations += 1
+            self.entries.clear()
+            self.version = version
+        
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            self.entries[key] = value
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            return value
+        
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+    
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations
+        }
+
 class GovernanceGate:
     """Primary enforcement point for all Bucket operations"""
     
     def __init__(self):
-        self.approved_integrations = set()
+        self._approvals_version = 0
+        self.approved_integrations = IntegrationRegistry(self._approvals_changed)
+        self.operation_decisions = DecisionCache()
+        self.integration_decisions = DecisionCache()
         logger.info("Governance Gate initialized")
     
+    def _approvals_changed(self):
+        self._approvals_version += 1
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Decision cache hit/miss statistics"""
+        return {
+            "rules_version": _rules_version,
+            "approvals_version": self._approvals_version,
+            "operation": self.operation_decisions.get_stats(),
+            "integration": self.integration_decisions.get_stats()
+        }
+    
     async def validate_integration(
         self,
         integration_id: str,
@@ -98,86 +182,111 @@ class GovernanceGate:
     ) -> Dict[str, Any]:
         """Validate integration against governance rules"""
         
+        evaluate = lambda: self._evaluate_integration(integration_type, artifact_classes, data_schema, product_name)
+        if data_schema.get("timestamp") is not None:
+            # The backdated-timestamp check (T2) depends on the clock: never reuse its verdict
+            decision, checks_performed, threats_found, reasons = evaluate()
+        else:
+            # Decision depends only on the rule inputs; integration_id is recorded, not evaluated
+            key = (integration_type, tuple(artifact_classes), product_name, content_hash(data_schema))
+            decision, checks_performed, threats_found, reasons = self.integration_decisions.get_or_compute(
+                (_rules_version,), key, evaluate
+            )
+        
         validation_results = {
             "timestamp": datetime.utcnow().isoformat(),
             "integration_id": integration_id,
-            "decision": GovernanceDecision.PENDING_REVIEW.value,
-            "checks_performed": [],
-            "threats_found": [],
-            "reasons": []
+            "decision": decision,
+            "checks_performed": list(checks_performed),
+            "threats_found": list(threats_found),
+            "reasons": list(reasons)
         }
         
+        if decision == GovernanceDecision.APPROVED.value:
+            self.approved_integrations.add(integration_id)
+            logger.info(f"Integration {integration_id} approved")
+        else:
+            logger.warning(f"Integration {integration_id} rejected: {reasons[0]}")
+        
+        return validation_results
+    
+    def _evaluate_integration(
+        self,
+        integration_type: str,
+        artifact_classes: List[str],
+        data_schema: Dict[str, Any],
+        product_name: str
+    ) -> Tuple[str, Tuple[str, ...], Tuple[Dict[str, Any], ...], Tuple[str, ...]]:
+        """Run threat, scale, product safety and compliance checks in order (first failure rejects)"""
+        rejected = GovernanceDecision.REJECTED.value
+        checks_performed = []
+        
         # Threat Assessment (doc 14)
         threat_check = self._validate_threats(integration_type, artifact_classes, data_schema, product_name)
-        validation_results["checks_performed"].append("threat_assessment")
+        checks_performed.append("threat_assessment")
         
         if threat_check["has_critical_threats"]:
-            validation_results["threats_found"].extend(threat_check["threats"])
-            validation_results["decision"] = GovernanceDecision.REJECTED.value
-            validation_results["reasons"].append("Critical threats detected")
-            logger.warning(f"Integration {integration_id} rejected: Critical threats")
-            return validation_results
+            return rejected, tuple(checks_performed), tuple(threat_check["threats"]), ("Critical threats detected",)
         
         # Scale Compatibility (doc 15)
         scale_check = self._validate_scale(artifact_classes, integration_type)
-        validation_results["checks_performed"].append("scale_compatibility")
+        checks_performed.append("scale_compatibility")
         
         if not scale_check["is_compatible"]:
-            validation_results["decision"] = GovernanceDecision.REJECTED.value
-            validation_results["reasons"].append(scale_check["reason"])
-            logger.warning(f"Integration {integration_id} rejected: {scale_check['reason']}")
-            return validation_results
+            return rejected, tuple(checks_performed), (), (scale_check["reason"],)
         
         # Product Safety (doc 16)
         product_check = self._validate_product_safety(product_name, artifact_classes)
-        validation_results["checks_performed"].append("product_safety")
+        checks_performed.append("product_safety")
         
         if not product_check["is_safe"]:
-            validation_results["decision"] = GovernanceDecision.REJECTED.value
-            validation_results["reasons"].append(product_check["reason"])
-            logger.warning(f"Integration {integration_id} rejected: {product_check['reason']}")
-            return validation_results
+            return rejected, tuple(checks_performed), (), (product_check["reason"],)
         
         # Compliance (doc 18)
         compliance_check = self._validate_compliance(data_schema, artifact_classes)
-        validation_results["checks_performed"].append("compliance_validation")
+        checks_performed.append("compliance_validation")
         
         if not compliance_check["is_compliant"]:
-            validation_results["decision"] = GovernanceDecision.REJECTED.value
-            validation_results["reasons"].append(compliance_check["reason"])
-            logger.warning(f"Integration {integration_id} rejected: {compliance_check['reason']}")
-            return validation_results
+            return rejected, tuple(checks_performed), (), (compliance_check["reason"],)
         
         # All checks passed
-        validation_results["decision"] = GovernanceDecision.APPROVED.value
-        self.approved_integrations.add(integration_id)
-        logger.info(f"Integration {integration_id} approved")
-        
-        return validation_results
+        return GovernanceDecision.APPROVED.value, tuple(checks_performed), (), ()
     
     def validate_operation(
         self,
         operation_type: str,
         artifact_class: str,
         data_size: int,
-        integration_id: str
+        integration_id: str,
+        data: Any = None
     ) -> Dict[str, Any]:
-        """Validate operation against governance rules"""
+        """Validate operation against governance rules (data, if given, is measured instead of trusting data_size)"""
         
-        # Check integration approval
-        if integration_id not in self.approved_integrations:
-            return {"allowed": False, "reason": "Integration not approved"}
-        
-        # Check operation allowed for artifact class
-        if not self._operation_allowed(operation_type, artifact_class):
-            return {"allowed": False, "reason": f"Operation {operation_type} not allowed for {artifact_class}"}
+        # Approval and operation rules: memoized, so the hot path is a dict lookup
+        reason = self.operation_decisions.get_or_compute(
+            (_rules_version, self._approvals_version),
+            (integration_id, operation_type, artifact_class),
+            lambda: self._operation_denial(operation_type, artifact_class, integration_id)
+        )
+        if reason is not None:
+            return {"allowed": False, "reason": reason}
         
         # Check data size using centralized scale limits
+        if data is not None:
+            data_size = estimate_payload(data, scale_limits_instance.MAX_ARTIFACT_SIZE)["json_bytes"]
         if data_size > scale_limits_instance.MAX_ARTIFACT_SIZE:
             return {"allowed": False, "reason": f"Data size {data_size} exceeds limit of {scale_limits_instance.MAX_ARTIFACT_SIZE}"}
         
         return {"allowed": True}
     
+    def _operation_denial(self, operation_type: str, artifact_class: str, integration_id: str) -> Optional[str]:
+        """Reason the operation is denied by approval/operation rules, or None"""
+        if integration_id not in self.approved_integrations:
+            return "Integration not approved"
+        if not self._operation_allowed(operation_type, artifact_class):
+            return f"Operation {operation_type} not allowed for {artifact_class}"
+        return None
+    
     def _validate_threats(
         self,
         integration_type: str,
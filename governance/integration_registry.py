@@ -0,0 +1,184 @@
+"""
+BHIV Bucket Approved Integration Registry
+Shared, persistent set of integrations approved by the governance gate
+Document Reference: 14_bucket_threat_model.md
+
+Approvals live in a Redis set so every uvicorn worker (and every restart) sees
+the same registry. Each worker keeps a local copy for O(1) membership checks:
+- approve/revoke write through to Redis and publish on a pub/sub channel,
+  which other workers apply to their local copy immediately
+- a background thread re-reads the local copy from Redis every
+  RESYNC_INTERVAL_SEC (and right after a pub/sub error) as a backstop for
+  missed messages, so lookups never wait on Redis
+Without Redis the registry behaves as a plain in-memory set.
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections.abc import MutableSet
+from typing import Callable, Iterable, Iterator, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REDIS_SET_KEY = "governance:approved_integrations"
+REDIS_CHANNEL = "governance:integrations"
+RESYNC_INTERVAL_SEC = 30
+PUBSUB_POLL_SEC = 1.0
+
+class IntegrationRegistry(MutableSet):
+    """Approved integration ids with a local read cache over Redis"""
+
+    def __init__(self, on_change: Optional[Callable[[], None]] = None, items: Iterable[str] = ()):
+        self._on_change = on_change or (lambda: None)
+        self._local = set(items)
+        self._lock = threading.Lock()
+        self.redis = None
+        self.instance_id = uuid.uuid4().hex
+        self._pubsub = None
+        self._pubsub_thread = None
+        self._resync_thread = None
+        self._resync_stop = threading.Event()
+        self._resync_now = threading.Event()
+        self._synced_at = 0.0
+
+    # Set protocol (local copy only: membership is a hash lookup)
+
+    def __contains__(self, integration_id) -> bool:
+        return integration_id in self._local
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._local))
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+    def __repr__(self) -> str:
+        return f"IntegrationRegistry({sorted(self._local)!r})"
+
+    def add(self, integration_id: str):
+        """Approve an integration (written through to Redis and broadcast)"""
+        if self._apply("approve", integration_id):
+            self._write("approve", integration_id)
+
+    def discard(self, integration_id: str):
+        """Revoke an integration (written through to Redis and broadcast)"""
+        if self._apply("revoke", integration_id):
+            self._write("revoke", integration_id)
+
+    # Redis sharing
+
+    def attach_redis(self, redis_client):
+        """Load the shared registry and subscribe to approval changes"""
+        self.close()
+        self.redis = redis_client
+        try:
+            if self._local:
+                # Approvals made before Redis was attached are not lost
+                self.redis.sadd(REDIS_SET_KEY, *self._local)
+            self.sync(force=True)
+            self._pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(**{REDIS_CHANNEL: self._on_message})
+            self._pubsub_thread = self._pubsub.run_in_thread(
+                sleep_time=PUBSUB_POLL_SEC, daemon=True, exception_handler=self._on_pubsub_error
+            )
+            self._start_resync()
+            logger.info(f"Approved integration registry shared through Redis ({len(self._local)} integrations)")
+        except Exception as e:
+            logger.error(f"Failed to subscribe to integration registry changes, relying on resync: {e}")
+
+    def close(self):
+        """Stop the pub/sub listener and the resync thread"""
+        if self._resync_thread is not None:
+            self._resync_stop.set()
+            self._resync_now.set()
+            self._resync_thread.join(timeout=PUBSUB_POLL_SEC + 1)
+            self._resync_thread = None
+        if self._pubsub_thread is not None:
+            self._pubsub_thread.stop()
+            self._pubsub_thread = None
+        if self._pubsub is not None:
+            try:
+                self._pubsub.close()
+            except Exception:
+                pass
+            self._pubsub = None
+
+    def _start_resync(self):
+        self._resync_stop.clear()
+        self._resync_now.clear()
+        self._resync_thread = threading.Thread(
+            target=self._resync_loop, name="integration-registry-resync", daemon=True
+        )
+        self._resync_thread.start()
+
+    def _resync_loop(self):
+        while not self._resync_stop.is_set():
+            self._resync_now.wait(RESYNC_INTERVAL_SEC)
+            self._resync_now.clear()
+            if not self._resync_stop.is_set():
+                self.sync(force=True)
+
+    def sync(self, force: bool = False):
+        """Replace the local copy with the shared registry"""
+        if self.redis is None:
+            return
+        now = time.time()
+        if not force and now - self._synced_at < RESYNC_INTERVAL_SEC:
+            return
+        self._synced_at = now
+        try:
+            shared = set(self.redis.smembers(REDIS_SET_KEY))
+        except Exception as e:
+            logger.error(f"Failed to sync approved integrations, using local copy: {e}")
+            return
+        with self._lock:
+            changed = shared != self._local
+            self._local = shared
+        if changed:
+            self._on_change()
+
+    def _apply(self, op: str, integration_id: str) -> bool:
+        """Apply a change to the local copy; True if membership changed"""
+        with self._lock:
+            if op == "approve":
+                if integration_id in self._local:
+                    return False
+                self._local.add(integration_id)
+            else:
+                if integration_id not in self._local:
+                    return False
+                self._local.discard(integration_id)
+        self._on_change()
+        return True
+
+    def _write(self, op: str, integration_id: str):
+        if self.redis is None:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            if op == "approve":
+                pipe.sadd(REDIS_SET_KEY, integration_id)
+            else:
+                pipe.srem(REDIS_SET_KEY, integration_id)
+            pipe.publish(REDIS_CHANNEL, json.dumps({"op": op, "integration_id": integration_id, "origin": self.instance_id}))
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to persist integration {op} for {integration_id}: {e}")
+
+    def _on_message(self, message):
+        """Apply another worker's approve/revoke to the local copy"""
+        try:
+            change = json.loads(message["data"])
+        except (TypeError, ValueError):
+            return
+        if change.get("origin") == self.instance_id or change.get("op") not in ("approve", "revoke"):
+            return
+        self._apply(change["op"], change["integration_id"])
+
+    def _on_pubsub_error(self, error, pubsub, thread):
+        logger.error(f"Integration registry pub/sub error, resyncing: {error}")
+        self._resync_now.set()
+        time.sleep(PUBSUB_POLL_SEC)
@@ -4,8 +4,14 @@ Data deletion and lifecycle policy
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 import os
+import warnings
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Bulk retention planning unavailable
 
 # Retention configuration (tunable via environment variables)
 RETENTION_CONFIG = {
@@ -291,6 +297,12 @@ def get_cleanup_procedures() -> Dict[str, Any]:
             "mongodb_ttl": "automatic after 1 year (configured)",
             "file_logs": "automatic rotation (daily)"
         },
+        "executor": {
+            "description": "Background retention executor (governance/retention_executor.py)",
+            "chunked_deletes": "logs (audit_logs only with RETENTION_SWEEP_AUDIT_LOGS=true), _id-ordered chunks, rate limited, checkpointed",
+            "legal_holds": "documents with legal_hold: true are never deleted",
+            "status": "/governance/retention/executor"
+        },
         "manual": {
             "tombstone_cleanup": {
                 "description": "Delete tombstoned data after 90 days",
@@ -313,56 +325,167 @@ def get_compliance_checklist() -> Dict[str, Any]:
     }
 
 
+# Retention period per retention rule: (label, length); None length = never deleted
+RETENTION_PERIODS = {
+    "permanent": ("permanent", None),
+    "1_year": ("1 year", timedelta(days=365)),
+    "1_month": ("1 month", timedelta(days=30)),
+    "1_hour": ("1 hour", timedelta(hours=1))
+}
+
+PLAN_BATCH_SIZE = 10000
+_PERMANENT = -1  # period sentinels in the vectorised planner
+_UNKNOWN = -2
+
+
 def calculate_retention_date(artifact_type: str, created_date: Optional[datetime] = None) -> Dict[str, Any]:
     """Calculate when data should be deleted based on artifact type"""
+    now = datetime.utcnow()
     if created_date is None:
-        created_date = datetime.utcnow()
+        created_date = now
     
     rules = ARTIFACT_RETENTION_RULES.get(artifact_type, {})
-    retention = rules.get("retention", "unknown")
+    period = RETENTION_PERIODS.get(rules.get("retention", "unknown"))
     
-    if retention == "permanent":
-        return {
-            "artifact_type": artifact_type,
-            "created_date": created_date.isoformat(),
-            "deletion_date": "never",
-            "retention_period": "permanent"
-        }
-    elif retention == "1_year":
-        deletion_date = created_date + timedelta(days=365)
-        return {
-            "artifact_type": artifact_type,
-            "created_date": created_date.isoformat(),
-            "deletion_date": deletion_date.isoformat(),
-            "retention_period": "1 year",
-            "days_remaining": (deletion_date - datetime.utcnow()).days
-        }
-    elif retention == "1_month":
-        deletion_date = created_date + timedelta(days=30)
+    if period is None:
         return {
             "artifact_type": artifact_type,
             "created_date": created_date.isoformat(),
-            "deletion_date": deletion_date.isoformat(),
-            "retention_period": "1 month",
-            "days_remaining": (deletion_date - datetime.utcnow()).days
+            "deletion_date": "unknown",
+            "retention_period": "unknown",
+            "error": "artifact type not found in retention rules"
         }
-    elif retention == "1_hour":
-        deletion_date = created_date + timedelta(hours=1)
+    
+    label, length = period
+    if length is None:
         return {
             "artifact_type": artifact_type,
             "created_date": created_date.isoformat(),
-            "deletion_date": deletion_date.isoformat(),
-            "retention_period": "1 hour",
-            "minutes_remaining": int((deletion_date - datetime.utcnow()).total_seconds() / 60)
+            "deletion_date": "never",
+            "retention_period": label
         }
+    
+    deletion_date = created_date + length
+    result = {
+        "artifact_type": artifact_type,
+        "created_date": created_date.isoformat(),
+        "deletion_date": deletion_date.isoformat(),
+        "retention_period": label
+    }
+    if length < timedelta(days=1):
+        result["minutes_remaining"] = int((deletion_date - now).total_seconds() / 60)
     else:
-        return {
-            "artifact_type": artifact_type,
-            "created_date": created_date.isoformat(),
-            "deletion_date": "unknown",
-            "retention_period": "unknown",
-            "error": "artifact type not found in retention rules"
-        }
+        result["days_remaining"] = (deletion_date - now).days
+    return result
+
+
+def _period_seconds(artifact_type: str) -> int:
+    period = RETENTION_PERIODS.get(ARTIFACT_RETENTION_RULES.get(artifact_type, {}).get("retention"))
+    if period is None:
+        return _UNKNOWN
+    return _PERMANENT if period[1] is None else int(period[1].total_seconds())
+
+
+def _to_datetime64(created_at: Sequence[Any]) -> "np.ndarray":
+    """Creation times as datetime64[s] (datetimes, naive-UTC ISO strings or epoch seconds)"""
+    values = np.asarray(created_at)
+    if values.dtype.kind == "M":
+        return values.astype("datetime64[s]")
+    if values.dtype.kind in "iuf":
+        return values.astype("int64").astype("datetime64[s]")
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # numpy only warns on timezone suffixes
+            return values.astype("datetime64[s]")
+    except (ValueError, TypeError, Warning):
+        # Timezone-suffixed strings: parse individually, normalise to naive UTC
+        parsed = []
+        for value in created_at:
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if value.tzinfo is not None:
+                value = (value - value.utcoffset()).replace(tzinfo=None)
+            parsed.append(value)
+        return np.array(parsed, dtype="datetime64[s]")
+
+
+def plan_retention(
+    artifact_types: Sequence[str],
+    created_at: Sequence[Any],
+    ids: Optional[Sequence[Any]] = None,
+    now: Optional[datetime] = None,
+    batch_size: int = PLAN_BATCH_SIZE
+) -> Dict[str, Any]:
+    """
+    Plan deletions for many artifacts in one vectorised pass
+    
+    Args:
+        artifact_types: Artifact type per document
+        created_at: Creation time per document (same length)
+        ids: Document ids to put in batches (defaults to input positions)
+        now: Planning time (defaults to utcnow)
+        batch_size: Maximum documents per deletion batch
+        
+    Returns:
+        Summary counts plus deletion batches ordered by deadline; each batch
+        covers one day and is either due now or scheduled, so a cleanup job
+        can execute due batches and resume from any batch_id
+    """
+    if np is None:
+        raise RuntimeError("numpy is required for bulk retention planning")
+    if len(artifact_types) != len(created_at) or (ids is not None and len(ids) != len(created_at)):
+        raise ValueError("artifact_types, created_at and ids must have the same length")
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    
+    now64 = np.datetime64(now or datetime.utcnow(), "s")
+    count = len(artifact_types)
+    
+    # Period lookup once per distinct artifact type
+    types, inverse = np.unique(np.asarray(artifact_types, dtype=str), return_inverse=True)
+    periods = np.array([_period_seconds(t) for t in types], dtype=np.int64)[inverse.reshape(-1)]
+    created = _to_datetime64(created_at) if count else np.array([], dtype="datetime64[s]")
+    
+    retained = periods >= 0
+    positions = np.flatnonzero(retained)
+    deadlines = created[positions] + periods[positions].astype("timedelta64[s]")
+    order = np.argsort(deadlines, kind="stable")
+    positions, deadlines = positions[order], deadlines[order]
+    due_count = int(np.searchsorted(deadlines, now64, side="right"))
+    
+    # Batch boundaries: day changes, the due/scheduled split and batch_size chunks
+    days = deadlines.astype("datetime64[D]")
+    cuts = set(np.flatnonzero(days[1:] != days[:-1]) + 1)
+    cuts.add(due_count)
+    bounds = sorted(c for c in cuts if 0 < c < len(positions))
+    
+    id_values = np.asarray(ids, dtype=object) if ids is not None else None
+    batches = []
+    for start, end in zip([0] + bounds, bounds + [len(positions)]):
+        for chunk_start in range(start, end, batch_size):
+            chunk = positions[chunk_start:min(chunk_start + batch_size, end)]
+            batches.append({
+                "batch_id": len(batches),
+                "deletion_day": str(days[chunk_start]),
+                "due": chunk_start < due_count,
+                "count": len(chunk),
+                "ids": id_values[chunk].tolist() if id_values is not None else chunk.tolist()
+            })
+    
+    by_type = {
+        str(t): int(n) for t, n in zip(types, np.bincount(inverse.reshape(-1), minlength=len(types)))
+    }
+    
+    return {
+        "planned_at": str(now64),
+        "total": count,
+        "permanent": int(np.count_nonzero(periods == _PERMANENT)),
+        "unknown_type": int(np.count_nonzero(periods == _UNKNOWN)),
+        "due_now": due_count,
+        "scheduled": len(positions) - due_count,
+        "by_artifact_type": by_type,
+        "batches": batches
+    }
 
 
 def get_dsar_process() -> Dict[str, Any]:
@@ -0,0 +1,210 @@
+"""
+Document 06: Retention Posture - Executor
+Background enforcement of the retention policy in MongoDB
+
+- Only collections the app actually writes are swept: db.logs, plus
+  db.audit_logs when RETENTION_SWEEP_AUDIT_LOGS opts in (audit logs are
+  append-only and kept 7 years for legal reasons, so they are left alone by
+  default)
+- Expired documents are deleted in small _id-ordered chunks, paced to a maximum
+  delete rate so the primary is never locked by one unbounded deleteMany.
+  The last deleted _id is checkpointed in MongoDB, so an interrupted sweep
+  resumes where it stopped
+- Documents flagged legal_hold: true are never deleted (checked again in the
+  delete filter itself, so a hold placed mid-sweep is honoured). No TTL indexes
+  are used: MongoDB TTL deletion cannot see legal holds
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from config.limits import BucketLimits
+from governance.retention import RETENTION_CONFIG
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RETENTION_CHUNK_SIZE = 1000
+RETENTION_MAX_DELETES_PER_SEC = 5000
+RETENTION_RUN_INTERVAL_SEC = 3600
+RETENTION_MAX_CHUNKS_PER_REQUEST = 100
+RETENTION_SWEEP_AUDIT_LOGS = os.getenv("RETENTION_SWEEP_AUDIT_LOGS", "false").lower() == "true"
+CHECKPOINT_COLLECTION = "retention_checkpoints"
+LEGAL_HOLD_FIELD = "legal_hold"
+NOT_HELD = {LEGAL_HOLD_FIELD: {"$ne": True}}
+
+class RetentionTarget:
+    """Retention policy for one MongoDB collection"""
+
+    __slots__ = ("collection", "time_field", "retention_days")
+
+    def __init__(self, collection: str, time_field: str, retention_days: int):
+        self.collection = collection
+        self.time_field = time_field
+        self.retention_days = retention_days
+
+def default_targets(include_audit_logs: bool = RETENTION_SWEEP_AUDIT_LOGS) -> List[RetentionTarget]:
+    """Retention targets for the collections the app writes (Document 06 policy)"""
+    targets = [RetentionTarget("logs", "timestamp", RETENTION_CONFIG["mongodb_log_retention_days"])]
+    if include_audit_logs:
+        targets.append(RetentionTarget("audit_logs", "timestamp", BucketLimits.AUDIT_RETENTION_DAYS))
+    return targets
+
+class RetentionExecutor:
+    """Runs chunked, resumable retention deletes that honour legal holds"""
+
+    def __init__(self, db=None, targets: Optional[List[RetentionTarget]] = None,
+                 chunk_size: int = RETENTION_CHUNK_SIZE, max_deletes_per_sec: float = RETENTION_MAX_DELETES_PER_SEC):
+        self.db = db
+        self.targets = targets if targets is not None else default_targets()
+        self.chunk_size = chunk_size
+        self.max_deletes_per_sec = max_deletes_per_sec
+        self.stats: Dict[str, Dict[str, Any]] = {
+            target.collection: {
+                "deleted_total": 0,
+                "chunks_total": 0,
+                "last_run_at": None,
+                "last_run_deleted": 0,
+                "last_run_seconds": 0.0,
+                "docs_per_sec": 0.0,
+                "backlog": None,
+                "held": None
+            }
+            for target in self.targets
+        }
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def attach_db(self, db):
+        self.db = db
+
+    def ensure_indexes(self):
+        """Index each target's time field (backlog counts and expiry filters use it)"""
+        if self.db is None:
+            return
+        for target in self.targets:
+            try:
+                self.db[target.collection].create_index(target.time_field)
+            except Exception as e:
+                logger.error(f"Failed to index {target.collection}.{target.time_field}: {e}")
+
+    def _checkpoint(self, collection: str) -> Any:
+        entry = self.db[CHECKPOINT_COLLECTION].find_one({"_id": collection})
+        return entry.get("last_id") if entry else None
+
+    def _save_checkpoint(self, collection: str, last_id: Any):
+        if last_id is None:
+            self.db[CHECKPOINT_COLLECTION].delete_one({"_id": collection})
+        else:
+            self.db[CHECKPOINT_COLLECTION].update_one(
+                {"_id": collection},
+                {"$set": {"last_id": last_id, "updated_at": datetime.utcnow()}},
+                upsert=True
+            )
+
+    def _delete_chunk(self, target: RetentionTarget, cutoff: datetime, after_id: Any) -> Tuple[int, Any]:
+        """Delete one chunk of expired, unheld documents; returns (deleted, last _id scanned)"""
+        collection = self.db[target.collection]
+        query = {target.time_field: {"$lt": cutoff}, **NOT_HELD}
+        if after_id is not None:
+            query["_id"] = {"$gt": after_id}
+        ids = [doc["_id"] for doc in collection.find(query, {"_id": 1}).sort("_id", 1).limit(self.chunk_size)]
+        if not ids:
+            return 0, None
+        # Re-apply the filter so holds placed since the scan are honoured
+        result = collection.delete_many({"_id": {"$in": ids}, target.time_field: {"$lt": cutoff}, **NOT_HELD})
+        return result.deleted_count, ids[-1]
+
+    async def run_target(self, target: RetentionTarget, now: Optional[datetime] = None,
+                         max_chunks: Optional[int] = None) -> Dict[str, Any]:
+        """Run (or resume) a chunked sweep over one collection"""
+        cutoff = (now or datetime.utcnow()) - timedelta(days=target.retention_days)
+        stats = self.stats[target.collection]
+        started = time.monotonic()
+        deleted = chunks = 0
+        last_id = await asyncio.to_thread(self._checkpoint, target.collection)
+        complete = False
+
+        while max_chunks is None or chunks < max_chunks:
+            chunk_started = time.monotonic()
+            count, last_id = await asyncio.to_thread(self._delete_chunk, target, cutoff, last_id)
+            if last_id is None:
+                complete = True
+                break
+            deleted += count
+            chunks += 1
+            await asyncio.to_thread(self._save_checkpoint, target.collection, last_id)
+            # Pace to the delete rate limit
+            pause = count / self.max_deletes_per_sec - (time.monotonic() - chunk_started)
+            if pause > 0:
+                await asyncio.sleep(pause)
+
+        if complete:
+            # Sweep finished: next run starts from the beginning again
+            await asyncio.to_thread(self._save_checkpoint, target.collection, None)
+
+        collection = self.db[target.collection]
+        backlog = await asyncio.to_thread(collection.count_documents, {target.time_field: {"$lt": cutoff}, **NOT_HELD})
+        held = await asyncio.to_thread(collection.count_documents, {target.time_field: {"$lt": cutoff}, LEGAL_HOLD_FIELD: True})
+
+        elapsed = time.monotonic() - started
+        stats["deleted_total"] += deleted
+        stats["chunks_total"] += chunks
+        stats["last_run_at"] = datetime.utcnow().isoformat()
+        stats["last_run_deleted"] = deleted
+        stats["last_run_seconds"] = round(elapsed, 3)
+        stats["docs_per_sec"] = round(deleted / elapsed, 1) if elapsed > 0 else 0.0
+        stats["backlog"] = backlog
+        stats["held"] = held
+        logger.info(f"Retention sweep on {target.collection}: deleted {deleted} in {chunks} chunks, backlog {backlog}, held {held}")
+        return {"collection": target.collection, "deleted": deleted, "chunks": chunks, "complete": complete, "backlog": backlog}
+
+    async def run_once(self, now: Optional[datetime] = None, max_chunks: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Sweep every target (max_chunks bounds the work per collection)"""
+        if self.db is None:
+            return []
+        async with self._lock:
+            await asyncio.to_thread(self.ensure_indexes)
+            results = []
+            for target in self.targets:
+                try:
+                    results.append(await self.run_target(target, now, max_chunks))
+                except Exception as e:
+                    logger.error(f"Retention sweep on {target.collection} failed: {e}")
+                    results.append({"collection": target.collection, "error": str(e)})
+            return results
+
+    async def _run_forever(self, interval_sec: float):
+        while True:
+            await self.run_once()
+            await asyncio.sleep(interval_sec)
+
+    def start(self, interval_sec: float = RETENTION_RUN_INTERVAL_SEC):
+        """Run sweeps periodically in the background"""
+        if self.db is None or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run_forever(interval_sec))
+        logger.info(f"Retention executor started (every {interval_sec}s)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Executor configuration and per-collection sweep stats"""
+        return {
+            "running": self._task is not None,
+            "chunk_size": self.chunk_size,
+            "max_deletes_per_sec": self.max_deletes_per_sec,
+            "collections": {name: dict(stats) for name, stats in self.stats.items()}
+        }
+
+# Global retention executor instance
+retention_executor = RetentionExecutor()
@@ -5,9 +5,11 @@ Implements escalation protocols and automated responses
 """
 
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
 from utils.logger import get_logger
+from utils.violation_store import ViolationStore
+from middleware.constitutional.requester_enforcement import requester_enforcer
 
 logger = get_logger(__name__)
 
@@ -40,7 +42,7 @@ class CoreViolationHandler:
     
     def __init__(self, audit_middleware=None):
         self.audit_middleware = audit_middleware
-        self.violation_history = []
+        self.violation_store = ViolationStore("handler")
         self.escalation_contacts = self._define_escalation_contacts()
         self.response_rules = self._define_response_rules()
         logger.info("Core Violation Handler initialized")
@@ -98,7 +100,12 @@ class CoreViolationHandler:
             self._execute_escalation(escalation, violation)
         
         # Store in history
-        self.violation_history.append(violation)
+        self.violation_store.record(violation, {
+            "severity": severity,
+            "type": violation_type,
+            "requester": requester_id,
+            "escalation": escalation["level"]
+        })
         
         # Log to audit trail if available
         if self.audit_middleware:
@@ -166,19 +173,25 @@ class CoreViolationHandler:
         
         if action == AutomatedResponse.HALT.value:
             logger.critical(f"HALTING OPERATIONS due to violation: {violation['violation_id']}")
-            # In production, this would trigger system-wide halt
+            # Circuit breaker opens for the requester
             
         elif action == AutomatedResponse.BLOCK.value:
             logger.error(f"BLOCKING request due to violation: {violation['violation_id']}")
-            # Request is blocked, logged, and escalated
+            # Requester is denied until the block expires
             
         elif action == AutomatedResponse.THROTTLE.value:
             logger.warning(f"THROTTLING requester due to violation: {violation['violation_id']}")
-            # Implement rate limiting for requester
+            # Requester is rate limited until the throttle expires
             
         elif action == AutomatedResponse.WARN.value:
             logger.info(f"WARNING issued for violation: {violation['violation_id']}")
             # Warning logged, no blocking
+            return
+        
+        else:
+            return
+        
+        requester_enforcer.apply(action, violation["requester_id"], response.get("duration"))
     
     def _determine_escalation(self, violation: Dict[str, Any]) -> Dict[str, Any]:
         """Determine escalation level and contacts"""
@@ -308,57 +321,26 @@ class CoreViolationHandler:
             }
         }
     
+    @property
+    def violation_history(self) -> List[Dict[str, Any]]:
+        """Most recent handled violations (bounded ring buffer)"""
+        return self.violation_store.recent()
+    
     def get_violation_report(self, hours: int = 24) -> Dict[str, Any]:
         """Generate violation report for last N hours"""
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
-        
-        recent_violations = [
-            v for v in self.violation_history
-            if datetime.fromisoformat(v["timestamp"]) > cutoff
-        ]
+        summary = self.violation_store.summarize(hours)
+        by = summary["by"]
         
         return {
             "report_generated": datetime.utcnow().isoformat(),
             "period_hours": hours,
-            "total_violations": len(recent_violations),
-            "by_severity": self._group_by_severity(recent_violations),
-            "by_type": self._group_by_type(recent_violations),
-            "by_requester": self._group_by_requester(recent_violations),
-            "escalations": self._count_escalations(recent_violations),
-            "violations": recent_violations
+            "total_violations": summary["total"],
+            "by_severity": by.get("severity", {}),
+            "by_type": by.get("type", {}),
+            "by_requester": by.get("requester", {}),
+            "escalations": by.get("escalation", {}),
+            "violations": summary["events"]
         }
-    
-    def _group_by_severity(self, violations: List[Dict]) -> Dict[str, int]:
-        """Group violations by severity"""
-        grouped = {}
-        for v in violations:
-            severity = v.get("severity", "unknown")
-            grouped[severity] = grouped.get(severity, 0) + 1
-        return grouped
-    
-    def _group_by_type(self, violations: List[Dict]) -> Dict[str, int]:
-        """Group violations by type"""
-        grouped = {}
-        for v in violations:
-            vtype = v.get("violation_type", "unknown")
-            grouped[vtype] = grouped.get(vtype, 0) + 1
-        return grouped
-    
-    def _group_by_requester(self, violations: List[Dict]) -> Dict[str, int]:
-        """Group violations by requester"""
-        grouped = {}
-        for v in violations:
-            requester = v.get("requester_id", "unknown")
-            grouped[requester] = grouped.get(requester, 0) + 1
-        return grouped
-    
-    def _count_escalations(self, violations: List[Dict]) -> Dict[str, int]:
-        """Count escalations by level"""
-        escalations = {}
-        for v in violations:
-            level = v.get("escalation", {}).get("level", "none")
-            escalations[level] = escalations.get(level, 0) + 1
-        return escalations
 
 # Global violation handler instance
 core_violation_handler = CoreViolationHandler()
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import FastAPI, Query, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from agents.agent_registry import AgentRegistry
@@ -43,8 +43,10 @@ from governance.retention import (
     get_cleanup_procedures,
     get_compliance_checklist,
     calculate_retention_date,
+    plan_retention,
     get_dsar_process
 )
+from governance.retention_executor import RETENTION_MAX_CHUNKS_PER_REQUEST
 from governance.integration_gate import (
     get_integration_requirements,
     get_approval_checklist,
@@ -96,6 +98,9 @@ from governance.owner_principles import (
 )
 from governance.governance_gate import governance_gate, GovernanceDecision
 from middleware.audit_middleware import AuditMiddleware
+from middleware.request_instrumentation import RequestInstrumentationMiddleware, tag_request
+from middleware.admission_control import AdmissionControlMiddleware, admission_controller
+from middleware.constitutional.requester_enforcement import RequesterEnforcementMiddleware, requester_enforcer
 from middleware.constitutional.core_boundary_enforcer import core_boundary_enforcer, CoreCapability, ProhibitedAction
 from validators.core_api_contract import core_api_contract, InputChannel, OutputChannel
 from handlers.core_violation_handler import core_violation_handler, ViolationSeverity
@@ -161,6 +166,13 @@ except (redis.ConnectionError, redis.RedisError) as e:
     logger.warning(f"Redis connection failed: {e}. Redis features will be disabled")
     redis_client = None
 
+# Share violation aggregates, enforcement state and integration approvals across workers
+if redis_service.is_connected():
+    core_boundary_enforcer.violation_store.attach_redis(redis_service.client)
+    core_violation_handler.violation_store.attach_redis(redis_service.client)
+    requester_enforcer.attach_redis(redis_service.client)
+    governance_gate.approved_integrations.attach_redis(redis_service.client)
+
 class AgentInput(BaseModel):
     agent_name: str = Field(..., description="Name of the agent to run")
     input_data: Dict = Field(..., description="Input data for the agent")
@@ -214,7 +226,15 @@ async def lifespan(app: FastAPI):
     else:
         logger.warning("Event forwarding to Socket.IO disabled due to connection failure")
     
+    # Retention enforcement (TTL indexes + chunked deletes) when MongoDB is available
+    from governance.retention import RETENTION_CONFIG
+    from governance.retention_executor import retention_executor
+    if mongo_client and mongo_client.db is not None and RETENTION_CONFIG["enable_auto_cleanup"]:
+        retention_executor.attach_db(mongo_client.db)
+        retention_executor.start()
+    
     yield
+    await retention_executor.stop()
     if mongo_client:
         mongo_client.close()
     if sio.connected:
@@ -225,6 +245,12 @@ async def lifespan(app: FastAPI):
             logger.info("Closed Redis connection")
         except Exception as e:
             logger.error(f"Error closing Redis connection: {e}")
+    from utils.batch_threat_scanner import shutdown_process_pool
+    shutdown_process_pool()
+    governance_gate.approved_integrations.close()
+    requester_enforcer.close()
+    from utils.http_client import shared_http_client
+    await shared_http_client.aclose()
     logger.info("Disconnected from Socket.IO, MongoDB, and Redis")
 
 app = FastAPI(lifespan=lifespan)
@@ -237,6 +263,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Feeds live read/write concurrency and latency of admitted requests into ScaleMonitor
+app.add_middleware(RequestInstrumentationMiddleware)
+
+# Enforces scale limits and sheds overload with 429/Retry-After
+app.add_middleware(AdmissionControlMiddleware)
+
+# Outermost middleware: rejects throttled/blocked/halted requesters before any other work
+app.add_middleware(RequesterEnforcementMiddleware)
+
 @app.get("/health")
 async def health_check():
     health_status = {
@@ -324,6 +359,7 @@ async def get_baskets():
 @app.post("/run-agent")
 async def run_agent(agent_input: AgentInput):
     logger.debug(f"Running agent: {agent_input.agent_name}")
+    tag_request(agent=agent_input.agent_name)
     try:
         if not registry.validate_compatibility(agent_input.agent_name, agent_input.input_data):
             raise HTTPException(status_code=400, detail="Input data incompatible with agent")
@@ -378,6 +414,7 @@ async def execute_basket(basket_input: BasketInput):
         # Validate basket specification
         if not basket_spec.get("agents"):
             raise HTTPException(status_code=400, detail="Basket must contain at least one agent")
+        tag_request(basket=basket_spec.get("basket_name", "unnamed"))
 
         # Create and execute basket with Redis integration
         basket = AgentBasket(basket_spec, registry, event_bus, redis_service)
@@ -878,6 +915,46 @@ async def calculate_retention(
     
     return calculate_retention_date(artifact_type, created)
 
+@app.get("/governance/retention/executor")
+async def get_retention_executor_status():
+    """Retention executor status: TTL indexes, throughput and remaining backlog"""
+    from governance.retention_executor import retention_executor
+    return retention_executor.get_status()
+
+@app.post("/governance/retention/executor/run")
+async def run_retention_executor(
+    max_chunks: int = Query(10, ge=1, le=RETENTION_MAX_CHUNKS_PER_REQUEST,
+                            description="Stop each collection after this many chunks (resumes on the next run)")
+):
+    """Run a bounded retention sweep now (the background task finishes any remainder)"""
+    from governance.retention_executor import retention_executor
+    
+    if retention_executor.db is None:
+        raise HTTPException(status_code=503, detail="MongoDB not available for retention enforcement")
+    
+    return {"results": await retention_executor.run_once(max_chunks=max_chunks)}
+
+class RetentionPlanRequest(BaseModel):
+    artifact_types: List[str] = Field(..., description="Artifact type per document")
+    created_at: List[str] = Field(..., description="ISO creation time per document (UTC)")
+    ids: Optional[List[str]] = Field(None, description="Document ids to place in deletion batches")
+    batch_size: int = Field(10000, ge=1, description="Maximum documents per deletion batch")
+
+@app.post("/governance/retention/plan")
+async def plan_retention_sweep(request: RetentionPlanRequest):
+    """Bulk retention plan: deletion deadlines grouped into per-day deletion batches"""
+    try:
+        return plan_retention(
+            request.artifact_types,
+            request.created_at,
+            ids=request.ids,
+            batch_size=request.batch_size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
 # Integration Gate Endpoints (Document 07)
 @app.get("/governance/integration-gate/requirements")
 async def get_integration_reqs():
@@ -1158,16 +1235,20 @@ async def validate_integration_request(
 async def validate_operation_request(
     operation_type: str = Query(..., description="Operation type (CREATE/READ/UPDATE/DELETE)"),
     artifact_class: str = Query(..., description="Artifact class"),
-    data_size: int = Query(..., description="Data size in bytes"),
-    integration_id: str = Query(..., description="Integration ID")
+    data_size: Optional[int] = Query(None, description="Data size in bytes (measured from body if omitted)"),
+    integration_id: str = Query(..., description="Integration ID"),
+    data: Optional[Dict] = None
 ):
     """Validate operation through governance gate"""
+    if data_size is None and data is None:
+        raise HTTPException(status_code=400, detail="data_size or data required")
     
     result = governance_gate.validate_operation(
         operation_type=operation_type,
         artifact_class=artifact_class,
-        data_size=data_size,
-        integration_id=integration_id
+        data_size=data_size or 0,
+        integration_id=integration_id,
+        data=data
     )
     
     if not result["allowed"]:
@@ -1178,6 +1259,16 @@ async def validate_operation_request(
     
     return {"allowed": True, "message": "Operation validated"}
 
+@app.delete("/governance/gate/integrations/{integration_id}")
+async def revoke_integration(integration_id: str):
+    """Revoke an approved integration (propagated to every worker)"""
+    if integration_id not in governance_gate.approved_integrations:
+        raise HTTPException(status_code=404, detail=f"Integration {integration_id} is not approved")
+    
+    governance_gate.approved_integrations.discard(integration_id)
+    logger.warning(f"Integration {integration_id} revoked")
+    return {"success": True, "integration_id": integration_id, "message": "Integration revoked"}
+
 @app.get("/governance/gate/scale-limits")
 async def get_scale_limits():
     """Get current scale limits (doc 15)"""
@@ -1214,6 +1305,7 @@ async def get_governance_gate_status():
     return {
         "status": "active",
         "approved_integrations": len(governance_gate.approved_integrations),
+        "decision_cache": governance_gate.get_cache_stats(),
         "enforcement_level": "production",
         "certification": "enterprise_ready",
         "reference": "docs/18_bucket_enterprise_certification.md"
@@ -1256,6 +1348,37 @@ async def scan_for_threats(data: Dict):
         "recommendation": "BLOCK" if has_critical else "ALLOW"
     }
 
+class BatchThreatScanRequest(BaseModel):
+    items: List[Dict] = Field(..., description="Payloads to scan")
+    actor: Optional[str] = Field(None, description="Actor performing the operations")
+    operation_type: Optional[str] = Field(None, description="Operation type")
+    target_type: Optional[str] = Field(None, description="Target type (e.g., audit_log)")
+    override_attempted: bool = Field(False, description="Whether override was attempted")
+
+@app.post("/governance/threats/scan-batch")
+async def scan_threats_batch(request: BatchThreatScanRequest):
+    """Scan many payloads in one pass with per-item results and aggregate counts"""
+    from utils.batch_threat_scanner import scan_batch
+    
+    context = {
+        key: value for key, value in {
+            "actor": request.actor,
+            "operation_type": request.operation_type,
+            "target_type": request.target_type,
+            "override_attempted": request.override_attempted
+        }.items() if value
+    }
+    
+    try:
+        result = await scan_batch(request.items, context)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if result["aggregate"]["items_critical"]:
+        logger.warning(f"Batch threat scan: {result['aggregate']['items_critical']} of {result['total_items']} items have critical threats")
+    
+    return result
+
 @app.get("/governance/threats/pattern/{pattern}")
 async def find_threats_by_pattern(pattern: str):
     """Find threats matching a detection pattern"""
@@ -1286,11 +1409,18 @@ async def get_detailed_scale_limits():
 @app.post("/governance/scale/validate")
 async def validate_scale_operation(
     operation_type: str = Query(..., description="Operation type (read/write)"),
-    data_size: int = Query(..., description="Data size in bytes"),
-    frequency: int = Query(1, description="Operations per second")
+    data_size: Optional[int] = Query(None, description="Data size in bytes (measured from body if omitted)"),
+    frequency: int = Query(1, description="Operations per second"),
+    data: Optional[Dict] = None
 ):
     """Validate if operation is within scale limits"""
-    from config.scale_limits import validate_operation_scale
+    from config.scale_limits import ScaleLimits, validate_operation_scale
+    from utils.payload_estimator import estimate_payload
+    
+    if data_size is None and data is None:
+        raise HTTPException(status_code=400, detail="data_size or data required")
+    if data is not None:
+        data_size = estimate_payload(data, ScaleLimits.MAX_ARTIFACT_SIZE)["json_bytes"]
     
     is_valid, error_message = validate_operation_scale(operation_type, data_size, frequency)
     
@@ -1341,6 +1471,18 @@ async def get_what_scales():
     }
 
 # Scale Monitoring Dashboard Endpoints (Document 15 - Real-time Monitoring)
+@app.get("/metrics")
+async def get_openmetrics():
+    """OpenMetrics/Prometheus exposition of pre-aggregated scale and execution metrics"""
+    from utils.scale_monitor import scale_monitor
+    from utils.metrics_registry import render_openmetrics, OPENMETRICS_CONTENT_TYPE
+    from governance.retention_executor import retention_executor
+    
+    return Response(
+        content=render_openmetrics(scale_monitor, event_bus, admission_controller, governance_gate, retention_executor),
+        media_type=OPENMETRICS_CONTENT_TYPE
+    )
+
 @app.get("/metrics/scale-status")
 async def get_scale_status_dashboard():
     """Real-time scale monitoring dashboard with all metrics"""
@@ -1379,6 +1521,18 @@ async def get_query_performance_metric():
     
     return await scale_monitor.get_query_performance_status()
 
+@app.get("/metrics/latency")
+async def get_latency_metric():
+    """Get request latency histograms per route, basket and agent"""
+    from utils.scale_monitor import scale_monitor
+    
+    return await scale_monitor.get_latency_status()
+
+@app.get("/metrics/admission")
+async def get_admission_metric():
+    """Get live admission control status (active, queued and shed requests)"""
+    return admission_controller.get_status()
+
 @app.get("/metrics/alerts")
 async def get_active_alerts():
     """Get active scale alerts"""
@@ -1861,9 +2015,10 @@ async def check_ai_escalation(
     requested_operation: str = Query(..., description="Operation being requested")
 ):
     """Check for AI authority escalation (T6)"""
+    from models.threat_rule_engine import MODEL_AI_ALLOWED_OPERATIONS
     
     is_ai_actor = actor.startswith("ai_")
-    allowed_operations = ["WRITE", "APPEND_AUDIT"]
+    allowed_operations = sorted(MODEL_AI_ALLOWED_OPERATIONS)
     is_escalation = is_ai_actor and requested_operation not in allowed_operations
     
     if is_escalation:
@@ -2126,6 +2281,50 @@ async def validate_core_request(
         "validation_result": validation_result
     }
 
+@app.post("/constitutional/core/preflight")
+async def core_preflight(
+    requester_id: str = Query(..., description="ID of requesting system (must be bhiv_core)"),
+    operation_type: str = Query(..., description="Operation type (READ/WRITE/QUERY/etc)"),
+    target_resource: str = Query(..., description="Resource being accessed"),
+    channel: Optional[str] = Query(None, description="Input channel (defaults to the operation's channel)"),
+    request_data: Dict = None,
+    context: Optional[Dict] = None
+):
+    """
+    Fused constitutional pre-flight
+    Boundary, API contract and threat checks from one pass over request_data
+    """
+    from middleware.constitutional.preflight import run_preflight
+    
+    if not request_data:
+        raise HTTPException(status_code=400, detail="request_data required")
+    
+    result = run_preflight(
+        requester_id=requester_id,
+        operation_type=operation_type,
+        target_resource=target_resource,
+        request_data=request_data,
+        context=context or {},
+        channel=channel
+    )
+    
+    if not result["allowed"]:
+        for violation in result["boundary"]["violations"]:
+            core_violation_handler.handle_violation(
+                violation_type=violation["type"],
+                severity=violation["severity"],
+                details=violation,
+                requester_id=requester_id,
+                context={"operation": operation_type, "resource": target_resource}
+            )
+        
+        raise HTTPException(status_code=403, detail={
+            "message": "Request failed constitutional pre-flight",
+            **result
+        })
+    
+    return result
+
 @app.post("/constitutional/core/validate-input")
 async def validate_core_input(
     channel: str = Query(..., description="Input channel (artifact_write/metadata_query/etc)"),
@@ -2186,6 +2385,64 @@ async def validate_core_output(
         "channel": channel
     }
 
+@app.post("/constitutional/core/validate-input-batch")
+async def validate_core_input_batch(
+    channel: str = Query(..., description="Input channel shared by all items"),
+    requester_id: str = Query(..., description="ID of requesting system"),
+    items: List[Dict] = None
+):
+    """
+    Validate a batch of Core inputs against API contract in one round trip
+    Returns violations for the invalid items only
+    """
+    if not items:
+        raise HTTPException(status_code=400, detail="items required")
+    
+    try:
+        validation_result = core_api_contract.validate_input_many(
+            channel=channel,
+            items=items,
+            requester_id=requester_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if validation_result["violations"]:
+        raise HTTPException(status_code=400, detail={
+            "message": "Input validation failed",
+            "violations": validation_result["violations"]
+        })
+    
+    return validation_result
+
+@app.post("/constitutional/core/validate-output-batch")
+async def validate_core_output_batch(
+    channel: str = Query(..., description="Output channel shared by all items"),
+    items: List[Dict] = None
+):
+    """
+    Validate a batch of Bucket outputs to Core against API contract
+    Returns violations for the invalid items only
+    """
+    if not items:
+        raise HTTPException(status_code=400, detail="items required")
+    
+    try:
+        validation_result = core_api_contract.validate_output_many(
+            channel=channel,
+            items=items
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if validation_result["violations"]:
+        raise HTTPException(status_code=400, detail={
+            "message": "Output validation failed",
+            "violations": validation_result["violations"]
+        })
+    
+    return validation_result
+
 @app.get("/constitutional/core/capabilities")
 async def get_core_capabilities():
     """
@@ -2265,6 +2522,26 @@ async def handle_violation_manually(
         "message": "Violation logged and escalated as appropriate"
     }
 
+@app.get("/constitutional/enforcement")
+async def get_requester_enforcement():
+    """
+    Get active requester enforcement
+    Returns throttled, blocked and halted requesters
+    """
+    return requester_enforcer.get_status()
+
+@app.delete("/constitutional/enforcement/{requester_id}")
+async def lift_requester_enforcement(requester_id: str):
+    """
+    Lift enforcement on a requester
+    Used after a violation has been reviewed and resolved
+    """
+    if requester_id not in requester_enforcer.state:
+        raise HTTPException(status_code=404, detail=f"No active enforcement for {requester_id}")
+    
+    requester_enforcer.clear(requester_id)
+    return {"success": True, "requester_id": requester_id, "message": "Enforcement lifted"}
+
 @app.get("/constitutional/status")
 async def get_constitutional_status():
     """
@@ -4,5 +4,14 @@ Contains audit and monitoring middleware for BHIV Bucket.
 """
 
 from .audit_middleware import AuditMiddleware
+from .request_instrumentation import RequestInstrumentationMiddleware, tag_request
+from .admission_control import AdmissionControlMiddleware, AdmissionController, admission_controller
 
-__all__ = ["AuditMiddleware"]
+__all__ = [
+    "AuditMiddleware",
+    "RequestInstrumentationMiddleware",
+    "tag_request",
+    "AdmissionControlMiddleware",
+    "AdmissionController",
+    "admission_controller"
+]
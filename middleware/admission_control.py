@@ -0,0 +1,291 @@
+"""
+BHIV Bucket Admission Control Middleware
+Enforces scale limits as live concurrency and throughput gates with load shedding
+Document Reference: 15_scale_readiness.md (Scale Limits, Graceful Degradation)
+
+Each request is classified as read/write (same rules as request instrumentation)
+and must pass, in order:
+  1. write token buckets (global MAX_WRITE_THROUGHPUT_PER_SEC and per-product share)
+  2. per-product concurrency limiter (share of the route-class limit)
+  3. route-class concurrency limiter (MAX_CONCURRENT_WRITES / MAX_CONCURRENT_READS)
+Requests may wait up to ADMISSION_QUEUE_TIMEOUT_MS in total; if a queue is full or
+the deadline would be exceeded the request is shed with 429 and Retry-After, so
+admitted requests keep p99 inside MAX_QUERY_LATENCY_MS instead of all degrading.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+from starlette.responses import JSONResponse
+from config.scale_limits import ScaleLimits
+from middleware.request_instrumentation import classify_route, READ, WRITE, IGNORE
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PRODUCT_HEADER = b"x-product-id"
+
+class TokenBucket:
+    """Token bucket supporting advance reservations (pacing instead of polling)"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate_per_sec: float, burst: Optional[float] = None):
+        self.rate = float(rate_per_sec)
+        self.capacity = float(burst if burst is not None else rate_per_sec)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def reserve(self, max_wait: float, now: Optional[float] = None) -> float:
+        """
+        Reserve one token
+
+        Returns:
+            Seconds to wait before proceeding (0 if available now), or a negative
+            value -retry_after if the token cannot be had within max_wait
+        """
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+
+        wait = (1 - self.tokens) / self.rate
+        if wait > max_wait:
+            return -wait
+        # Tokens may go negative: later callers queue up behind this reservation
+        self.tokens -= 1
+        return wait
+
+    def refund(self):
+        """Return a reserved token (request was shed at a later stage)"""
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+class ConcurrencyLimiter:
+    """Semaphore with a bounded FIFO queue and hand-off on release"""
+
+    def __init__(self, limit: int, max_queue: int):
+        self.limit = max(1, int(limit))
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiters: deque = deque()
+
+    async def acquire(self, timeout: float) -> bool:
+        """Acquire a slot, waiting at most timeout seconds; False means shed"""
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return True
+        if len(self.waiters) >= self.max_queue or timeout <= 0:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            # The slot may have been handed over just as the deadline fired
+            return waiter.done() and not waiter.cancelled()
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self.waiters.remove(waiter)
+                except ValueError:
+                    pass
+
+    def release(self):
+        """Release a slot, handing it directly to the next live waiter"""
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)  # slot transfers, active count unchanged
+                return
+        self.active = max(0, self.active - 1)
+
+class AdmissionController:
+    """Live enforcement of ScaleLimits concurrency and throughput limits"""
+
+    def __init__(
+        self,
+        max_concurrent_writes: int = ScaleLimits.MAX_CONCURRENT_WRITES,
+        max_concurrent_reads: int = ScaleLimits.MAX_CONCURRENT_READS,
+        max_writes_per_sec: float = ScaleLimits.MAX_WRITE_THROUGHPUT_PER_SEC,
+        queue_timeout_ms: float = ScaleLimits.ADMISSION_QUEUE_TIMEOUT_MS,
+        max_queue_depth: int = ScaleLimits.ADMISSION_MAX_QUEUE_DEPTH,
+        product_share: float = ScaleLimits.ADMISSION_PRODUCT_SHARE,
+        max_products: int = ScaleLimits.MAX_PRODUCTS
+    ):
+        self.queue_timeout = queue_timeout_ms / 1000
+        self.max_queue_depth = max_queue_depth
+        self.product_share = product_share
+        self.max_products = max_products
+        self.max_writes_per_sec = max_writes_per_sec
+
+        self.class_limits = {WRITE: max_concurrent_writes, READ: max_concurrent_reads}
+        self.class_limiters = {
+            kind: ConcurrencyLimiter(limit, max_queue_depth)
+            for kind, limit in self.class_limits.items()
+        }
+        self.write_bucket = TokenBucket(max_writes_per_sec)
+
+        self.product_limiters: Dict[Tuple[str, str], ConcurrencyLimiter] = {}
+        self.product_write_buckets: Dict[str, TokenBucket] = {}
+
+        self.stats = {
+            kind: {"admitted": 0, "queued": 0, "shed_concurrency": 0, "shed_throughput": 0}
+            for kind in (READ, WRITE)
+        }
+        logger.info("Admission controller initialized")
+
+    def _product_limiter(self, product: str, kind: str) -> Optional[ConcurrencyLimiter]:
+        key = (product, kind)
+        limiter = self.product_limiters.get(key)
+        if limiter is None:
+            # Unbounded product ids (spoofed headers) fall back to global limits only
+            if len(self.product_limiters) >= self.max_products * 2:
+                return None
+            limit = math.ceil(self.class_limits[kind] * self.product_share)
+            limiter = self.product_limiters[key] = ConcurrencyLimiter(limit, self.max_queue_depth)
+        return limiter
+
+    def _product_bucket(self, product: str) -> Optional[TokenBucket]:
+        bucket = self.product_write_buckets.get(product)
+        if bucket is None:
+            if len(self.product_write_buckets) >= self.max_products:
+                return None
+            bucket = self.product_write_buckets[product] = TokenBucket(self.max_writes_per_sec * self.product_share)
+        return bucket
+
+    async def admit(self, kind: str, product: Optional[str] = None) -> Tuple[bool, List[ConcurrencyLimiter], float]:
+        """
+        Admit a request of the given route class
+
+        Returns:
+            (admitted, limiters to release when done, retry_after seconds if shed)
+        """
+        stats = self.stats[kind]
+        deadline = time.monotonic() + self.queue_timeout
+
+        # Stage 1: throughput (writes only)
+        reserved: List[TokenBucket] = []
+        if kind == WRITE:
+            buckets = [self.write_bucket]
+            product_bucket = self._product_bucket(product) if product else None
+            if product_bucket is not None:
+                buckets.append(product_bucket)
+
+            wait = 0.0
+            for bucket in buckets:
+                bucket_wait = bucket.reserve(self.queue_timeout)
+                if bucket_wait < 0:
+                    for taken in reserved:
+                        taken.refund()
+                    stats["shed_throughput"] += 1
+                    return False, [], -bucket_wait
+                reserved.append(bucket)
+                wait = max(wait, bucket_wait)
+            if wait > 0:
+                stats["queued"] += 1
+                await asyncio.sleep(wait)
+
+        # Stage 2/3: per-product then route-class concurrency
+        limiters = []
+        product_limiter = self._product_limiter(product, kind) if product else None
+        if product_limiter is not None:
+            limiters.append(product_limiter)
+        limiters.append(self.class_limiters[kind])
+
+        acquired = []
+        for limiter in limiters:
+            if limiter.active >= limiter.limit:
+                stats["queued"] += 1
+            if not await limiter.acquire(deadline - time.monotonic()):
+                for held in acquired:
+                    held.release()
+                # A shed write never ran; give its throughput tokens back
+                for taken in reserved:
+                    taken.refund()
+                stats["shed_concurrency"] += 1
+                return False, [], self.queue_timeout
+            acquired.append(limiter)
+
+        stats["admitted"] += 1
+        return True, acquired, 0.0
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get live admission status per route class and product"""
+        return {
+            "route_classes": {
+                kind: {
+                    "active": limiter.active,
+                    "limit": limiter.limit,
+                    "queued": len(limiter.waiters),
+                    **self.stats[kind]
+                }
+                for kind, limiter in self.class_limiters.items()
+            },
+            "write_tokens_available": round(max(0.0, self.write_bucket.tokens), 2),
+            "products": {
+                f"{product}:{kind}": {"active": limiter.active, "limit": limiter.limit, "queued": len(limiter.waiters)}
+                for (product, kind), limiter in self.product_limiters.items()
+            },
+            "queue_timeout_ms": self.queue_timeout * 1000,
+            "max_queue_depth": self.max_queue_depth
+        }
+
+class AdmissionControlMiddleware:
+    """Shed load with 429/Retry-After once scale-limit queues are full"""
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or admission_controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        kind = classify_route(scope["method"], scope["path"])
+        if kind == IGNORE:
+            await self.app(scope, receive, send)
+            return
+
+        product = None
+        for name, value in scope.get("headers", ()):
+            if name == PRODUCT_HEADER:
+                product = value.decode("latin-1")
+                break
+
+        admitted, limiters, retry_after = await self.controller.admit(kind, product)
+        if not admitted:
+            retry_seconds = max(1, math.ceil(retry_after))
+            logger.warning(f"Shedding {kind} request {scope['method']} {scope['path']} (product={product})")
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": {
+                    "message": f"Bucket {kind} capacity exhausted, retry later",
+                    "route_class": kind,
+                    "product": product,
+                    "retry_after_seconds": retry_seconds
+                }},
+                headers={"Retry-After": str(retry_seconds)}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            for limiter in reversed(limiters):
+                limiter.release()
+
+# Global admission controller instance
+admission_controller = AdmissionController()
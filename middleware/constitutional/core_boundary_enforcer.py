@@ -8,6 +8,8 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 from enum import Enum
 from utils.logger import get_logger
+from utils.violation_store import ViolationStore
+from middleware.constitutional.request_digest import RequestDigest
 
 logger = get_logger(__name__)
 
@@ -19,6 +21,7 @@ class BoundaryViolationType(Enum):
     AUDIT_HIDING = "audit_hiding"
     GOVERNANCE_BYPASS = "governance_bypass"
     UNAUTHORIZED_ACCESS = "unauthorized_access"
+    CROSS_PRODUCT_ACCESS = "cross_product_access"
 
 class CoreCapability(Enum):
     """Allowed Core capabilities"""
@@ -44,7 +47,7 @@ class CoreBoundaryEnforcer:
     """Enforces constitutional boundaries between Core and Bucket"""
     
     def __init__(self):
-        self.violation_log = []
+        self.violation_store = ViolationStore("boundary")
         self.allowed_capabilities = set(cap.value for cap in CoreCapability)
         self.prohibited_actions = set(action.value for action in ProhibitedAction)
         logger.info("Core Boundary Enforcer initialized")
@@ -55,7 +58,8 @@ class CoreBoundaryEnforcer:
         operation_type: str,
         target_resource: str,
         request_data: Dict[str, Any],
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        digest: Optional[RequestDigest] = None
     ) -> Dict[str, Any]:
         """
         Validate Core request against constitutional boundaries
@@ -66,11 +70,13 @@ class CoreBoundaryEnforcer:
             target_resource: Resource being accessed
             request_data: Request payload
             context: Additional context
+            digest: Pre-built digest of request_data (shared with other pre-flight checks)
             
         Returns:
             Validation result with allowed/denied status
         """
         context = context or {}
+        digest = digest or RequestDigest(request_data)
         
         validation_result = {
             "timestamp": datetime.utcnow().isoformat(),
@@ -104,7 +110,7 @@ class CoreBoundaryEnforcer:
             return validation_result
         
         # Check 3: Detect prohibited actions
-        prohibited_check = self._detect_prohibited_actions(operation_type, request_data, context)
+        prohibited_check = self._detect_prohibited_actions(operation_type, digest, context)
         if prohibited_check["violations"]:
             validation_result["violations"].extend(prohibited_check["violations"])
             logger.error(f"Core attempted prohibited action: {prohibited_check['violations']}")
@@ -112,7 +118,7 @@ class CoreBoundaryEnforcer:
         
         # Check 4: Validate schema integrity
         if operation_type in ["WRITE", "UPDATE"]:
-            schema_check = self._validate_schema_integrity(request_data)
+            schema_check = self._validate_schema_integrity(digest)
             if not schema_check["valid"]:
                 validation_result["violations"].append({
                     "type": BoundaryViolationType.SCHEMA_MUTATION.value,
@@ -134,10 +140,10 @@ class CoreBoundaryEnforcer:
             return validation_result
         
         # Check 6: Validate product isolation
-        if "product_id" in request_data:
+        if digest.has_product_id:
             isolation_check = self._validate_product_isolation(
                 requester_id, 
-                request_data.get("product_id"),
+                digest.product_id,
                 context.get("requesting_product_id")
             )
             if not isolation_check["valid"]:
@@ -192,7 +198,7 @@ class CoreBoundaryEnforcer:
     def _detect_prohibited_actions(
         self, 
         operation_type: str, 
-        request_data: Dict[str, Any],
+        digest: RequestDigest,
         context: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Detect if request contains prohibited actions"""
@@ -207,7 +213,7 @@ class CoreBoundaryEnforcer:
             })
         
         # Check for schema mutation
-        if "schema_change" in request_data or "_schema" in request_data:
+        if digest.mutates_schema:
             violations.append({
                 "type": BoundaryViolationType.SCHEMA_MUTATION.value,
                 "message": "Core cannot mutate schema",
@@ -215,7 +221,7 @@ class CoreBoundaryEnforcer:
             })
         
         # Check for audit hiding
-        if request_data.get("skip_audit") or request_data.get("hide_operation"):
+        if digest.hides_audit:
             violations.append({
                 "type": BoundaryViolationType.AUDIT_HIDING.value,
                 "message": "Core cannot hide operations from audit trail",
@@ -223,7 +229,7 @@ class CoreBoundaryEnforcer:
             })
         
         # Check for governance bypass
-        if context.get("bypass_governance") or request_data.get("emergency_override"):
+        if context.get("bypass_governance") or digest.emergency_override:
             violations.append({
                 "type": BoundaryViolationType.GOVERNANCE_BYPASS.value,
                 "message": "Core cannot bypass governance gate",
@@ -231,7 +237,7 @@ class CoreBoundaryEnforcer:
             })
         
         # Check for direct database access
-        if context.get("direct_db_access") or "raw_query" in request_data:
+        if context.get("direct_db_access") or digest.raw_query:
             violations.append({
                 "type": BoundaryViolationType.UNAUTHORIZED_ACCESS.value,
                 "message": "Core cannot access database directly",
@@ -240,21 +246,15 @@ class CoreBoundaryEnforcer:
         
         return {"violations": violations}
     
-    def _validate_schema_integrity(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _validate_schema_integrity(self, digest: RequestDigest) -> Dict[str, Any]:
         """Validate that request doesn't mutate schema"""
         
-        # Check for schema-related fields
-        prohibited_fields = [
-            "_schema", "schema_version", "schema_change",
-            "add_field", "remove_field", "modify_field"
-        ]
-        
-        for field in prohibited_fields:
-            if field in request_data:
-                return {
-                    "valid": False,
-                    "reason": f"Request contains prohibited schema field: {field}"
-                }
+        # Schema-related fields, in SCHEMA_FIELDS order
+        if digest.schema_fields:
+            return {
+                "valid": False,
+                "reason": f"Request contains prohibited schema field: {digest.schema_fields[0]}"
+            }
         
         return {"valid": True}
     
@@ -288,36 +288,30 @@ class CoreBoundaryEnforcer:
         
         return {"valid": True}
     
+    @property
+    def violation_log(self) -> List[Dict[str, Any]]:
+        """Most recent logged violations (bounded ring buffer)"""
+        return self.violation_store.recent()
+    
     def log_violation(self, violation: Dict[str, Any]):
         """Log boundary violation for audit and escalation"""
         violation["logged_at"] = datetime.utcnow().isoformat()
-        self.violation_log.append(violation)
+        self.violation_store.record(violation, {
+            "type": violation.get("type", "unknown"),
+            "severity": violation.get("severity", "unknown")
+        })
         logger.error(f"Boundary violation logged: {violation}")
     
     def get_violation_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get summary of violations in last N hours"""
-        from datetime import timedelta
-        
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
-        recent_violations = [
-            v for v in self.violation_log
-            if datetime.fromisoformat(v["logged_at"]) > cutoff
-        ]
+        summary = self.violation_store.summarize(hours)
         
         return {
-            "total_violations": len(recent_violations),
-            "by_type": self._group_by_type(recent_violations),
-            "critical_count": len([v for v in recent_violations if v.get("severity") == "CRITICAL"]),
-            "violations": recent_violations
+            "total_violations": summary["total"],
+            "by_type": summary["by"].get("type", {}),
+            "critical_count": summary["by"].get("severity", {}).get("CRITICAL", 0),
+            "violations": summary["events"]
         }
-    
-    def _group_by_type(self, violations: List[Dict]) -> Dict[str, int]:
-        """Group violations by type"""
-        grouped = {}
-        for v in violations:
-            vtype = v.get("type", "unknown")
-            grouped[vtype] = grouped.get(vtype, 0) + 1
-        return grouped
 
 # Global enforcer instance
 core_boundary_enforcer = CoreBoundaryEnforcer()
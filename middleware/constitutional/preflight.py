@@ -0,0 +1,106 @@
+"""
+BHIV Constitutional Pre-flight
+Boundary, contract and threat checks for a Core request in one call
+Document Reference: BHIV_CORE_BUCKET_BOUNDARIES.md, 14_bucket_threat_model.md
+
+The request payload is digested once (RequestDigest); the boundary enforcer,
+the input contract validator for the operation's channel and the threat rules
+are then evaluated from that digest and merged into a single decision.
+"""
+
+from datetime import datetime
+from typing import Dict, Any, Optional
+from middleware.constitutional.core_boundary_enforcer import core_boundary_enforcer
+from middleware.constitutional.request_digest import RequestDigest
+from validators.core_api_contract import core_api_contract, InputChannel
+from utils.threat_validator import BucketThreatModel
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Contract input channel implied by each Core operation (READ/VERIFY carry no input payload)
+OPERATION_INPUT_CHANNELS = {
+    "WRITE": InputChannel.ARTIFACT_WRITE.value,
+    "QUERY": InputChannel.METADATA_QUERY.value,
+    "AUDIT_APPEND": InputChannel.AUDIT_APPEND.value,
+    "RETENTION_REQUEST": InputChannel.RETENTION_REQUEST.value
+}
+
+def run_preflight(
+    requester_id: str,
+    operation_type: str,
+    target_resource: str,
+    request_data: Dict[str, Any],
+    context: Optional[Dict[str, Any]] = None,
+    channel: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run all constitutional pre-flight checks over one request digest
+
+    Args:
+        requester_id: ID of requesting system
+        operation_type: Type of operation (READ, WRITE, QUERY, etc.)
+        target_resource: Resource being accessed
+        request_data: Request payload
+        context: Additional boundary context
+        channel: Contract input channel (defaults to the operation's channel)
+
+    Returns:
+        Combined decision with boundary, contract and threat sections
+    """
+    digest = RequestDigest(request_data)
+
+    boundary = core_boundary_enforcer.validate_request(
+        requester_id=requester_id,
+        operation_type=operation_type,
+        target_resource=target_resource,
+        request_data=request_data,
+        context=context,
+        digest=digest
+    )
+
+    channel = channel or OPERATION_INPUT_CHANNELS.get(operation_type)
+    if channel:
+        contract = core_api_contract.validate_input(channel, request_data, requester_id, field_types=digest.field_types)
+        contract_violations = contract["violations"]
+    else:
+        contract_violations = []
+
+    threats = BucketThreatModel.scan_facts({
+        **digest.threat_facts,
+        "actor": requester_id,
+        "operation": operation_type,
+        "requested_operation": operation_type,
+        "target_type": target_resource
+    })
+    has_critical = BucketThreatModel.has_critical_threats(threats)
+
+    allowed = boundary["allowed"] and not contract_violations and not has_critical
+    if not allowed:
+        logger.warning(
+            f"Pre-flight denied {operation_type} on {target_resource} for {requester_id}: "
+            f"{len(boundary['violations'])} boundary, {len(contract_violations)} contract, "
+            f"{len(threats)} threat findings"
+        )
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "requester_id": requester_id,
+        "operation_type": operation_type,
+        "target_resource": target_resource,
+        "allowed": allowed,
+        "decision": "ALLOW" if allowed else "DENY",
+        "boundary": {
+            "allowed": boundary["allowed"],
+            "violations": boundary["violations"]
+        },
+        "contract": {
+            "channel": channel,
+            "valid": not contract_violations,
+            "violations": contract_violations
+        },
+        "threats": {
+            "has_critical_threats": has_critical,
+            "detected": threats
+        }
+    }
@@ -0,0 +1,47 @@
+"""
+BHIV Constitutional Request Digest
+Everything the boundary, contract and threat checks read from a Core request
+Document Reference: BHIV_CORE_BUCKET_BOUNDARIES.md
+
+The digest is built once per request. The boundary enforcer, contract validator
+and threat rules then evaluate against it instead of each probing request_data
+(and re-walking nested payloads) on their own.
+"""
+
+from typing import Dict, Any, Optional, Tuple
+from models.threat_rule_engine import payload_facts
+
+# Fields that mutate schema (checked in this order, first match is reported)
+SCHEMA_FIELDS = ("_schema", "schema_version", "schema_change", "add_field", "remove_field", "modify_field")
+SCHEMA_MUTATION_MARKERS = frozenset({"schema_change", "_schema"})
+
+class RequestDigest:
+    """Keys, flags and threat facts extracted from one request payload"""
+
+    __slots__ = ("data", "field_types", "schema_fields", "mutates_schema", "hides_audit", "emergency_override",
+                 "raw_query", "has_product_id", "product_id", "_threat_facts")
+
+    def __init__(self, request_data: Dict[str, Any]):
+        data = request_data
+        self.data = data
+
+        # Contract input: top-level field -> value type
+        self.field_types: Dict[str, type] = {field: type(value) for field, value in data.items()}
+
+        # Boundary flags
+        self.schema_fields: Tuple[str, ...] = tuple(field for field in SCHEMA_FIELDS if field in data)
+        self.mutates_schema = not SCHEMA_MUTATION_MARKERS.isdisjoint(self.schema_fields)
+        self.hides_audit = bool(data.get("skip_audit") or data.get("hide_operation"))
+        self.emergency_override = bool(data.get("emergency_override"))
+        self.raw_query = "raw_query" in data
+        self.has_product_id = "product_id" in data
+        self.product_id: Optional[Any] = data.get("product_id")
+
+        self._threat_facts: Optional[Dict[str, Any]] = None
+
+    @property
+    def threat_facts(self) -> Dict[str, Any]:
+        """Threat rule facts, built on first use (walks the payload once)"""
+        if self._threat_facts is None:
+            self._threat_facts = payload_facts(self.data)
+        return self._threat_facts
@@ -0,0 +1,359 @@
+"""
+BHIV Requester Enforcement
+Turns automated violation responses into live per-requester enforcement
+Document Reference: docs/constitutional/ (Violation Response Protocol)
+
+THROTTLE -> token-bucket rate limit (429 + Retry-After)
+BLOCK    -> time-boxed deny list (403)
+HALT     -> circuit breaker: open (503) until cooldown, then half-open for a
+            single probe request which closes or re-opens the breaker
+
+The middleware check is a dict lookup keyed by requester_id and runs before any
+constitutional validator or basket execution. With Redis attached, enforcement
+state is shared across workers. A background thread writes local changes through
+to Redis and merges the shared copy back every SYNC_INTERVAL_SEC, so the request
+path never waits on Redis for state. Throttling uses one token bucket for all
+workers, kept in Redis and updated atomically by a Lua script that runs in a
+worker thread.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import parse_qs
+from starlette.responses import JSONResponse
+from middleware.admission_control import TokenBucket
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REQUESTER_HEADER = b"x-requester-id"
+
+# Paths whose requesters are subject to enforcement
+ENFORCED_PREFIXES = ("/constitutional/core/", "/run-basket", "/create-basket", "/baskets/")
+
+THROTTLE = "throttle"
+BLOCK = "block"
+HALT = "halt"
+
+DEFAULT_DURATIONS_SEC = {THROTTLE: 300, BLOCK: 900, HALT: 1800}
+THROTTLE_RATE_PER_SEC = 1.0
+THROTTLE_BURST = 5
+SYNC_INTERVAL_SEC = 1.0
+
+REDIS_STATE_KEY = "enforcement:requesters"
+
+# Shared token bucket with the same semantics as TokenBucket.reserve(0): refill at
+# ARGV[1] tokens/sec up to ARGV[2], take one token or return the wait. Time comes
+# from the Redis server so workers with skewed clocks agree.
+THROTTLE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or burst
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+class RequesterEnforcer:
+    """Per-requester throttle, deny list and circuit breaker"""
+
+    def __init__(self, redis_client=None):
+        self.redis = redis_client
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.probes_in_flight: set = set()
+        self.stats = {THROTTLE: 0, BLOCK: 0, HALT: 0}
+        # Local changes not yet confirmed by a sync: requester -> (seq, entry or None, persisted)
+        self._changes: Dict[str, Tuple[int, Optional[Dict[str, Any]], bool]] = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._sync_thread: Optional[threading.Thread] = None
+        self._sync_stop = threading.Event()
+        self._sync_now = threading.Event()
+        logger.info("Requester enforcer initialized")
+
+    def attach_redis(self, redis_client):
+        """Share enforcement state across workers through Redis (synced in the background)"""
+        self.close()
+        self.redis = redis_client
+        with self._lock:
+            # Enforcement applied before Redis was attached is written through too
+            for requester_id, entry in self.state.items():
+                if requester_id not in self._changes:
+                    self._record(requester_id, entry)
+        self.sync()
+        self._sync_stop.clear()
+        self._sync_thread = threading.Thread(target=self._sync_loop, name="requester-enforcement-sync", daemon=True)
+        self._sync_thread.start()
+        logger.info("Requester enforcement state persisting to Redis")
+
+    def close(self):
+        """Stop the background sync thread"""
+        if self._sync_thread is not None:
+            self._sync_stop.set()
+            self._sync_now.set()
+            self._sync_thread.join(timeout=SYNC_INTERVAL_SEC + 1)
+            self._sync_thread = None
+
+    def _record(self, requester_id: str, entry: Optional[Dict[str, Any]]):
+        """Queue a local change for the next sync (caller holds the lock)"""
+        self._seq += 1
+        self._changes[requester_id] = (self._seq, entry, False)
+        if entry is None:
+            self.state.pop(requester_id, None)
+        else:
+            self.state[requester_id] = entry
+        self._sync_now.set()
+
+    def apply(self, action: str, requester_id: str, duration: Optional[float] = None):
+        """Start enforcing an automated response against a requester"""
+        if action not in DEFAULT_DURATIONS_SEC:
+            return
+
+        current = self.state.get(requester_id)
+        # Never downgrade an active stronger response (halt > block > throttle)
+        if current and current["until"] > time.time() and self._rank(current["action"]) > self._rank(action):
+            return
+
+        entry = {"action": action, "until": time.time() + (duration or DEFAULT_DURATIONS_SEC[action])}
+        with self._lock:
+            self._record(requester_id, entry)
+        self.buckets.pop(requester_id, None)
+        self.probes_in_flight.discard(requester_id)
+        logger.warning(f"Enforcing {action.upper()} on {requester_id} for {entry['until'] - time.time():.0f}s")
+
+    def clear(self, requester_id: str):
+        """Lift any enforcement on a requester"""
+        with self._lock:
+            self._record(requester_id, None)
+        self.buckets.pop(requester_id, None)
+        self.probes_in_flight.discard(requester_id)
+
+    @staticmethod
+    def _rank(action: str) -> int:
+        return (THROTTLE, BLOCK, HALT).index(action)
+
+    def _sync_loop(self):
+        while not self._sync_stop.is_set():
+            self._sync_now.wait(SYNC_INTERVAL_SEC)
+            self._sync_now.clear()
+            if not self._sync_stop.is_set():
+                self.sync()
+
+    def sync(self):
+        """Write local changes through to Redis, then merge the shared state back.
+        Runs on the background thread; changes Redis has not confirmed stay local."""
+        if self.redis is None:
+            return
+        with self._lock:
+            pending = {requester: change for requester, change in self._changes.items() if not change[2]}
+            fetched_after = self._seq
+        for requester_id, (seq, entry, _) in pending.items():
+            try:
+                if entry is None:
+                    self.redis.hdel(REDIS_STATE_KEY, requester_id)
+                else:
+                    self.redis.hset(REDIS_STATE_KEY, requester_id, json.dumps(entry))
+            except Exception as e:
+                logger.error(f"Failed to persist enforcement for {requester_id}, will retry: {e}")
+                continue
+            with self._lock:
+                if self._changes.get(requester_id, (None,))[0] == seq:
+                    self._changes[requester_id] = (seq, entry, True)
+        try:
+            shared = {requester: json.loads(entry) for requester, entry in self.redis.hgetall(REDIS_STATE_KEY).items()}
+        except Exception as e:
+            logger.error(f"Failed to sync enforcement state, using local copy: {e}")
+            return
+        with self._lock:
+            for requester_id, (seq, entry, persisted) in list(self._changes.items()):
+                if persisted and seq <= fetched_after:
+                    # Already part of the copy just read
+                    del self._changes[requester_id]
+                elif entry is None:
+                    shared.pop(requester_id, None)
+                else:
+                    shared[requester_id] = entry
+            self.state = shared
+
+    def _shared_throttle(self, requester_id: str) -> Optional[float]:
+        """Take a token from the Redis bucket (worker thread); None if Redis is unavailable"""
+        try:
+            return float(self.redis.eval(
+                THROTTLE_SCRIPT, 1, f"enforcement:throttle:{requester_id}",
+                THROTTLE_RATE_PER_SEC, THROTTLE_BURST
+            ))
+        except Exception as e:
+            logger.error(f"Shared throttle unavailable, using local bucket: {e}")
+            return None
+
+    def _local_throttle(self, requester_id: str, now: float) -> float:
+        """Seconds until the requester may retry (0 if allowed)"""
+        bucket = self.buckets.get(requester_id)
+        if bucket is None:
+            bucket = self.buckets[requester_id] = TokenBucket(THROTTLE_RATE_PER_SEC, THROTTLE_BURST)
+        wait = bucket.reserve(0.0, now)
+        return -wait if wait < 0 else 0.0
+
+    async def check_async(self, requester_id: str) -> Optional[Tuple[int, float, str]]:
+        """check(), with throttled requesters drawing on the shared Redis bucket"""
+        entry = self.state.get(requester_id)
+        if self.redis is None or entry is None or entry["action"] != THROTTLE or entry["until"] <= time.time():
+            return self.check(requester_id)
+        retry_after = await asyncio.to_thread(self._shared_throttle, requester_id)
+        if retry_after is None:
+            return self.check(requester_id)
+        if retry_after > 0:
+            self.stats[THROTTLE] += 1
+            return 429, retry_after, THROTTLE
+        return None
+
+    def check(self, requester_id: str) -> Optional[Tuple[int, float, str]]:
+        """
+        Check whether a requester may proceed (local state and buckets only)
+
+        Returns:
+            None if allowed, otherwise (status_code, retry_after_seconds, action)
+        """
+        now = time.time()
+        entry = self.state.get(requester_id)
+        if entry is None:
+            return None
+
+        action = entry["action"]
+        remaining = entry["until"] - now
+
+        if action == HALT:
+            if remaining > 0:
+                self.stats[HALT] += 1
+                return 503, remaining, HALT
+            # Half-open: let exactly one probe through
+            if requester_id in self.probes_in_flight:
+                self.stats[HALT] += 1
+                return 503, 1.0, HALT
+            self.probes_in_flight.add(requester_id)
+            return None
+
+        if remaining <= 0:
+            self.clear(requester_id)
+            return None
+
+        if action == BLOCK:
+            self.stats[BLOCK] += 1
+            return 403, remaining, BLOCK
+
+        retry_after = self._local_throttle(requester_id, now)
+        if retry_after > 0:
+            self.stats[THROTTLE] += 1
+            return 429, retry_after, THROTTLE
+        return None
+
+    def record_probe_result(self, requester_id: str, status_code: int):
+        """Close or re-open a half-open breaker after its probe request"""
+        if requester_id not in self.probes_in_flight:
+            return
+        self.probes_in_flight.discard(requester_id)
+        entry = self.state.get(requester_id)
+        if entry is None or entry["action"] != HALT or entry["until"] > time.time():
+            return  # re-opened by a new violation during the probe
+        if status_code < 500:
+            logger.info(f"Circuit breaker closed for {requester_id}")
+            self.clear(requester_id)
+        else:
+            logger.warning(f"Probe failed, circuit breaker re-opened for {requester_id}")
+            self.apply(HALT, requester_id)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get active enforcement per requester"""
+        now = time.time()
+        return {
+            "active": {
+                requester: {
+                    "action": entry["action"],
+                    "remaining_seconds": round(max(0.0, entry["until"] - now), 1),
+                    "half_open": entry["action"] == HALT and entry["until"] <= now
+                }
+                for requester, entry in self.state.items()
+            },
+            "rejected": dict(self.stats),
+            "shared": self.redis is not None
+        }
+
+class RequesterEnforcementMiddleware:
+    """Reject throttled, blocked or halted requesters before any validation runs"""
+
+    def __init__(self, app, enforcer: Optional[RequesterEnforcer] = None):
+        self.app = app
+        self.enforcer = enforcer or requester_enforcer
+
+    @staticmethod
+    def _requester_id(scope) -> Optional[str]:
+        for name, value in scope.get("headers", ()):
+            if name == REQUESTER_HEADER:
+                return value.decode("latin-1")
+        query = scope.get("query_string", b"")
+        if b"requester_id=" in query:
+            values = parse_qs(query.decode("latin-1")).get("requester_id")
+            if values:
+                return values[0]
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(ENFORCED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        requester_id = self._requester_id(scope)
+        if requester_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        decision = await self.enforcer.check_async(requester_id)
+        if decision is not None:
+            status_code, retry_after, action = decision
+            retry_seconds = max(1, int(retry_after + 0.999))
+            response = JSONResponse(
+                status_code=status_code,
+                content={"detail": {
+                    "message": f"Requester {requester_id} is under {action.upper()} enforcement",
+                    "requester_id": requester_id,
+                    "enforcement": action,
+                    "retry_after_seconds": retry_seconds
+                }},
+                headers={"Retry-After": str(retry_seconds)}
+            )
+            await response(scope, receive, send)
+            return
+
+        if requester_id not in self.enforcer.probes_in_flight:
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.enforcer.record_probe_result(requester_id, status["code"])
+
+# Global requester enforcer instance
+requester_enforcer = RequesterEnforcer()
@@ -0,0 +1,159 @@
+"""
+BHIV Bucket Request Instrumentation Middleware
+Feeds live read/write concurrency and latency histograms into ScaleMonitor
+Document Reference: 15_scale_readiness.md (Real-time Monitoring)
+
+Implemented as a raw ASGI middleware (not BaseHTTPMiddleware) so the per-request
+cost stays at a few microseconds: one cached route classification, two
+perf_counter() calls and a handful of dict/counter updates.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+from utils.logger import get_logger
+from utils.scale_monitor import ScaleMonitor, scale_monitor
+
+logger = get_logger(__name__)
+
+READ = "read"
+WRITE = "write"
+IGNORE = "ignore"
+
+WRITE_METHODS = frozenset(["POST", "PUT", "PATCH", "DELETE"])
+
+# Endpoints that are not Bucket traffic (monitoring, docs) are never tracked
+IGNORED_PREFIXES = ("/metrics", "/docs", "/redoc", "/openapi.json", "/favicon.ico")
+
+# POST endpoints that only validate or compute; they persist nothing. Listed
+# explicitly so a new mutating route is classified as a write by default
+READ_ONLY_POST_ROUTES = frozenset([
+    "/governance/validate-artifact",
+    "/governance/validate-artifact-admission",
+    "/governance/validate-schema",
+    "/governance/validate-integration-pattern",
+    "/governance/validate-data-flow",
+    "/governance/validate-integration-checklist",
+    "/governance/retention/calculate",
+    "/governance/retention/plan",
+    "/governance/integration-gate/validate-request",
+    "/governance/integration-gate/validate-section",
+    "/governance/integration-gate/check-blocking",
+    "/governance/integration-gate/generate-approval",
+    "/governance/integration-gate/generate-rejection",
+    "/governance/integration-gate/calculate-deadline",
+    "/governance/executor/categorize-change",
+    "/governance/executor/validate-change",
+    "/governance/escalation/validate-response",
+    "/governance/escalation/assess-conflict",
+    "/governance/owner/validate-principle",
+    "/governance/owner/check-confirmation",
+    "/governance/gate/validate-operation",
+    "/governance/scale/validate",
+    "/governance/threats/scan",
+    "/governance/threats/scan-batch",
+    "/governance/threats/scan-with-context",
+    "/governance/threats/check-storage-exhaustion",
+    "/governance/threats/check-executor-override",
+    "/governance/threats/check-ai-escalation",
+    "/governance/threats/check-audit-tampering",
+    "/governance/threats/check-cross-product-leak",
+    "/constitutional/core/validate-request",
+    "/constitutional/core/validate-input",
+    "/constitutional/core/validate-output",
+    "/constitutional/core/validate-input-batch",
+    "/constitutional/core/validate-output-batch",
+])
+
+_MAX_CLASSIFICATION_CACHE = 4096
+_classification_cache: Dict[tuple, str] = {}
+
+# Labels attached by handlers (basket/agent) for the request being served
+_request_labels: ContextVar[Optional[Dict[str, str]]] = ContextVar("request_labels", default=None)
+
+def classify_route(method: str, path: str) -> str:
+    """Classify a request as read, write or ignore"""
+    key = (method, path)
+    kind = _classification_cache.get(key)
+    if kind is not None:
+        return kind
+
+    if path.startswith(IGNORED_PREFIXES) or method in ("OPTIONS", "HEAD"):
+        kind = IGNORE
+    elif method not in WRITE_METHODS:
+        kind = READ
+    elif method == "POST" and path in READ_ONLY_POST_ROUTES:
+        kind = READ
+    else:
+        kind = WRITE
+
+    # Path parameters make the key space unbounded; reset rather than grow
+    if len(_classification_cache) >= _MAX_CLASSIFICATION_CACHE:
+        _classification_cache.clear()
+    _classification_cache[key] = kind
+    return kind
+
+def tag_request(**labels: str):
+    """Attach basket/agent labels to the current request's latency measurement"""
+    current = _request_labels.get()
+    if current is not None:
+        current.update({key: value for key, value in labels.items() if value})
+
+class RequestInstrumentationMiddleware:
+    """Track in-flight reads/writes and per-route latency for every HTTP request"""
+
+    def __init__(self, app, monitor: Optional[ScaleMonitor] = None):
+        self.app = app
+        self.monitor = monitor or scale_monitor
+        logger.info("Request instrumentation middleware initialized")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        kind = classify_route(method, scope["path"])
+        if kind == IGNORE:
+            await self.app(scope, receive, send)
+            return
+
+        monitor = self.monitor
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        labels: Dict[str, str] = {}
+        token = _request_labels.set(labels)
+
+        if kind == WRITE:
+            await monitor.track_write_start()
+        else:
+            await monitor.track_read_start()
+        start = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            _request_labels.reset(token)
+
+            if kind == WRITE:
+                await monitor.track_write_end()
+            else:
+                await monitor.track_read_end()
+                await monitor.record_query_latency(latency_ms)
+
+            # Label by route template so path parameters don't explode cardinality
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            monitor.observe_request(f"{method} {route}", kind, latency_ms, status_code >= 500)
+            if labels:
+                monitor.observe_execution(
+                    basket=labels.get("basket"),
+                    agent=labels.get("agent"),
+                    latency_ms=latency_ms
+                )
@@ -1,13 +1,12 @@
 """
 BHIV Bucket Threat Detector
-Automated detection for all 10 identified threats
+Automated detection for all 10 identified threats (facade over the threat rule engine)
 Document Reference: 14_bucket_threat_model.md
 """
 
 from typing import Dict, Any, List, Optional
-from datetime import datetime
 from utils.logger import get_logger
-from config.limits import BucketLimits, PRODUCT_QUOTAS, PRODUCT_ARTIFACT_ALLOWLIST
+from models.threat_rule_engine import threat_rule_engine, DETECTOR_AI_ALLOWED_OPERATIONS
 
 logger = get_logger(__name__)
 
@@ -26,122 +25,84 @@ class BucketThreatDetector:
         "T10_PROVENANCE_OVERTRUST": {"name": "Provenance Overtrust", "severity": "MEDIUM", "escalation": "Vijay_Dhawan"}
     }
     
+    # Legacy ids and actions reported by this facade
+    THREAT_ID_ALIASES = {"T7_CROSS_PRODUCT_CONTAMINATION": "T7_CROSS_PRODUCT"}
+    ACTION_ALIASES = {
+        "REJECT_OPERATION": "REJECT",
+        "REJECT_AND_ALERT": "REJECT",
+        "BLOCK_AND_ESCALATE": "BLOCK",
+        "HALT_AND_INVESTIGATE": "HALT"
+    }
+    
+    # Rules evaluated by scan_all_threats (context carries no payload)
+    SCAN_RULES = (
+        "T1_STORAGE_CAPACITY", "T2_METADATA_INJECTION", "T5_EXECUTOR_SCOPE",
+        "T6_AI_ESCALATION", "T7_PRODUCT_ARTIFACT", "T8_AUDIT_TAMPERING"
+    )
+    
+    @classmethod
+    def _to_detector(cls, record: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "threat_id": cls.THREAT_ID_ALIASES.get(record["threat_id"], record["threat_id"]),
+            "severity": record["severity"],
+            "details": record["details"],
+            "escalation": record["escalation"],
+            "action": cls.ACTION_ALIASES.get(record["action"], record["action"])
+        }
+    
+    @classmethod
+    def _evaluate(cls, facts: Dict[str, Any], rule_ids) -> List[Dict[str, Any]]:
+        return [cls._to_detector(record) for record in threat_rule_engine.evaluate(facts, rule_ids)]
+    
+    @classmethod
+    def _first(cls, facts: Dict[str, Any], rule_id: str) -> Optional[Dict[str, Any]]:
+        threats = cls._evaluate(facts, (rule_id,))
+        return threats[0] if threats else None
+    
     @classmethod
     async def check_storage_exhaustion(cls, used_gb: float) -> Optional[Dict[str, Any]]:
         """T1: Detect storage exhaustion"""
-        status = BucketLimits.check_storage_capacity(used_gb)
-        if status["status"] in ["WARNING", "CRITICAL"]:
-            return {
-                "threat_id": "T1_STORAGE_EXHAUSTION",
-                "severity": "CRITICAL" if status["status"] == "CRITICAL" else "HIGH",
-                "details": status,
-                "escalation": status["escalation_path"],
-                "action": status["action_required"]
-            }
-        return None
+        return cls._first({"used_gb": used_gb}, "T1_STORAGE_CAPACITY")
     
     @classmethod
     async def detect_metadata_poisoning(cls, metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """T2: Detect metadata poisoning"""
-        threats = []
-        for key, value in metadata.items():
-            if isinstance(value, str):
-                if len(value.encode()) > BucketLimits.METADATA_FIELD_MAX_SIZE_BYTES:
-                    threats.append(f"Oversized: {key}")
-                if any(p in value.lower() for p in ["drop table", "delete from", "<script>"]):
-                    threats.append(f"Injection: {key}")
-        
-        if threats:
-            return {
-                "threat_id": "T2_METADATA_POISONING",
-                "severity": "CRITICAL",
-                "details": {"patterns": threats},
-                "escalation": "CEO",
-                "action": "REJECT"
-            }
-        return None
+        return cls._first({"metadata": metadata}, "T2_METADATA_INJECTION")
     
     @classmethod
     async def detect_executor_misbehavior(cls, actor: str, operation: str) -> Optional[Dict[str, Any]]:
         """T5: Detect executor violations"""
-        if actor == "akanksha_parab" and operation not in ["CREATE", "READ", "APPROVE_INTEGRATION"]:
-            return {
-                "threat_id": "T5_EXECUTOR_OVERRIDE",
-                "severity": "CRITICAL",
-                "details": {"actor": actor, "operation": operation},
-                "escalation": "Vijay_Dhawan",
-                "action": "BLOCK"
-            }
-        return None
+        return cls._first({"actor": actor, "operation": operation}, "T5_EXECUTOR_SCOPE")
     
     @classmethod
     async def detect_ai_escalation(cls, actor: str, operation: str) -> Optional[Dict[str, Any]]:
         """T6: Detect AI escalation"""
-        if actor.startswith("ai_") and operation not in ["CREATE", "APPEND_AUDIT"]:
-            return {
-                "threat_id": "T6_AI_ESCALATION",
-                "severity": "CRITICAL",
-                "details": {"actor": actor, "operation": operation},
-                "escalation": "Vijay_Dhawan",
-                "action": "REJECT"
-            }
-        return None
+        return cls._first({
+            "actor": actor,
+            "requested_operation": operation,
+            "ai_allowed_operations": DETECTOR_AI_ALLOWED_OPERATIONS
+        }, "T6_AI_ESCALATION")
     
     @classmethod
     async def detect_cross_product_contamination(cls, product_id: str, artifact_type: str) -> Optional[Dict[str, Any]]:
         """T7: Detect cross-product violations"""
-        if product_id in PRODUCT_ARTIFACT_ALLOWLIST:
-            if artifact_type not in PRODUCT_ARTIFACT_ALLOWLIST[product_id]:
-                return {
-                    "threat_id": "T7_CROSS_PRODUCT",
-                    "severity": "HIGH",
-                    "details": {"product": product_id, "type": artifact_type},
-                    "escalation": "Security_Team",
-                    "action": "REJECT"
-                }
-        return None
+        # A missing artifact type is still outside a known product's allowlist
+        artifact_type = "" if artifact_type is None else artifact_type
+        return cls._first({"product_id": product_id, "artifact_type": artifact_type}, "T7_PRODUCT_ARTIFACT")
     
     @classmethod
     async def detect_audit_tampering(cls, operation: str, target: str) -> Optional[Dict[str, Any]]:
         """T8: Detect audit tampering"""
-        if operation in ["DELETE", "UPDATE"] and target == "audit_log":
-            return {
-                "threat_id": "T8_AUDIT_TAMPERING",
-                "severity": "CRITICAL",
-                "details": {"operation": operation, "target": target},
-                "escalation": "CEO",
-                "action": "HALT"
-            }
-        return None
+        return cls._first({"operation": operation, "target_type": target}, "T8_AUDIT_TAMPERING")
     
     @classmethod
     async def scan_all_threats(cls, context: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Scan for all threats"""
-        threats = []
-        
-        if "used_gb" in context:
-            t = await cls.check_storage_exhaustion(context["used_gb"])
-            if t: threats.append(t)
-        
-        if "metadata" in context:
-            t = await cls.detect_metadata_poisoning(context["metadata"])
-            if t: threats.append(t)
-        
-        if "actor" in context and "operation" in context:
-            t = await cls.detect_executor_misbehavior(context["actor"], context["operation"])
-            if t: threats.append(t)
-            t = await cls.detect_ai_escalation(context["actor"], context["operation"])
-            if t: threats.append(t)
-        
-        if "product_id" in context and "artifact_type" in context:
-            t = await cls.detect_cross_product_contamination(context["product_id"], context["artifact_type"])
-            if t: threats.append(t)
-        
-        if "operation" in context and "target_type" in context:
-            t = await cls.detect_audit_tampering(context["operation"], context["target_type"])
-            if t: threats.append(t)
-        
-        return threats
+        """Scan for all threats (only rules whose context keys are present run)"""
+        facts = dict(context)
+        if "operation" in context:
+            facts["requested_operation"] = context["operation"]
+            facts["ai_allowed_operations"] = DETECTOR_AI_ALLOWED_OPERATIONS
+        return cls._evaluate(facts, cls.SCAN_RULES)
     
     @classmethod
     def has_critical_threats(cls, threats: List[Dict[str, Any]]) -> bool:
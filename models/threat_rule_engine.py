@@ -0,0 +1,313 @@
+"""
+BHIV Bucket Threat Rule Engine
+Single declarative rule set behind BucketThreatDetector and BucketThreatModel
+Document Reference: 14_bucket_threat_model.md
+
+Each rule declares the facts it needs (actor, operation, metadata, ...), the
+threat it reports and a pure check function. Rules are compiled once into a
+decision table keyed by the set of facts present, so a scan only evaluates
+rules whose inputs were supplied - no per-request if-chains.
+
+Canonical ids, severities and actions follow the published escalation matrix
+(/governance/threats/escalation-matrix); facades map them to legacy shapes.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+from config.limits import BucketLimits, PRODUCT_ARTIFACT_ALLOWLIST
+from utils.injection_scanner import injection_scanner
+from utils.payload_estimator import estimate_payload, exceeds_size, json_string_size
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EXECUTOR_ACTOR = "akanksha_parab"
+EXECUTOR_ALLOWED_OPERATIONS = frozenset({"CREATE", "READ", "APPROVE_INTEGRATION"})
+# Each facade keeps its own AI allowlist; it is passed to T6 as the
+# ai_allowed_operations fact
+DETECTOR_AI_ALLOWED_OPERATIONS = frozenset({"CREATE", "APPEND_AUDIT"})
+MODEL_AI_ALLOWED_OPERATIONS = frozenset({"WRITE", "APPEND_AUDIT"})
+AUDIT_MUTATIONS = frozenset({"DELETE", "UPDATE"})
+
+BACKDATE_TOLERANCE_SECONDS = 300  # 5 minutes clock skew
+SCHEMA_NESTED_OBJECT_MAX_BYTES = 10000
+LARGE_ARTIFACT_WARNING_BYTES = 10 * 1024 * 1024  # limit is 16MB
+
+Hit = Optional[Dict[str, Any]]
+
+class ThreatRule:
+    """One declarative detection rule"""
+
+    __slots__ = ("rule_id", "threat_id", "name", "severity", "pattern", "description",
+                 "escalation", "action", "requires", "check")
+
+    def __init__(self, rule_id: str, threat_id: str, name: str, severity: str, pattern: str,
+                 description: str, escalation: str, action: str, requires: Tuple[str, ...],
+                 check: Callable[[Dict[str, Any]], Hit]):
+        self.rule_id = rule_id
+        self.threat_id = threat_id
+        self.name = name
+        self.severity = severity
+        self.pattern = pattern
+        self.description = description
+        self.escalation = escalation
+        self.action = action
+        self.requires = frozenset(requires)
+        self.check = check
+
+# ---------------------------------------------------------------------------
+# Checks: pure functions of the facts; return None or overrides/details
+# ---------------------------------------------------------------------------
+
+def is_valid_owner_id(owner_id: Any) -> bool:
+    """Basic owner_id validation: non-empty string under 256 chars"""
+    return isinstance(owner_id, str) and 0 < len(owner_id) < 256
+
+def is_backdated(timestamp: Any) -> bool:
+    """Timestamp older than the allowed clock skew (unparseable counts as backdated)"""
+    try:
+        if isinstance(timestamp, str):
+            ts = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        else:
+            ts = timestamp
+        now = datetime.now(ts.tzinfo) if ts.tzinfo else datetime.now()
+        return (now - ts).total_seconds() > BACKDATE_TOLERANCE_SECONDS
+    except Exception:
+        return True
+
+def has_schema_drift(payload: Dict[str, Any]) -> bool:
+    """Suspiciously large nested object at the top level"""
+    return any(
+        isinstance(value, dict) and exceeds_size(value, SCHEMA_NESTED_OBJECT_MAX_BYTES)
+        for value in payload.values()
+    )
+
+def is_large_artifact(payload: Dict[str, Any]) -> bool:
+    """Artifact approaching the size limit"""
+    return exceeds_size(payload, LARGE_ARTIFACT_WARNING_BYTES)
+
+def payload_shape(payload: Dict[str, Any]) -> Dict[str, bool]:
+    """
+    Answer both payload size rules in one walk: schema drift (a top-level
+    object over 10 KB) and large artifact (whole payload over 10 MB)
+    """
+    total = 2 + 2 * max(len(payload) - 1, 0)
+    large = drift = False
+    for key, value in payload.items():
+        if large:
+            # Size verdict known; only drift still needs an answer
+            if isinstance(value, dict) and exceeds_size(value, SCHEMA_NESTED_OBJECT_MAX_BYTES):
+                drift = True
+                break
+            continue
+        measured = estimate_payload(value, LARGE_ARTIFACT_WARNING_BYTES)
+        total += json_string_size(key if isinstance(key, str) else str(key)) + 2 + measured["json_bytes"]
+        if isinstance(value, dict) and measured["json_bytes"] > SCHEMA_NESTED_OBJECT_MAX_BYTES:
+            drift = True
+        large = measured["exceeded"] or total > LARGE_ARTIFACT_WARNING_BYTES
+        if large and drift:
+            break
+    return {"schema_drift": drift, "large_artifact": large}
+
+def payload_facts(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Threat facts carried by a payload (owner, timestamp, product, metadata, size shape)"""
+    facts = {
+        "timestamp": data.get("timestamp"),
+        "product_id": data.get("product_id"),
+        "artifact_type": data.get("artifact_type"),
+        "payload_shape": payload_shape(data)
+    }
+    if "owner_id" in data:
+        # Present-but-empty owner is itself a forgery signal
+        facts["owner_id"] = data["owner_id"] if data["owner_id"] is not None else ""
+    if isinstance(data.get("metadata"), (dict, list)):
+        facts["metadata"] = data["metadata"]
+    if "product_id" in data and "artifact_type" in data:
+        facts["product_artifact_missing"] = not (data["product_id"] and data["artifact_type"])
+    return facts
+
+def _check_storage(facts: Dict[str, Any]) -> Hit:
+    status = BucketLimits.check_storage_capacity(facts["used_gb"])
+    if status["status"] not in ("WARNING", "CRITICAL"):
+        return None
+    return {
+        "severity": "CRITICAL" if status["status"] == "CRITICAL" else "HIGH",
+        "escalation": status["escalation_path"],
+        "action": status["action_required"],
+        "details": status
+    }
+
+def _check_owner(facts: Dict[str, Any]) -> Hit:
+    return None if is_valid_owner_id(facts["owner_id"]) else {}
+
+def _check_backdated(facts: Dict[str, Any]) -> Hit:
+    return {} if is_backdated(facts["timestamp"]) else None
+
+def _check_metadata(facts: Dict[str, Any]) -> Hit:
+    metadata = facts["metadata"]
+    if not isinstance(metadata, (dict, list)):
+        return None
+    scan = injection_scanner.scan(metadata, BucketLimits.METADATA_FIELD_MAX_SIZE_BYTES)
+    patterns = [f"Oversized: {path}" for path, _ in scan["oversized"]]
+    patterns += [f"Injection: {path}" for path, _ in scan["injections"]]
+    if not patterns:
+        return None
+    return {
+        "details": {"patterns": patterns},
+        "description": f"Poisoned metadata fields: {', '.join(patterns)}"
+    }
+
+def _check_schema(facts: Dict[str, Any]) -> Hit:
+    return {} if facts["payload_shape"]["schema_drift"] else None
+
+def _check_executor_scope(facts: Dict[str, Any]) -> Hit:
+    if facts["actor"] == EXECUTOR_ACTOR and facts["operation"] not in EXECUTOR_ALLOWED_OPERATIONS:
+        return {
+            "details": {"actor": facts["actor"], "operation": facts["operation"]},
+            "description": f"Executor attempted action outside defined scope: {facts['operation']}"
+        }
+    return None
+
+def _check_executor_override(facts: Dict[str, Any]) -> Hit:
+    if facts["actor"] == EXECUTOR_ACTOR and facts["override_attempted"]:
+        return {"details": {"actor": facts["actor"], "override_attempted": True}}
+    return None
+
+def _check_ai_escalation(facts: Dict[str, Any]) -> Hit:
+    # A missing requested operation is not on any allowlist
+    actor, operation = facts["actor"], facts.get("requested_operation")
+    if isinstance(actor, str) and actor.startswith("ai_") and operation not in facts["ai_allowed_operations"]:
+        return {
+            "details": {"actor": actor, "operation": operation},
+            "description": f"AI actor requested unauthorized operation: {operation}"
+        }
+    return None
+
+def _check_cross_product(facts: Dict[str, Any]) -> Hit:
+    # Unknown products have no allowlist to violate
+    product_id, artifact_type = facts["product_id"], facts["artifact_type"]
+    allowed = PRODUCT_ARTIFACT_ALLOWLIST.get(product_id)
+    if allowed is None or artifact_type in allowed:
+        return None
+    return {"details": {"product": product_id, "type": artifact_type}}
+
+def _check_product_artifact_missing(facts: Dict[str, Any]) -> Hit:
+    product_id, artifact_type = facts.get("product_id"), facts.get("artifact_type")
+    if not facts["product_artifact_missing"]:
+        return None
+    if product_id in PRODUCT_ARTIFACT_ALLOWLIST and artifact_type is not None:
+        return None  # reported by T7_PRODUCT_ARTIFACT
+    return {
+        "details": {"product": product_id, "type": artifact_type},
+        "description": "Product or artifact type missing"
+    }
+
+def _check_audit_tampering(facts: Dict[str, Any]) -> Hit:
+    if facts["operation"] in AUDIT_MUTATIONS and facts["target_type"] == "audit_log":
+        return {"details": {"operation": facts["operation"], "target": facts["target_type"]}}
+    return None
+
+def _check_large_artifact(facts: Dict[str, Any]) -> Hit:
+    return {} if facts["payload_shape"]["large_artifact"] else None
+
+# ---------------------------------------------------------------------------
+# Rule declarations (evaluation and report order)
+# ---------------------------------------------------------------------------
+
+THREAT_RULES: Tuple[ThreatRule, ...] = (
+    ThreatRule("T1_STORAGE_CAPACITY", "T1_STORAGE_EXHAUSTION", "Storage Exhaustion", "HIGH",
+               "rapid_writes", "Storage capacity threshold reached", "Ops_Team", "PLAN_EXPANSION",
+               ("used_gb",), _check_storage),
+    ThreatRule("T2_FORGED_OWNER", "T2_METADATA_POISONING", "Metadata Poisoning", "CRITICAL",
+               "forged_owner", "Invalid or forged owner_id detected", "CEO", "HALT_OPERATIONS",
+               ("owner_id",), _check_owner),
+    ThreatRule("T2_BACKDATED_TIMESTAMP", "T2_METADATA_POISONING", "Backdated Timestamp", "CRITICAL",
+               "backdated_timestamp", "Timestamp is in the past beyond acceptable threshold", "CEO",
+               "REJECT_OPERATION", ("timestamp",), _check_backdated),
+    ThreatRule("T2_METADATA_INJECTION", "T2_METADATA_POISONING", "Metadata Injection", "CRITICAL",
+               "injection_pattern", "Injection pattern or oversized metadata field", "CEO",
+               "REJECT_OPERATION", ("metadata",), _check_metadata),
+    ThreatRule("T3_SCHEMA_DRIFT", "T3_SCHEMA_EVOLUTION", "Schema Drift", "HIGH",
+               "new_required_field", "Unexpected schema changes detected", "Vijay_Dhawan",
+               "REQUIRE_REVIEW", ("payload_shape",), _check_schema),
+    ThreatRule("T5_EXECUTOR_SCOPE", "T5_EXECUTOR_OVERRIDE", "Executor Authority Violation", "CRITICAL",
+               "governance_bypass", "Executor attempted action outside defined scope", "Vijay_Dhawan",
+               "BLOCK_AND_ESCALATE", ("actor", "operation"), _check_executor_scope),
+    ThreatRule("T5_EXECUTOR_OVERRIDE", "T5_EXECUTOR_OVERRIDE", "Executor Authority Violation", "CRITICAL",
+               "governance_bypass", "Executor attempted to override governance", "Vijay_Dhawan",
+               "BLOCK_AND_ESCALATE", ("actor", "override_attempted"), _check_executor_override),
+    ThreatRule("T6_AI_ESCALATION", "T6_AI_ESCALATION", "AI Authority Escalation", "CRITICAL",
+               "automated_request", "AI actor requested unauthorized operation", "Vijay_Dhawan",
+               "REJECT_AND_ALERT", ("actor", "ai_allowed_operations"), _check_ai_escalation),
+    ThreatRule("T7_PRODUCT_ARTIFACT", "T7_CROSS_PRODUCT_CONTAMINATION", "Product Artifact Mismatch", "HIGH",
+               "wrong_product_id", "Artifact type not allowed for this product", "Security_Team",
+               "REJECT_OPERATION", ("product_id", "artifact_type"), _check_cross_product),
+    ThreatRule("T7_PRODUCT_ARTIFACT_MISSING", "T7_CROSS_PRODUCT_CONTAMINATION", "Product Artifact Missing", "HIGH",
+               "wrong_product_id", "Artifact type not allowed for this product", "Security_Team",
+               "REJECT_OPERATION", ("product_artifact_missing",), _check_product_artifact_missing),
+    ThreatRule("T8_AUDIT_TAMPERING", "T8_AUDIT_TAMPERING", "Audit Trail Tampering Attempt", "CRITICAL",
+               "log_deletion", "Attempt to modify or delete audit logs", "CEO",
+               "HALT_AND_INVESTIGATE", ("operation", "target_type"), _check_audit_tampering),
+    ThreatRule("T1_LARGE_ARTIFACT", "T1_STORAGE_EXHAUSTION", "Large Artifact Warning", "MEDIUM",
+               "large_artifacts", "Artifact size approaching limit", "Ops_Team", "MONITOR",
+               ("payload_shape",), _check_large_artifact),
+)
+
+class ThreatRuleEngine:
+    """Evaluates declarative threat rules through a fact-indexed decision table"""
+
+    MAX_TABLE_ENTRIES = 256
+
+    def __init__(self, rules: Iterable[ThreatRule] = THREAT_RULES):
+        self.rules = tuple(rules)
+        self.rules_by_id = {rule.rule_id: rule for rule in self.rules}
+        self.known_facts = frozenset().union(*(rule.requires for rule in self.rules))
+        self._table: Dict[FrozenSet[str], Tuple[ThreatRule, ...]] = {}
+        logger.info(f"Threat rule engine compiled {len(self.rules)} rules over {len(self.known_facts)} facts")
+
+    def applicable_rules(self, present: FrozenSet[str]) -> Tuple[ThreatRule, ...]:
+        """Rules whose required facts are all present (memoized per fact set)"""
+        rules = self._table.get(present)
+        if rules is None:
+            rules = tuple(rule for rule in self.rules if rule.requires <= present)
+            if len(self._table) < self.MAX_TABLE_ENTRIES:
+                self._table[present] = rules
+        return rules
+
+    def evaluate(self, facts: Dict[str, Any], rule_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Run applicable rules over the facts
+
+        Args:
+            facts: Fact name -> value (None values count as absent)
+            rule_ids: Restrict evaluation to these rules
+
+        Returns:
+            Canonical threat records in declaration order
+        """
+        present = frozenset(key for key, value in facts.items() if value is not None and key in self.known_facts)
+        rules = self.applicable_rules(present)
+        if rule_ids is not None:
+            wanted = set(rule_ids)
+            rules = [rule for rule in rules if rule.rule_id in wanted]
+
+        records = []
+        for rule in rules:
+            hit = rule.check(facts)
+            if hit is None:
+                continue
+            records.append({
+                "threat_id": rule.threat_id,
+                "rule_id": rule.rule_id,
+                "name": rule.name,
+                "severity": hit.get("severity", rule.severity),
+                "pattern": rule.pattern,
+                "description": hit.get("description", rule.description),
+                "escalation": hit.get("escalation", rule.escalation),
+                "action": hit.get("action", rule.action),
+                "details": hit.get("details", {})
+            })
+        return records
+
+# Global rule engine instance
+threat_rule_engine = ThreatRuleEngine()
@@ -0,0 +1,217 @@
+"""
+Unit Tests for BHIV Bucket Admission Control
+Tests token buckets, bounded concurrency queues and 429 load shedding
+"""
+
+import asyncio
+import pytest
+from middleware.admission_control import (
+    AdmissionController,
+    AdmissionControlMiddleware,
+    ConcurrencyLimiter,
+    TokenBucket
+)
+from middleware.request_instrumentation import READ, WRITE
+
+def make_scope(method: str, path: str, product: str = None):
+    """Build a minimal ASGI HTTP scope"""
+    headers = [(b"x-product-id", product.encode())] if product else []
+    return {"type": "http", "method": method, "path": path, "headers": headers}
+
+class ResponseRecorder:
+    """Collect ASGI messages sent by the middleware"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def __call__(self, message):
+        self.messages.append(message)
+
+    @property
+    def status(self):
+        return self.messages[0]["status"]
+
+    @property
+    def headers(self):
+        return dict(self.messages[0]["headers"])
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+def slow_app(release: asyncio.Event):
+    """ASGI app that holds its slot until release is set"""
+    async def app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+    return app
+
+class TestTokenBucket:
+    """Test write throughput token bucket"""
+
+    def test_burst_then_pacing(self):
+        """Test tokens are available up to burst, then reservations pace"""
+        bucket = TokenBucket(10, burst=2)
+        now = bucket.updated_at
+        assert bucket.reserve(1.0, now) == 0
+        assert bucket.reserve(1.0, now) == 0
+        assert bucket.reserve(1.0, now) == pytest.approx(0.1)
+        assert bucket.reserve(1.0, now) == pytest.approx(0.2)
+
+    def test_reject_beyond_deadline(self):
+        """Test negative retry-after when wait exceeds deadline"""
+        bucket = TokenBucket(1, burst=1)
+        now = bucket.updated_at
+        assert bucket.reserve(0.1, now) == 0
+        assert bucket.reserve(0.1, now) < 0
+
+    def test_refill(self):
+        """Test tokens refill over time"""
+        bucket = TokenBucket(10, burst=1)
+        now = bucket.updated_at
+        bucket.reserve(1.0, now)
+        assert bucket.reserve(1.0, now + 0.2) == 0
+
+class TestConcurrencyLimiter:
+    """Test bounded queue semaphore"""
+
+    @pytest.mark.asyncio
+    async def test_handoff_to_waiter(self):
+        """Test release hands the slot to the queued waiter"""
+        limiter = ConcurrencyLimiter(1, max_queue=1)
+        assert await limiter.acquire(0.1)
+        waiter = asyncio.ensure_future(limiter.acquire(1.0))
+        await asyncio.sleep(0)
+        limiter.release()
+        assert await waiter
+        assert limiter.active == 1
+        limiter.release()
+        assert limiter.active == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_full_sheds(self):
+        """Test acquire fails immediately when queue is full"""
+        limiter = ConcurrencyLimiter(1, max_queue=0)
+        assert await limiter.acquire(0.1)
+        assert not await limiter.acquire(0.1)
+
+    @pytest.mark.asyncio
+    async def test_deadline_expires(self):
+        """Test waiter gives up at the deadline and leaves the queue"""
+        limiter = ConcurrencyLimiter(1, max_queue=5)
+        assert await limiter.acquire(0.1)
+        assert not await limiter.acquire(0.01)
+        assert len(limiter.waiters) == 0
+
+class TestAdmissionMiddleware:
+    """Test load shedding through the ASGI middleware"""
+
+    @pytest.mark.asyncio
+    async def test_sheds_with_retry_after(self):
+        """Test 429 with Retry-After once concurrency and queue are exhausted"""
+        release = asyncio.Event()
+        controller = AdmissionController(max_concurrent_writes=1, max_queue_depth=0, queue_timeout_ms=10)
+        middleware = AdmissionControlMiddleware(slow_app(release), controller=controller)
+
+        first = ResponseRecorder()
+        running = asyncio.ensure_future(middleware(make_scope("POST", "/run-basket"), receive, first))
+        await asyncio.sleep(0)
+
+        second = ResponseRecorder()
+        await middleware(make_scope("POST", "/run-basket"), receive, second)
+        assert second.status == 429
+        assert b"retry-after" in second.headers
+
+        release.set()
+        await running
+        assert first.status == 200
+        assert controller.class_limiters[WRITE].active == 0
+        assert controller.stats[WRITE]["shed_concurrency"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_shed_refunds_write_tokens(self):
+        """Test a write shed at the concurrency stage does not burn write budget"""
+        release = asyncio.Event()
+        controller = AdmissionController(max_concurrent_writes=1, max_queue_depth=0, queue_timeout_ms=10)
+        middleware = AdmissionControlMiddleware(slow_app(release), controller=controller)
+
+        running = asyncio.ensure_future(middleware(make_scope("POST", "/run-basket"), receive, ResponseRecorder()))
+        await asyncio.sleep(0)
+        tokens_before = controller.write_bucket.tokens
+
+        shed = ResponseRecorder()
+        await middleware(make_scope("POST", "/run-basket"), receive, shed)
+        assert shed.status == 429
+        assert controller.write_bucket.tokens >= tokens_before
+
+        release.set()
+        await running
+
+    @pytest.mark.asyncio
+    async def test_queued_request_admitted(self):
+        """Test request waiting within the deadline is admitted"""
+        release = asyncio.Event()
+        controller = AdmissionController(max_concurrent_reads=1, max_queue_depth=5, queue_timeout_ms=500)
+        middleware = AdmissionControlMiddleware(slow_app(release), controller=controller)
+
+        first, second = ResponseRecorder(), ResponseRecorder()
+        tasks = [
+            asyncio.ensure_future(middleware(make_scope("GET", "/baskets"), receive, first)),
+            asyncio.ensure_future(middleware(make_scope("GET", "/baskets"), receive, second))
+        ]
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.gather(*tasks)
+        assert first.status == 200 and second.status == 200
+        assert controller.stats[READ]["admitted"] == 2
+
+    @pytest.mark.asyncio
+    async def test_product_share_isolation(self):
+        """Test one product cannot take more than its share of capacity"""
+        release = asyncio.Event()
+        controller = AdmissionController(max_concurrent_writes=2, max_queue_depth=0, product_share=0.5)
+        middleware = AdmissionControlMiddleware(slow_app(release), controller=controller)
+
+        hog = ResponseRecorder()
+        running = asyncio.ensure_future(middleware(make_scope("POST", "/run-basket", "AI_AVATAR"), receive, hog))
+        await asyncio.sleep(0)
+
+        hog_again, other = ResponseRecorder(), ResponseRecorder()
+        await middleware(make_scope("POST", "/run-basket", "AI_AVATAR"), receive, hog_again)
+        assert hog_again.status == 429
+
+        other_task = asyncio.ensure_future(middleware(make_scope("POST", "/run-basket", "GURUKUL"), receive, other))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(running, other_task)
+        assert other.status == 200
+
+    @pytest.mark.asyncio
+    async def test_throughput_shed(self):
+        """Test writes beyond the token bucket deadline are shed"""
+        release = asyncio.Event()
+        release.set()
+        controller = AdmissionController(max_writes_per_sec=1, queue_timeout_ms=10)
+        middleware = AdmissionControlMiddleware(slow_app(release), controller=controller)
+
+        first, second = ResponseRecorder(), ResponseRecorder()
+        await middleware(make_scope("POST", "/run-agent"), receive, first)
+        await middleware(make_scope("POST", "/run-agent"), receive, second)
+        assert first.status == 200
+        assert second.status == 429
+        assert controller.stats[WRITE]["shed_throughput"] == 1
+
+    @pytest.mark.asyncio
+    async def test_metrics_not_gated(self):
+        """Test monitoring endpoints bypass admission"""
+        release = asyncio.Event()
+        release.set()
+        controller = AdmissionController(max_concurrent_reads=1, max_queue_depth=0)
+        middleware = AdmissionControlMiddleware(slow_app(release), controller=controller)
+        recorder = ResponseRecorder()
+        await middleware(make_scope("GET", "/metrics"), receive, recorder)
+        assert recorder.status == 200
+        assert controller.stats[READ]["admitted"] == 0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
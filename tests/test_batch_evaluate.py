@@ -0,0 +1,68 @@
+"""
+Unit Tests for Text-to-JSON Batch Evaluate
+Tests NDJSON streaming, prompt deduplication and per-worker agents
+"""
+
+import json
+import threading
+import time
+import pytest
+from agents.textToJson.batch_evaluate import BatchEvaluator
+
+class FakePromptAgent:
+    instances = []
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+        FakePromptAgent.instances.append(self)
+
+    def run(self, prompt):
+        assert threading.get_ident() == self.thread
+        if prompt == "boom":
+            raise ValueError("generation failed")
+        # "slow" finishes after prompts queued behind it, so lines arrive out of input order
+        time.sleep(0.05 if prompt == "slow" else 0.0)
+        return {"prompt": prompt}
+
+class FakeEvaluatorAgent:
+    def run(self, spec, prompt):
+        return {"score": len(prompt)}
+
+@pytest.fixture
+def evaluator():
+    FakePromptAgent.instances = []
+    batch = BatchEvaluator(FakePromptAgent, FakeEvaluatorAgent, max_workers=2)
+    yield batch
+    batch.shutdown()
+
+async def _collect(batch, prompts):
+    return [json.loads(line) async for line in batch.stream(prompts)]
+
+class TestBatchEvaluate:
+    """Test the NDJSON batch stream"""
+
+    @pytest.mark.asyncio
+    async def test_lines_ordering_dedup_and_summary(self, evaluator):
+        """Test one line per prompt (duplicates reuse the first result) and a final summary"""
+        lines = await _collect(evaluator, ["slow", "fast", "fast", "boom"])
+        results, summary = lines[:-1], lines[-1]
+
+        assert sorted(line["index"] for line in results) == [0, 1, 2, 3]
+        assert [line["index"] for line in results].index(0) > [line["index"] for line in results].index(1)
+        by_index = {line["index"]: line for line in results}
+        assert by_index[1]["spec"] == by_index[2]["spec"] == {"prompt": "fast"}
+        assert by_index[1]["deduplicated"] is False and by_index[2]["deduplicated"] is True
+        assert by_index[0]["evaluation"] == {"score": 4}
+        assert by_index[3]["success"] is False and "generation failed" in by_index[3]["error"]
+        assert summary["summary"] is True
+        assert (summary["count"], summary["unique_prompts"], summary["failed"]) == (4, 3, 1)
+
+    @pytest.mark.asyncio
+    async def test_agents_not_shared_across_workers(self, evaluator):
+        """Test each worker thread builds its own agents, at most one pair per worker"""
+        await _collect(evaluator, [f"p{i}" for i in range(10)])
+        threads = [agent.thread for agent in FakePromptAgent.instances]
+        assert len(threads) == len(set(threads)) <= 2
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,71 @@
+"""
+Unit Tests for BHIV Bucket Batch Threat Scanner
+Tests deduplication, shared context detection and process pool offload
+"""
+
+import pytest
+from utils import batch_threat_scanner
+from utils.batch_threat_scanner import scan_batch, MAX_BATCH_ITEMS
+from utils.hashing import content_hash
+
+CLEAN = {"product_id": "AI_AVATAR", "artifact_type": "MediaArtifact", "metadata": {"name": "ok"}}
+POISONED = {"metadata": {"notes": ["<script>alert(1)</script>"]}}
+
+class TestContentHash:
+    """Test payload deduplication keys"""
+
+    def test_key_order_independent(self):
+        """Test identical payloads hash the same regardless of key order"""
+        assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+        assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+    def test_fingerprint_dedupes_and_flags_large(self):
+        """Test one pass yields per-item hashes, unique payloads and large ones"""
+        big = {"blob": "x" * 200}
+        hashes, unique, large = batch_threat_scanner._fingerprint_many([CLEAN, big, CLEAN], 100)
+        assert hashes[0] == hashes[2] == content_hash(CLEAN)
+        assert len(unique) == 2
+        assert large == [content_hash(big)]
+
+class TestBatchScan:
+    """Test batch scanning"""
+
+    @pytest.mark.asyncio
+    async def test_per_item_results_in_order(self):
+        """Test results follow input order with aggregate counts"""
+        result = await scan_batch([CLEAN, POISONED, CLEAN])
+        assert result["total_items"] == 3
+        assert result["unique_items"] == 2
+        assert result["duplicates_skipped"] == 1
+        assert [item["recommendation"] for item in result["results"]] == ["ALLOW", "BLOCK", "ALLOW"]
+        assert result["aggregate"]["items_critical"] == 1
+        assert result["aggregate"]["by_threat_id"] == {"T2_METADATA_POISONING": 1}
+
+    @pytest.mark.asyncio
+    async def test_context_applies_to_every_item(self):
+        """Test shared context threats are reported for each payload"""
+        context = {"operation_type": "DELETE", "target_type": "audit_log"}
+        result = await scan_batch([CLEAN, {"other": 1}], context)
+        assert result["aggregate"]["by_threat_id"]["T8_AUDIT_TAMPERING"] == 2
+        assert all(item["has_critical_threats"] for item in result["results"])
+
+    @pytest.mark.asyncio
+    async def test_batch_limit(self):
+        """Test oversized batches are rejected"""
+        with pytest.raises(ValueError):
+            await scan_batch([{}] * (MAX_BATCH_ITEMS + 1))
+
+    @pytest.mark.asyncio
+    async def test_large_payloads_offloaded(self, monkeypatch):
+        """Test payloads above the threshold run in the process pool"""
+        monkeypatch.setattr(batch_threat_scanner, "POOL_THRESHOLD_BYTES", 100)
+        large = {"metadata": {"blob": "x" * 200, "q": "DROP TABLE users"}}
+        try:
+            result = await scan_batch([CLEAN, large])
+        finally:
+            batch_threat_scanner.shutdown_process_pool()
+        assert result["offloaded_items"] == 1
+        assert result["results"][1]["has_critical_threats"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,74 @@
+"""
+Unit Tests for BHIV Core API Contract Validator
+Tests compiled channel validators and batch validation
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from validators.core_api_contract import CoreAPIContract, CONTRACT_BATCH_MAX_ITEMS
+
+WRITE = {"artifact_type": "ConversationArtifact", "product_id": "AI_ASSISTANT", "data": {}}
+
+class TestCompiledValidators:
+    """Test compiled validators keep the original violation format"""
+
+    def test_violation_order_and_shape(self):
+        """Test missing, type and unauthorized violations are reported in order"""
+        contract = CoreAPIContract()
+        result = contract.validate_input("metadata_query", {"query_type": "x", "limit": "10", "extra": 1}, "core")
+        assert result["valid"] is False
+        assert [v["type"] for v in result["violations"]] == [
+            "missing_required_field", "invalid_data_type", "unauthorized_field"
+        ]
+        assert result["violations"][1]["message"] == "Field limit has invalid type. Expected integer"
+
+    def test_valid_input_and_output(self):
+        """Test valid payloads pass"""
+        contract = CoreAPIContract()
+        assert contract.validate_input("artifact_write", WRITE, "core")["valid"]
+        assert contract.validate_output("query_result", {"results": [], "count": 0})["valid"]
+
+    def test_recompile_after_schema_change(self):
+        """Test schema edits apply after compile()"""
+        contract = CoreAPIContract()
+        contract.input_schemas["retention_request"]["required"].append("reason")
+        contract.compile()
+        result = contract.validate_input("retention_request", {"artifact_id": "a", "action": "delete"}, "core")
+        assert result["violations"][0]["field"] == "reason"
+
+class TestBatchValidation:
+    """Test validate_input_many / validate_output_many"""
+
+    def test_reports_invalid_items_only(self):
+        """Test batch result lists violations by item index"""
+        contract = CoreAPIContract()
+        result = contract.validate_input_many("artifact_write", [WRITE, {"product_id": 1}, WRITE], "core")
+        assert result["valid"] is False
+        assert result["valid_count"] == 2
+        assert [item["index"] for item in result["invalid_items"]] == [1]
+
+    def test_invalid_channel(self):
+        """Test an invalid channel rejects the whole batch"""
+        result = CoreAPIContract().validate_output_many("artifact_write", [{}])
+        assert result["violations"][0]["type"] == "invalid_output_channel"
+        assert result["invalid_count"] == 1
+
+    def test_batch_limit(self):
+        """Test oversized batches are rejected"""
+        with pytest.raises(ValueError):
+            CoreAPIContract().validate_output_many("query_result", [{}] * (CONTRACT_BATCH_MAX_ITEMS + 1))
+
+    def test_batch_endpoint(self):
+        """Test input batch endpoint returns per-item results"""
+        client = TestClient(app)
+        response = client.post(
+            "/constitutional/core/validate-input-batch",
+            params={"channel": "artifact_write", "requester_id": "contract_test"},
+            json=[WRITE, {"data": {}}]
+        )
+        assert response.status_code == 200
+        assert response.json()["invalid_count"] == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
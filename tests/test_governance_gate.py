@@ -0,0 +1,94 @@
+"""
+Unit Tests for BHIV Bucket Governance Gate Decision Cache
+Tests memoized operation/integration decisions and versioned invalidation
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from governance import governance_gate as gate_module
+from governance.governance_gate import GovernanceGate, GovernanceDecision, update_operation_rules
+
+SCHEMA = {"nsfw_policy": "strict", "retention_policy": "30d"}
+
+class TestOperationDecisionCache:
+    """Test validate_operation memoization"""
+
+    def test_repeat_decisions_hit_cache(self):
+        """Test identical decision inputs are evaluated once"""
+        gate = GovernanceGate()
+        gate.approved_integrations.add("int_1")
+        for _ in range(3):
+            assert gate.validate_operation("CREATE", "metadata", 10, "int_1") == {"allowed": True}
+        stats = gate.operation_decisions.get_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+
+    def test_size_checked_every_call(self):
+        """Test cached approvals still enforce the per-call size limit"""
+        gate = GovernanceGate()
+        gate.approved_integrations.add("int_1")
+        assert gate.validate_operation("CREATE", "metadata", 10, "int_1")["allowed"]
+        result = gate.validate_operation("CREATE", "metadata", 17 * 1024 * 1024, "int_1")
+        assert result["allowed"] is False
+        assert "exceeds limit" in result["reason"]
+
+    def test_approval_change_invalidates(self):
+        """Test approving or revoking an integration refreshes decisions"""
+        gate = GovernanceGate()
+        assert gate.validate_operation("READ", "metadata", 1, "int_1")["reason"] == "Integration not approved"
+        gate.approved_integrations.add("int_1")
+        assert gate.validate_operation("READ", "metadata", 1, "int_1")["allowed"]
+        gate.approved_integrations.discard("int_1")
+        assert gate.validate_operation("READ", "metadata", 1, "int_1")["allowed"] is False
+        assert gate.operation_decisions.invalidations == 2
+
+    def test_rule_change_invalidates(self):
+        """Test operation rule updates bump the rules version"""
+        gate = GovernanceGate()
+        gate.approved_integrations.add("int_1")
+        original = dict(gate_module.OPERATION_RULES["metadata"])
+        assert gate.validate_operation("UPDATE", "metadata", 1, "int_1")["allowed"] is False
+        try:
+            update_operation_rules("metadata", {**original, "UPDATE": True})
+            assert gate.validate_operation("UPDATE", "metadata", 1, "int_1")["allowed"] is True
+        finally:
+            update_operation_rules("metadata", original)
+
+class TestIntegrationDecisionCache:
+    """Test validate_integration memoization"""
+
+    @pytest.mark.asyncio
+    async def test_same_inputs_reuse_decision(self):
+        """Test different integration ids share one evaluated decision"""
+        gate = GovernanceGate()
+        for integration_id in ("int_a", "int_b"):
+            result = await gate.validate_integration(integration_id, "api", ["metadata"], SCHEMA, "AI_Assistant")
+            assert result["decision"] == GovernanceDecision.APPROVED.value
+            assert result["integration_id"] == integration_id
+        assert gate.approved_integrations == {"int_a", "int_b"}
+        assert gate.integration_decisions.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_schema_change_is_new_decision(self):
+        """Test a different data schema is evaluated separately"""
+        gate = GovernanceGate()
+        await gate.validate_integration("int_a", "api", ["metadata"], SCHEMA, "AI_Assistant")
+        result = await gate.validate_integration("int_b", "api", ["metadata"], {"nsfw_policy": "strict"}, "AI_Assistant")
+        assert result["decision"] == GovernanceDecision.REJECTED.value
+        assert result["reasons"] == ["No deletion strategy documented"]
+        assert gate.integration_decisions.get_stats()["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_timestamped_schema_not_cached(self):
+        """Test a schema carrying a timestamp is re-evaluated against the current time"""
+        gate = GovernanceGate()
+        schema = {**SCHEMA, "timestamp": datetime.now().isoformat()}
+        result = await gate.validate_integration("int_a", "api", ["metadata"], schema, "AI_Assistant")
+        assert result["decision"] == GovernanceDecision.APPROVED.value
+        schema["timestamp"] = (datetime.now() - timedelta(days=1)).isoformat()
+        result = await gate.validate_integration("int_b", "api", ["metadata"], schema, "AI_Assistant")
+        assert result["decision"] == GovernanceDecision.REJECTED.value
+        assert gate.integration_decisions.get_stats()["entries"] == 0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,117 @@
+"""
+Unit Tests for BHIV Bucket Shared HTTP Client
+Tests per-host pooling and in-flight request coalescing
+"""
+
+import asyncio
+import pytest
+import httpx
+from utils.http_client import SharedHTTPClient
+
+def _client_with(handler):
+    """Shared client whose pools talk to an in-memory transport"""
+    shared = SharedHTTPClient()
+    transport = httpx.MockTransport(handler)
+    original = shared._client_for
+
+    def client_for(url):
+        client = original(url)
+        client._transport = transport
+        return client
+
+    shared._client_for = client_for
+    return shared
+
+class TestCoalescing:
+    """Test singleflight behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_identical_gets_share_one_call(self):
+        """Test concurrent identical GETs hit the upstream once"""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.path)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"ok": True})
+
+        shared = _client_with(handler)
+        responses = await asyncio.gather(*(shared.get("https://api.test/items") for _ in range(5)))
+        assert [r.json() for r in responses] == [{"ok": True}] * 5
+        assert calls == ["/items"]
+        assert shared.get_stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_posts_not_coalesced_by_default(self):
+        """Test non-idempotent methods only coalesce on request"""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.content)
+            await asyncio.sleep(0.01)
+            return httpx.Response(201)
+
+        shared = _client_with(handler)
+        await asyncio.gather(*(shared.post("https://api.test/tx", json={"a": 1}) for _ in range(3)))
+        await asyncio.gather(*(shared.post("https://api.test/q", json={"a": 1}, coalesce=True) for _ in range(3)))
+        assert len(calls) == 4
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_waiters(self):
+        """Test a failed upstream call fails every coalesced caller"""
+        async def handler(request):
+            await asyncio.sleep(0.01)
+            raise httpx.ConnectError("down")
+
+        shared = _client_with(handler)
+        results = await asyncio.gather(*(shared.get("https://api.test/x") for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, httpx.ConnectError) for r in results)
+        assert shared.get_stats()["inflight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_hands_call_to_waiter(self):
+        """Test waiters re-issue the call instead of failing when the leader is cancelled"""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.path)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"ok": True})
+
+        shared = _client_with(handler)
+        leader = asyncio.create_task(shared.get("https://api.test/slow"))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(shared.get("https://api.test/slow")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        responses = await asyncio.gather(*waiters)
+        assert [r.json() for r in responses] == [{"ok": True}] * 3
+        assert leader.cancelled()
+        assert len(calls) == 2
+
+class TestPooling:
+    """Test per-host client pools"""
+
+    @pytest.mark.asyncio
+    async def test_one_pool_per_host(self):
+        """Test requests to the same origin reuse one pooled client"""
+        shared = SharedHTTPClient()
+        assert shared._client_for("https://a.test/x") is shared._client_for("https://a.test/y")
+        assert shared._client_for("https://b.test/x") is not shared._client_for("https://a.test/x")
+        await shared.aclose()
+
+    def test_previous_loop_clients_closed(self):
+        """Test clients left behind by a finished event loop are closed by aclose()"""
+        shared = SharedHTTPClient()
+
+        async def open_client():
+            return shared._client_for("https://a.test/x")
+
+        first = asyncio.run(open_client())
+        second = asyncio.run(open_client())
+        assert first is not second and shared._stale_clients == [first]
+        asyncio.run(shared.aclose())
+        assert first.is_closed and second.is_closed
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
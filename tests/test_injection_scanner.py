@@ -0,0 +1,72 @@
+"""
+Unit Tests for BHIV Bucket Injection Scanner
+Tests compiled multi-pattern matching over nested metadata
+"""
+
+import pytest
+from utils.injection_scanner import InjectionScanner, injection_scanner
+from utils.threat_validator import BucketThreatModel
+
+class TestPatternMatching:
+    """Test compiled trie regex matching"""
+
+    def test_case_insensitive(self):
+        """Test matching ignores case"""
+        assert injection_scanner.find("DELETE FROM users") == "delete from"
+        assert injection_scanner.find("<ScRiPt>") == "<script>"
+
+    def test_whitespace_variants(self):
+        """Test spaces in patterns match any whitespace run"""
+        assert injection_scanner.find("drop\t\n  table x") is not None
+
+    def test_clean_text(self):
+        """Test ordinary text does not match"""
+        assert injection_scanner.find("Quarterly revenue report for Gurukul") is None
+
+    def test_defaults_leave_paths_and_templates_alone(self):
+        """Test the default set only holds the original patterns"""
+        assert injection_scanner.find("../reports/{{quarter}} uses ${VAR}") is None
+        assert injection_scanner.find("insert into the report") is None
+
+    def test_shared_prefixes(self):
+        """Test patterns sharing a prefix are all matched"""
+        scanner = InjectionScanner(["drop table", "drop database", "drop"])
+        assert scanner.find("please drop it") == "drop"
+        assert scanner.find("drop database prod") == "drop database"
+
+    def test_large_pattern_set(self):
+        """Test loaded pattern sets compile into one regex"""
+        scanner = InjectionScanner([f"token{i}" for i in range(1000)])
+        assert scanner.find("contains TOKEN999 here") == "token999"
+        assert scanner.find("token") is None
+
+    def test_from_file(self, tmp_path):
+        """Test patterns load from file alongside defaults"""
+        path = tmp_path / "patterns.txt"
+        path.write_text("# custom\nsleep(\n\n")
+        scanner = InjectionScanner.from_file(str(path))
+        assert scanner.find("select sleep(5)") == "sleep("
+        assert scanner.find("<script>") == "<script>"
+
+class TestNestedScan:
+    """Test single walk over nested metadata"""
+
+    def test_paths_reported(self):
+        """Test nested hits report their key path"""
+        result = injection_scanner.scan({"a": {"b": [1, "ok", "<script>alert(1)"]}, "c": "fine"})
+        assert result["injections"] == [("a.b[2]", "<script>")]
+        assert result["fields_scanned"] == 3
+
+    def test_utf8_sizes(self):
+        """Test oversized fields use UTF-8 byte length"""
+        result = injection_scanner.scan({"ascii": "x" * 10, "multi": "é" * 10}, max_field_bytes=15)
+        assert result["oversized"] == [("multi", 20)]
+        assert result["total_bytes"] == 30
+
+    def test_threat_model_scans_nested_metadata(self):
+        """Test BucketThreatModel flags injection in nested metadata"""
+        threats = BucketThreatModel.scan_for_threats({"metadata": {"notes": {"text": "1; DROP TABLE audit"}}})
+        assert any(t["pattern_matched"] == "injection_pattern" for t in threats)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+"""
+Unit Tests for BHIV Bucket Approved Integration Registry
+Tests shared approvals across workers and local fallback
+"""
+
+import time
+import pytest
+from unittest.mock import Mock
+from governance import integration_registry
+from governance.integration_registry import IntegrationRegistry, REDIS_SET_KEY
+from governance.governance_gate import GovernanceGate
+
+class SharedRedis:
+    """Minimal in-process Redis: one set plus synchronous pub/sub delivery"""
+
+    def __init__(self):
+        self.sets = {}
+        self.handlers = []
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+
+    def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    def publish(self, channel, data):
+        for handler in self.handlers:
+            handler({"channel": channel, "data": data})
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def execute(self):
+        return []
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        pubsub = Mock()
+        pubsub.subscribe.side_effect = lambda **channels: self.handlers.extend(channels.values())
+        return pubsub
+
+class TestIntegrationRegistry:
+    """Test registry sharing"""
+
+    def test_local_only(self):
+        """Test registry behaves as a set without Redis"""
+        registry = IntegrationRegistry()
+        registry.add("int_1")
+        assert "int_1" in registry
+        assert registry == {"int_1"}
+        registry.discard("int_1")
+        assert len(registry) == 0
+
+    def test_restart_loads_shared_approvals(self):
+        """Test a new worker starts with approvals made elsewhere"""
+        redis = SharedRedis()
+        redis.sadd(REDIS_SET_KEY, "int_1")
+        registry = IntegrationRegistry()
+        registry.attach_redis(redis)
+        assert "int_1" in registry
+
+    def test_approval_propagates_to_other_workers(self):
+        """Test approve/revoke reach other workers through pub/sub"""
+        redis = SharedRedis()
+        worker_a, worker_b = IntegrationRegistry(), IntegrationRegistry()
+        worker_a.attach_redis(redis)
+        worker_b.attach_redis(redis)
+        worker_a.add("int_1")
+        assert "int_1" in worker_b
+        worker_b.discard("int_1")
+        assert "int_1" not in worker_a
+        assert redis.smembers(REDIS_SET_KEY) == set()
+
+    def test_remote_change_invalidates_decisions(self):
+        """Test another worker's approval flushes cached denials"""
+        redis = SharedRedis()
+        gate_a, gate_b = GovernanceGate(), GovernanceGate()
+        gate_a.approved_integrations.attach_redis(redis)
+        gate_b.approved_integrations.attach_redis(redis)
+        assert gate_b.validate_operation("READ", "metadata", 1, "int_1")["allowed"] is False
+        gate_a.approved_integrations.add("int_1")
+        assert gate_b.validate_operation("READ", "metadata", 1, "int_1")["allowed"] is True
+
+    def test_background_resync_recovers_missed_messages(self, monkeypatch):
+        """Test the resync thread picks up changes whose broadcast was missed"""
+        monkeypatch.setattr(integration_registry, "RESYNC_INTERVAL_SEC", 0.01)
+        redis = SharedRedis()
+        registry = IntegrationRegistry()
+        registry.attach_redis(redis)
+        try:
+            redis.sadd(REDIS_SET_KEY, "int_1")
+            deadline = time.time() + 2
+            while "int_1" not in registry and time.time() < deadline:
+                time.sleep(0.01)
+            assert "int_1" in registry
+        finally:
+            registry.close()
+
+    def test_redis_failure_keeps_local_copy(self):
+        """Test approvals still work locally when Redis errors"""
+        broken = Mock()
+        broken.smembers.side_effect = ConnectionError("down")
+        broken.pipeline.side_effect = ConnectionError("down")
+        registry = IntegrationRegistry()
+        registry.attach_redis(broken)
+        registry.add("int_1")
+        assert "int_1" in registry
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,96 @@
+"""
+Unit Tests for Text-to-JSON Iteration Log Store
+Tests session-indexed appends and the background legacy JSON import
+"""
+
+import json
+import os
+import time
+import pytest
+from agents.textToJson.iteration_log_store import IterationLogStore
+
+@pytest.fixture
+def store(tmp_path):
+    return IterationLogStore(db_path=str(tmp_path / "logs" / "iterations.db"), legacy_path=str(tmp_path / "legacy.json"),
+                             legacy_import_interval=0.01)
+
+def _write_legacy(store, logs, mtime_ns):
+    with open(store.legacy_path, "w") as f:
+        json.dump(logs, f)
+    os.utime(store.legacy_path, ns=(mtime_ns, mtime_ns))
+
+class TestIterationLogStore:
+    """Test the indexed iteration log store"""
+
+    def test_append_and_read_session(self, store):
+        """Test only the requested session's logs are returned, in order"""
+        store.append_many([{"session_id": "s1", "n": 1}, {"session_id": "s2", "n": 1}])
+        store.append({"session_id": "s1", "n": 2})
+        assert [log["n"] for log in store.get_session("s1")] == [1, 2]
+        assert store.get_session("missing") == []
+
+    def test_legacy_import_once(self, store):
+        """Test the legacy file is imported once and re-imported only when it changes"""
+        with open(store.legacy_path, "w") as f:
+            json.dump([{"session_id": "s1", "n": 0}], f)
+        store.append({"session_id": "s1", "n": 1})
+        assert store.import_legacy() is True
+        assert [log["n"] for log in store.get_session("s1")] == [0, 1]
+        assert store.import_legacy() is False
+
+        with open(store.legacy_path, "w") as f:
+            json.dump([{"session_id": "s1", "n": 0}, {"session_id": "s1", "n": 5}], f)
+        os.utime(store.legacy_path, ns=(1, 1))
+        assert store.import_legacy() is True
+        assert [log["n"] for log in store.get_session("s1")] == [0, 5, 1]
+
+    def test_legacy_import_is_incremental(self, store):
+        """Test appended legacy entries are inserted alone and a shrunken file is re-imported"""
+        _write_legacy(store, [{"session_id": "s1", "n": 0}], 1)
+        store.import_legacy()
+        with store._connect() as conn:
+            first_ids = [row[0] for row in conn.execute("SELECT id FROM iteration_logs")]
+
+        _write_legacy(store, [{"session_id": "s1", "n": 0}, {"session_id": "s1", "n": 1}], 2)
+        assert store.import_legacy() is True
+        with store._connect() as conn:
+            ids = [row[0] for row in conn.execute("SELECT id FROM iteration_logs ORDER BY id")]
+        assert ids[:1] == first_ids and len(ids) == 2
+
+        _write_legacy(store, [{"session_id": "s1", "n": 9}], 3)
+        assert store.import_legacy() is True
+        assert [log["n"] for log in store.get_session("s1")] == [9]
+
+    def test_reads_never_import_legacy(self, store):
+        """Test session reads do not touch the legacy file"""
+        _write_legacy(store, [{"session_id": "s1", "n": 0}], 1)
+        store.append({"session_id": "s1", "n": 1})
+        assert [log["n"] for log in store.get_session("s1")] == [1]
+
+    def test_background_import(self, store):
+        """Test the background thread imports the legacy file and picks up later entries"""
+        _write_legacy(store, [{"session_id": "s1", "n": 0}], 1)
+        store.start()
+        try:
+            deadline = time.monotonic() + 2
+            while len(store.get_session("s1")) < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert len(store.get_session("s1")) == 1
+            _write_legacy(store, [{"session_id": "s1", "n": 0}, {"session_id": "s1", "n": 1}], 2)
+            while len(store.get_session("s1")) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert [log["n"] for log in store.get_session("s1")] == [0, 1]
+        finally:
+            store.stop()
+        assert store._import_thread is None
+
+    def test_session_lookup_uses_index(self, store):
+        """Test session reads are index seeks, not table scans"""
+        store.append({"session_id": "s1"})
+        with store._connect() as conn:
+            plan = " ".join(str(row) for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT data FROM iteration_logs WHERE session_id = ? ORDER BY source = 'store', id", ("s1",)))
+        assert "idx_iteration_logs_session" in plan
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,86 @@
+"""
+Unit Tests for Law Agent Basket Execution
+Tests in-process routing, remote fallback and the response cache
+"""
+
+import sys
+import pytest
+from unittest.mock import AsyncMock, patch
+from agents.law_agent import law_agent
+from agents.law_agent import learning_store
+from agents.law_agent.law_agent import LegalResponseCache
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    with patch.object(law_agent, "_response_cache", LegalResponseCache()):
+        yield
+
+class TestLocalExecution:
+    """Test in-process query handling"""
+
+    @pytest.mark.asyncio
+    async def test_served_locally(self):
+        """Test the default mode never touches the remote API"""
+        with patch.object(law_agent, "_process_remote", AsyncMock()) as remote:
+            result = await law_agent.process({"query": "My landlord started an eviction", "agent_type": "enhanced", "location": "NY"})
+        assert result["domain"] == "tenant_rights"
+        assert result["jurisdiction"] == "NY"
+        remote.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_auto_falls_back_to_remote(self):
+        """Test auto mode uses the remote API when local processing fails"""
+        remote = AsyncMock(return_value={"domain": "remote"})
+        with patch.object(law_agent, "LAW_AGENT_MODE", "auto"), \
+             patch.object(law_agent, "_process_local", side_effect=RuntimeError("boom")), \
+             patch.object(law_agent, "_process_remote", remote):
+            result = await law_agent.process({"query": "tax"})
+        assert result == {"domain": "remote"}
+
+    def test_sibling_modules_imported_once(self):
+        """Test the law agent shares the package's learning store module (one singleton)"""
+        assert law_agent.get_learning_store is learning_store.get_learning_store
+        assert "learning_store" not in sys.modules
+
+class TestResponseCache:
+    """Test response caching"""
+
+    @pytest.mark.asyncio
+    async def test_normalised_query_hits_cache(self):
+        """Test case and whitespace variants share one cache entry"""
+        first = await law_agent.process({"query": "I was fired from my job"})
+        second = await law_agent.process({"query": "  i was FIRED   from my job "})
+        assert second["domain"] == first["domain"]
+        assert law_agent.get_response_cache().get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hits_get_own_session_and_copy(self):
+        """Test each hit gets a fresh session id and its own copy of the analysis"""
+        first = await law_agent.process({"query": "I was fired from my job"})
+        second = await law_agent.process({"query": "i was fired from my job"})
+        assert second["session_id"] != first["session_id"]
+        assert second["session_id"].startswith("basket_")
+        assert second["raw_query"] == "i was fired from my job"
+        second["process_steps"].append("tampered")
+        third = await law_agent.process({"query": "I was fired from my job"})
+        assert "tampered" not in third["process_steps"]
+        assert third["session_id"] not in (first["session_id"], second["session_id"])
+
+    @pytest.mark.asyncio
+    async def test_feedback_bypasses_cache(self):
+        """Test feedback calls are always processed"""
+        await law_agent.process({"query": "divorce", "agent_type": "adaptive", "feedback": True})
+        assert law_agent.get_response_cache().get_stats()["entries"] == 0
+
+    def test_ttl_and_lru(self):
+        """Test expired and least recently used entries are evicted"""
+        cache = LegalResponseCache(max_entries=2, ttl_seconds=60)
+        for name in ("a", "b", "c"):
+            cache.set((name,), {"v": name})
+        assert cache.get(("a",)) is None and cache.evictions == 1
+        expired = LegalResponseCache(ttl_seconds=-1)
+        expired.set(("a",), {"v": 1})
+        assert expired.get(("a",)) is None
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,114 @@
+"""
+Unit Tests for Law Agent Shared Learning State
+Tests increment-only aggregation across workers and offline behaviour
+"""
+
+import threading
+import pytest
+from agents.law_agent.learning_store import LearningStore
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def hincrby(self, key, field, amount):
+        self.ops.append(("incr", key, field, amount))
+
+    hincrbyfloat = hincrby
+
+    def hgetall(self, key):
+        self.ops.append(("get", key))
+
+    def execute(self):
+        if self.redis.down:
+            raise ConnectionError("redis down")
+        results = []
+        for op in self.ops:
+            fields = self.redis.hashes.setdefault(op[1], {})
+            if op[0] == "incr":
+                fields[op[2]] = fields.get(op[2], 0) + op[3]
+                results.append(fields[op[2]])
+            else:
+                results.append({k: str(v) for k, v in fields.items()})
+        return results
+
+class FakeRedis:
+    """Shared Redis stand-in with pipelined hash increments"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.down = False
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+class TestLearningStore:
+    """Test shared learning aggregates"""
+
+    def test_workers_share_learning(self):
+        """Test feedback recorded by one worker is visible to another after sync"""
+        redis = FakeRedis()
+        worker_a, worker_b = LearningStore(redis), LearningStore(redis)
+        worker_a.record_feedback("tenant_rights", 0.4)
+        worker_b.record_feedback("tenant_rights", 0.8)
+        worker_b.incr_stat("total_queries")
+        assert worker_a.sync() and worker_b.sync() and worker_a.sync()
+
+        data = worker_a.get_learning_data()["tenant_rights"]
+        assert data["feedback_count"] == 2
+        assert data["avg_confidence"] == pytest.approx(0.6)
+        assert worker_a.get_stats() == {"total_queries": 1}
+
+    def test_pending_visible_before_sync(self):
+        """Test local increments are readable immediately"""
+        store = LearningStore()
+        store.record_feedback("family_law", 0.5)
+        assert store.get_learning_data()["family_law"]["feedback_count"] == 1
+        assert store.sync() is False
+
+    def test_failed_sync_keeps_increments(self):
+        """Test increments survive a failed sync and are pushed on the next one"""
+        redis = FakeRedis()
+        store = LearningStore(redis)
+        store.record_feedback("tax_law", 0.3)
+        redis.down = True
+        assert store.sync() is False
+        assert store.get_learning_data()["tax_law"]["feedback_count"] == 1
+        redis.down = False
+        assert store.sync()
+        assert redis.hashes["law_agent:learning:feedback_count"] == {"tax_law": 1}
+
+    def test_syncs_do_not_overlap(self):
+        """Test a second sync waits for the one in flight, so no increment is hidden"""
+        redis = FakeRedis()
+        store = LearningStore(redis)
+        entered, release = threading.Event(), threading.Event()
+        execute = FakePipeline.execute
+
+        def slow_execute(pipe):
+            entered.set()
+            release.wait(5)
+            return execute(pipe)
+
+        store.record_feedback("tax_law", 0.3)
+        FakePipeline.execute = slow_execute
+        try:
+            first = threading.Thread(target=store.sync)
+            first.start()
+            entered.wait(5)
+            store.record_feedback("tax_law", 0.5)
+            entered.clear()
+            second = threading.Thread(target=store.sync)
+            second.start()
+            assert not entered.wait(0.2)
+            assert store.get_learning_data()["tax_law"]["feedback_count"] == 2
+            release.set()
+            first.join(5)
+            second.join(5)
+        finally:
+            FakePipeline.execute = execute
+        assert redis.hashes["law_agent:learning:feedback_count"] == {"tax_law": 2}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,47 @@
+"""
+Unit Tests for Law Agent Domain Index
+Tests word-boundary keyword matching and batch classification
+"""
+
+import pytest
+from agents.law_agent.legal_domain_index import classify, classify_many, score_domains
+
+class TestScoreDomains:
+    """Test keyword scoring"""
+
+    def test_word_boundaries(self):
+        """Test keywords only match whole words"""
+        assert score_domains("current events") == {}
+        assert score_domains("My landlord raised the rent") == {"tenant_rights": 2}
+
+    def test_phrases_and_case(self):
+        """Test multi-word phrases and upper-case keywords"""
+        assert score_domains("Green card and citizenship") == {"immigration_law": 2}
+        assert score_domains("IP theft of my patent") == {"intellectual_property": 2}
+        assert score_domains("income tax refund")["tax_law"] == 2
+
+    def test_shared_keyword(self):
+        """Test a keyword listed under two domains scores both"""
+        assert score_domains("breach of contract") == {"employment_law": 1, "business_law": 1}
+
+class TestClassify:
+    """Test domain classification"""
+
+    def test_best_domain_and_confidence(self):
+        """Test the highest scoring domain wins, ties go to the first listed"""
+        result = classify("I was fired after signing a contract")
+        assert result["domain"] == "employment_law"
+        assert result["confidence"] == pytest.approx(2 / 6)
+        assert classify("contract")["domain"] == "employment_law"
+
+    def test_general_fallback(self):
+        """Test unmatched queries fall back to general law"""
+        assert classify("hello there") == {"domain": "general_law", "confidence": 0.5, "scores": {}}
+
+    def test_classify_many(self):
+        """Test batch classification preserves order"""
+        domains = [r["domain"] for r in classify_many(["eviction notice", "patent", "hi"])]
+        assert domains == ["tenant_rights", "intellectual_property", "general_law"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
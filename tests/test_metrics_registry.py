@@ -0,0 +1,126 @@
+"""
+Unit Tests for BHIV Bucket Metrics Registry
+Tests OpenMetrics exposition and dependency latency tracking
+"""
+
+import pytest
+from types import SimpleNamespace
+from communication.event_bus import EventBus
+from utils.scale_monitor import ScaleMonitor
+from utils.metrics_registry import (
+    DEPENDENCY_LATENCY,
+    DEPENDENCY_ERRORS,
+    MongoCommandListener,
+    render_openmetrics,
+    instrument_redis
+)
+
+@pytest.fixture(autouse=True)
+def clear_dependency_metrics():
+    """Dependency registries are module-level; isolate each test"""
+    DEPENDENCY_LATENCY.clear()
+    DEPENDENCY_ERRORS.clear()
+    yield
+    DEPENDENCY_LATENCY.clear()
+    DEPENDENCY_ERRORS.clear()
+
+class TestOpenMetricsExposition:
+    """Test OpenMetrics text rendering"""
+
+    def test_ends_with_eof(self):
+        """Test exposition is terminated with # EOF"""
+        output = render_openmetrics(ScaleMonitor())
+        assert output.endswith("# EOF\n")
+
+    def test_gauges_rendered(self):
+        """Test in-flight gauges reflect ScaleMonitor state"""
+        monitor = ScaleMonitor()
+        monitor.active_writes = 7
+        output = render_openmetrics(monitor)
+        assert "bucket_active_writes 7" in output
+        assert "# TYPE bucket_active_writes gauge" in output
+
+    def test_route_histogram_cumulative(self):
+        """Test histogram buckets are cumulative and in seconds"""
+        monitor = ScaleMonitor()
+        monitor.observe_request("GET /baskets", "read", 3.0)
+        monitor.observe_request("GET /baskets", "read", 40.0)
+        output = render_openmetrics(monitor)
+        assert 'bucket_request_duration_seconds_bucket{route="GET /baskets",le="0.005"} 1' in output
+        assert 'bucket_request_duration_seconds_bucket{route="GET /baskets",le="0.05"} 2' in output
+        assert 'bucket_request_duration_seconds_count{route="GET /baskets"} 2' in output
+        assert 'bucket_requests_total{kind="read"} 2' in output
+
+    def test_label_escaping(self):
+        """Test quotes in label values are escaped"""
+        monitor = ScaleMonitor()
+        monitor.observe_execution(agent='bad"name', latency_ms=1.0)
+        output = render_openmetrics(monitor)
+        assert 'agent="bad\\"name"' in output
+
+    def test_scrape_size_independent_of_traffic(self):
+        """Test exposition size depends on series, not observations"""
+        monitor = ScaleMonitor()
+        monitor.observe_request("POST /run-basket", "write", 10.0)
+        small = render_openmetrics(monitor)
+        for _ in range(10000):
+            monitor.observe_request("POST /run-basket", "write", 10.0)
+        large = render_openmetrics(monitor)
+        assert len(small.splitlines()) == len(large.splitlines())
+
+class TestDependencyLatency:
+    """Test Redis/MongoDB latency tracking"""
+
+    def test_instrument_redis_times_each_command_once(self):
+        """Test raw Redis commands are timed once and failures are counted"""
+        class FakeRedis:
+            def __init__(self):
+                self.fail = False
+
+            def execute_command(self, *args, **options):
+                if self.fail:
+                    raise ConnectionError("down")
+                return True
+
+            def ping(self):
+                return self.execute_command("PING")
+
+        client = instrument_redis(FakeRedis())
+        assert client.ping() is True
+        assert DEPENDENCY_LATENCY[("redis", "ping")].count == 1
+
+        client.fail = True
+        with pytest.raises(ConnectionError):
+            client.ping()
+        assert DEPENDENCY_LATENCY[("redis", "ping")].count == 2
+        assert DEPENDENCY_ERRORS[("redis", "ping")] == 1
+
+    def test_mongo_listener(self):
+        """Test pymongo command events feed the registry"""
+        listener = MongoCommandListener()
+        listener.succeeded(SimpleNamespace(command_name="insert", duration_micros=2500))
+        histogram = DEPENDENCY_LATENCY[("mongodb", "insert")]
+        assert histogram.count == 1
+        assert histogram.total_ms == 2.5
+
+class TestEventBusMetrics:
+    """Test event bus counters"""
+
+    @pytest.mark.asyncio
+    async def test_published_and_pending(self):
+        """Test pending depth during delivery and published totals"""
+        bus = EventBus()
+        observed = {}
+
+        async def callback(message):
+            observed["pending"] = bus.pending["agent_output"]
+
+        bus.subscribe("agent_output", callback)
+        await bus.publish("agent_output", {"ok": True})
+        assert observed["pending"] == 1
+        assert bus.pending["agent_output"] == 0
+        assert bus.published["agent_output"] == 1
+        assert 'bucket_event_bus_published_total{event_type="agent_output"} 1' in render_openmetrics(ScaleMonitor(), bus)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
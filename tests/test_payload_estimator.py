@@ -0,0 +1,74 @@
+"""
+Unit Tests for BHIV Bucket Payload Estimator
+Tests streaming JSON size and shape estimation
+"""
+
+import json
+import pytest
+from utils.payload_estimator import estimate_payload, exceeds_size, json_string_size
+from utils.threat_validator import BucketThreatModel
+from governance.governance_gate import GovernanceGate
+from config.scale_limits import validate_operation_scale
+
+class TestJsonSize:
+    """Test exact json.dumps byte size"""
+
+    @pytest.mark.parametrize("value", [
+        "plain", 'quote"d', "back\\slash", "line\nbreak", "\x01\x7f", "हिन्दी", "😀", ""
+    ])
+    def test_string_sizes(self, value):
+        """Test escaped string sizes match json.dumps"""
+        assert json_string_size(value) == len(json.dumps(value))
+
+    def test_nested_structure(self):
+        """Test nested payload size matches json.dumps"""
+        payload = {
+            "artifact": {"id": 42, "score": 0.125, "ok": True, "missing": None, "tags": ["a", "b", []]},
+            "items": [{"n": i, "text": "é" * i} for i in range(5)],
+            1: "int key",
+            "nan": float("nan"),
+            "inf": float("-inf")
+        }
+        result = estimate_payload(payload)
+        assert result["json_bytes"] == len(json.dumps(payload))
+        assert result["max_depth"] == 4
+        assert result["max_fanout"] == 5
+        assert result["exceeded"] is False
+
+    def test_early_exit(self):
+        """Test walk stops once the limit is exceeded"""
+        payload = {"chunks": [{"text": "x" * 1000} for _ in range(1000)]}
+        result = estimate_payload(payload, limit=5000)
+        assert result["exceeded"] is True
+        assert result["json_bytes"] < len(json.dumps(payload))
+        assert exceeds_size(payload, len(json.dumps(payload))) is False
+
+class TestSharedSizeChecks:
+    """Test estimator is used by threat and governance checks"""
+
+    def test_large_artifact(self):
+        """Test large artifact threshold uses JSON size"""
+        assert not BucketThreatModel._is_large_artifact({"data": "x" * 1024})
+        assert BucketThreatModel._is_large_artifact({"data": "x" * (10 * 1024 * 1024)})
+
+    def test_schema_changes(self):
+        """Test large nested objects are flagged"""
+        assert BucketThreatModel._detect_schema_changes({"nested": {"blob": "x" * 20000}})
+        assert not BucketThreatModel._detect_schema_changes({"nested": {"blob": "x"}})
+
+    def test_governance_measures_data(self):
+        """Test measured payload overrides the declared data_size"""
+        gate = GovernanceGate()
+        gate.approved_integrations.add("test_integration")
+        huge = {"blob": "x" * (17 * 1024 * 1024)}
+        result = gate.validate_operation("CREATE", "metadata", 10, "test_integration", data=huge)
+        assert result["allowed"] is False
+        assert "exceeds limit" in result["reason"]
+
+    def test_scale_validation_measures_data(self):
+        """Test scale validation measures payloads"""
+        valid, _ = validate_operation_scale("write", 0, 1, data={"blob": "x" * (17 * 1024 * 1024)})
+        assert valid is False
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
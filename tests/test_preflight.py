@@ -0,0 +1,68 @@
+"""
+Unit Tests for BHIV Constitutional Pre-flight
+Tests the fused boundary, contract and threat decision
+"""
+
+import pytest
+from middleware.constitutional.preflight import run_preflight
+from middleware.constitutional.request_digest import RequestDigest
+from middleware.constitutional.core_boundary_enforcer import CoreBoundaryEnforcer
+
+WRITE = {"artifact_type": "ConversationArtifact", "product_id": "AI_ASSISTANT", "data": {"text": "hi"}}
+
+class TestRequestDigest:
+    """Test request digest extraction"""
+
+    def test_flags(self):
+        """Test boundary flags are extracted once"""
+        digest = RequestDigest({"schema_version": 2, "_schema": {}, "skip_audit": True, "raw_query": "x"})
+        assert digest.schema_fields == ("_schema", "schema_version")
+        assert digest.mutates_schema and digest.hides_audit and digest.raw_query
+        assert not digest.emergency_override
+
+    def test_cross_product_violation(self):
+        """Test product isolation violations are reported"""
+        result = CoreBoundaryEnforcer().validate_request(
+            "bhiv_core", "READ", "artifacts", {"product_id": "AI_AVATAR"},
+            {"requesting_product_id": "AI_ASSISTANT"}
+        )
+        assert result["violations"][0]["type"] == "cross_product_access"
+
+class TestPreflight:
+    """Test combined pre-flight decision"""
+
+    def test_clean_write_allowed(self):
+        """Test a valid Core write passes all checks"""
+        result = run_preflight("bhiv_core", "WRITE", "artifacts", WRITE)
+        assert result["decision"] == "ALLOW"
+        assert result["contract"]["channel"] == "artifact_write"
+
+    def test_contract_violation_denies(self):
+        """Test contract violations deny an otherwise allowed request"""
+        result = run_preflight("bhiv_core", "WRITE", "artifacts", {"product_id": "AI_ASSISTANT", "data": {}})
+        assert result["boundary"]["allowed"] is True
+        assert result["contract"]["violations"][0]["field"] == "artifact_type"
+        assert result["allowed"] is False
+
+    def test_critical_threat_denies(self):
+        """Test critical threats from the same digest deny the request"""
+        data = {**WRITE, "metadata": {"note": "'; DROP TABLE artifacts; --"}}
+        result = run_preflight("bhiv_core", "WRITE", "artifacts", data)
+        assert result["threats"]["has_critical_threats"]
+        assert result["decision"] == "DENY"
+
+    def test_contract_validated_from_digest(self, monkeypatch):
+        """Test the contract check reads the digest's field types, not the payload"""
+        from validators.core_api_contract import CompiledSchema
+        monkeypatch.setattr(CompiledSchema, "__call__", lambda self, data: pytest.fail("payload re-read"))
+        result = run_preflight("bhiv_core", "WRITE", "artifacts", {**WRITE, "data": "not-an-object"})
+        assert result["contract"]["violations"][0]["field"] == "data"
+
+    def test_read_has_no_contract_channel(self):
+        """Test operations without an input channel skip contract validation"""
+        result = run_preflight("bhiv_core", "READ", "artifacts", {"artifact_id": "a1"})
+        assert result["contract"]["channel"] is None
+        assert result["allowed"] is True
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
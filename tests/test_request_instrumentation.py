@@ -0,0 +1,136 @@
+"""
+Unit Tests for BHIV Bucket Request Instrumentation Middleware
+Tests route classification, in-flight tracking and latency histograms
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from middleware.request_instrumentation import (
+    RequestInstrumentationMiddleware,
+    classify_route,
+    tag_request,
+    READ,
+    WRITE,
+    IGNORE
+)
+from utils.scale_monitor import ScaleMonitor, LatencyHistogram
+
+@pytest.fixture
+def monitor():
+    """Fresh ScaleMonitor per test"""
+    return ScaleMonitor()
+
+@pytest.fixture
+def client(monitor):
+    """Test app wrapped in the instrumentation middleware"""
+    app = FastAPI()
+    seen = {}
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: str):
+        seen["active_reads"] = monitor.active_reads
+        return {"item_id": item_id}
+
+    @app.post("/run-basket")
+    async def write_item():
+        seen["active_writes"] = monitor.active_writes
+        tag_request(basket="daily_check", agent="cashflow_analyzer")
+        return {"ok": True}
+
+    @app.get("/metrics/scale-status")
+    async def metrics():
+        return {}
+
+    app.add_middleware(RequestInstrumentationMiddleware, monitor=monitor)
+    test_client = TestClient(app)
+    test_client.seen = seen
+    return test_client
+
+class TestRouteClassification:
+    """Test read/write classification of main.py routes"""
+
+    def test_get_is_read(self):
+        """Test GET endpoints are reads"""
+        assert classify_route("GET", "/baskets") == READ
+
+    def test_run_basket_is_write(self):
+        """Test basket execution is a write"""
+        assert classify_route("POST", "/run-basket") == WRITE
+        assert classify_route("DELETE", "/baskets/test") == WRITE
+
+    def test_governance_validation_is_read(self):
+        """Test validation-only POST endpoints are reads"""
+        assert classify_route("POST", "/governance/threats/scan") == READ
+        assert classify_route("POST", "/constitutional/core/validate-input") == READ
+
+    def test_integration_approval_is_write(self):
+        """Test integration approval mutates state"""
+        assert classify_route("POST", "/governance/gate/validate-integration") == WRITE
+
+    def test_governance_mutations_are_writes(self):
+        """Test mutating governance routes are not covered by the read-only list"""
+        assert classify_route("DELETE", "/governance/gate/integrations/int-1") == WRITE
+        assert classify_route("POST", "/governance/retention/executor/run") == WRITE
+        assert classify_route("POST", "/governance/some-new-endpoint") == WRITE
+
+    def test_metrics_ignored(self):
+        """Test monitoring endpoints are not tracked"""
+        assert classify_route("GET", "/metrics/scale-status") == IGNORE
+        assert classify_route("OPTIONS", "/run-basket") == IGNORE
+
+class TestInFlightTracking:
+    """Test concurrency counters fed into ScaleMonitor"""
+
+    def test_write_tracked_in_flight(self, client, monitor):
+        """Test active_writes is incremented during a write"""
+        response = client.post("/run-basket")
+        assert response.status_code == 200
+        assert client.seen["active_writes"] == 1
+        assert monitor.active_writes == 0
+        assert monitor.write_rate_per_sec >= 0
+
+    def test_read_tracked_in_flight(self, client, monitor):
+        """Test active_reads is incremented during a read"""
+        client.get("/items/abc")
+        assert client.seen["active_reads"] == 1
+        assert monitor.active_reads == 0
+        assert len(monitor.query_latencies) == 1
+
+    def test_ignored_route_not_tracked(self, client, monitor):
+        """Test metrics scrapes do not count as reads"""
+        client.get("/metrics/scale-status")
+        assert monitor.request_counts["read"] == 0
+        assert len(monitor.query_latencies) == 0
+
+class TestLatencyHistograms:
+    """Test per-route and per-basket/agent histograms"""
+
+    def test_route_template_label(self, client, monitor):
+        """Test path parameters collapse into the route template"""
+        client.get("/items/a")
+        client.get("/items/b")
+        assert monitor.route_latency["GET /items/{item_id}"].count == 2
+
+    def test_unmatched_route(self, client, monitor):
+        """Test unknown paths share one label"""
+        client.get("/does-not-exist")
+        assert monitor.route_latency["GET unmatched"].count == 1
+
+    def test_basket_and_agent_labels(self, client, monitor):
+        """Test handler tags feed basket and agent histograms"""
+        client.post("/run-basket")
+        assert monitor.basket_latency["daily_check"].count == 1
+        assert monitor.agent_latency["cashflow_analyzer"].count == 1
+
+    def test_histogram_quantiles(self):
+        """Test histogram bucket quantile estimation"""
+        histogram = LatencyHistogram()
+        for latency in [2] * 98 + [150, 150]:
+            histogram.observe(latency)
+        assert histogram.quantile(0.5) == 5
+        assert histogram.quantile(0.99) == 200
+        assert histogram.snapshot()["count"] == 100
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
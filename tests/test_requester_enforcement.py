@@ -0,0 +1,197 @@
+"""
+Unit Tests for BHIV Requester Enforcement
+Tests THROTTLE/BLOCK/HALT enforcement keyed by requester_id
+"""
+
+import asyncio
+import time
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from middleware.constitutional.requester_enforcement import (
+    RequesterEnforcer,
+    RequesterEnforcementMiddleware,
+    THROTTLE,
+    BLOCK,
+    HALT,
+    THROTTLE_BURST
+)
+from middleware.admission_control import TokenBucket
+from handlers.core_violation_handler import CoreViolationHandler
+
+class FakeSharedRedis:
+    """Redis stand-in shared by several enforcers; eval runs the throttle bucket"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.buckets = {}
+        self.down = False
+
+    def hset(self, key, field, value):
+        if self.down:
+            raise ConnectionError("redis down")
+        self.hashes.setdefault(key, {})[field] = value
+
+    def hdel(self, key, field):
+        self.hashes.get(key, {}).pop(field, None)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def eval(self, script, numkeys, key, rate, burst):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(rate, burst)
+        wait = bucket.reserve(0.0)
+        return str(-wait if wait < 0 else 0.0)
+
+@pytest.fixture
+def enforcer():
+    """Fresh local-only enforcer per test"""
+    return RequesterEnforcer()
+
+@pytest.fixture
+def client(enforcer):
+    """Test app with enforced constitutional and basket routes"""
+    app = FastAPI()
+    calls = {"count": 0}
+
+    @app.post("/constitutional/core/validate-request")
+    async def validate_request(requester_id: str):
+        calls["count"] += 1
+        return {"allowed": True}
+
+    @app.post("/run-basket")
+    async def run_basket():
+        calls["count"] += 1
+        if calls.get("fail"):
+            raise HTTPException(status_code=500, detail="boom")
+        return {"success": True}
+
+    @app.get("/constitutional/status")
+    async def status():
+        return {"status": "active"}
+
+    app.add_middleware(RequesterEnforcementMiddleware, enforcer=enforcer)
+    test_client = TestClient(app)
+    test_client.calls = calls
+    return test_client
+
+class TestRequesterEnforcer:
+    """Test enforcement decisions"""
+
+    def test_unknown_requester_allowed(self, enforcer):
+        """Test requesters without enforcement pass"""
+        assert enforcer.check("bhiv_core") is None
+
+    def test_block_denies_until_expiry(self, enforcer):
+        """Test BLOCK is a time-boxed deny list"""
+        enforcer.apply(BLOCK, "bhiv_core_x", duration=60)
+        status_code, retry_after, action = enforcer.check("bhiv_core_x")
+        assert status_code == 403 and action == BLOCK
+        assert 0 < retry_after <= 60
+        enforcer.state["bhiv_core_x"]["until"] = time.time() - 1
+        assert enforcer.check("bhiv_core_x") is None
+        assert "bhiv_core_x" not in enforcer.state
+
+    def test_throttle_rate_limits(self, enforcer):
+        """Test THROTTLE allows a burst then returns 429"""
+        enforcer.apply(THROTTLE, "bhiv_core_x")
+        results = [enforcer.check("bhiv_core_x") for _ in range(THROTTLE_BURST + 1)]
+        assert all(result is None for result in results[:THROTTLE_BURST])
+        assert results[-1][0] == 429
+
+    def test_shared_throttle_honours_burst_across_workers(self):
+        """Test the Redis throttle allows the same burst as the local bucket, shared by workers"""
+        shared = FakeSharedRedis()
+        workers = [RequesterEnforcer(shared), RequesterEnforcer(shared)]
+        workers[0].apply(THROTTLE, "bhiv_core_x")
+        workers[0].sync()
+        workers[1].sync()
+        results = [asyncio.run(workers[i % 2].check_async("bhiv_core_x")) for i in range(THROTTLE_BURST + 1)]
+        assert all(result is None for result in results[:THROTTLE_BURST])
+        assert results[-1][0] == 429 and results[-1][1] > 0
+
+    def test_check_never_calls_redis(self):
+        """Test check() only reads local state, even when Redis is down"""
+        shared = FakeSharedRedis()
+        enforcer = RequesterEnforcer(shared)
+        shared.hgetall = shared.hset = shared.hdel = shared.eval = None  # any call would raise
+        enforcer.apply(BLOCK, "bhiv_core_x")
+        assert enforcer.check("bhiv_core_x")[0] == 403
+
+    def test_sync_merges_unpersisted_changes(self):
+        """Test a change Redis did not accept survives the sync and is written later"""
+        shared = FakeSharedRedis()
+        workers = [RequesterEnforcer(shared), RequesterEnforcer(shared)]
+        workers[1].apply(HALT, "other")
+        workers[1].sync()
+        shared.down = True
+        workers[0].apply(BLOCK, "bhiv_core_x")
+        workers[0].sync()
+        assert set(workers[0].state) == {"bhiv_core_x", "other"}
+        shared.down = False
+        workers[0].sync()
+        assert "bhiv_core_x" in shared.hashes["enforcement:requesters"]
+        workers[1].clear("other")
+        workers[1].sync()
+        workers[0].sync()
+        assert set(workers[0].state) == {"bhiv_core_x"}
+
+    def test_no_downgrade(self, enforcer):
+        """Test a weaker response does not replace an active stronger one"""
+        enforcer.apply(HALT, "bhiv_core_x")
+        enforcer.apply(THROTTLE, "bhiv_core_x")
+        assert enforcer.state["bhiv_core_x"]["action"] == HALT
+
+    def test_handler_applies_enforcement(self, monkeypatch, enforcer):
+        """Test violation handler responses feed the enforcer"""
+        monkeypatch.setattr("handlers.core_violation_handler.requester_enforcer", enforcer)
+        handler = CoreViolationHandler()
+        result = handler.handle_violation("unauthorized_access", "high", {}, "rogue_system")
+        assert result["blocked"]
+        assert enforcer.check("rogue_system")[0] == 403
+
+class TestEnforcementMiddleware:
+    """Test middleware rejects before handlers run"""
+
+    def test_blocked_requester_rejected_before_handler(self, client, enforcer):
+        """Test blocked requester never reaches the validator"""
+        enforcer.apply(BLOCK, "bhiv_core_x")
+        response = client.post("/constitutional/core/validate-request", params={"requester_id": "bhiv_core_x"})
+        assert response.status_code == 403
+        assert "retry-after" in response.headers
+        assert client.calls["count"] == 0
+
+    def test_header_requester(self, client, enforcer):
+        """Test basket endpoints use the X-Requester-Id header"""
+        enforcer.apply(HALT, "bhiv_core_x")
+        response = client.post("/run-basket", headers={"X-Requester-Id": "bhiv_core_x"})
+        assert response.status_code == 503
+        assert client.post("/run-basket", headers={"X-Requester-Id": "other"}).status_code == 200
+
+    def test_unenforced_paths_pass(self, client, enforcer):
+        """Test reporting endpoints are not gated"""
+        enforcer.apply(BLOCK, "bhiv_core_x")
+        response = client.get("/constitutional/status", headers={"X-Requester-Id": "bhiv_core_x"})
+        assert response.status_code == 200
+
+    def test_half_open_probe_closes_breaker(self, client, enforcer):
+        """Test successful probe after cooldown closes the breaker"""
+        enforcer.apply(HALT, "bhiv_core_x")
+        enforcer.state["bhiv_core_x"]["until"] = time.time() - 1
+        response = client.post("/run-basket", headers={"X-Requester-Id": "bhiv_core_x"})
+        assert response.status_code == 200
+        assert "bhiv_core_x" not in enforcer.state
+
+    def test_half_open_probe_failure_reopens(self, enforcer):
+        """Test failed probe re-opens the breaker"""
+        enforcer.apply(HALT, "bhiv_core_x")
+        enforcer.state["bhiv_core_x"]["until"] = time.time() - 1
+        assert enforcer.check("bhiv_core_x") is None
+        assert enforcer.check("bhiv_core_x")[0] == 503  # only one probe at a time
+        enforcer.record_probe_result("bhiv_core_x", 500)
+        assert enforcer.state["bhiv_core_x"]["until"] > time.time()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,58 @@
+"""
+Unit Tests for BHIV Bucket Retention Planning
+Tests single-artifact retention dates and the bulk retention planner
+"""
+
+import pytest
+from datetime import datetime
+from governance.retention import calculate_retention_date, plan_retention
+
+NOW = datetime(2026, 1, 10, 12, 0, 0)
+
+class TestRetentionDate:
+    """Test single artifact retention calculation"""
+
+    def test_periods(self):
+        """Test deletion dates per retention rule"""
+        created = datetime(2026, 1, 1)
+        assert calculate_retention_date("metrics", created)["deletion_date"] == "2026-01-31T00:00:00"
+        assert calculate_retention_date("agent_outputs", created)["retention_period"] == "1 year"
+        assert "minutes_remaining" in calculate_retention_date("agent_state")
+        assert calculate_retention_date("agent_specifications", created)["deletion_date"] == "never"
+        assert calculate_retention_date("unknown", created)["retention_period"] == "unknown"
+
+class TestRetentionPlan:
+    """Test bulk retention planning"""
+
+    def test_summary_counts(self):
+        """Test permanent, unknown, due and scheduled counts"""
+        plan = plan_retention(
+            ["metrics", "agent_state", "agent_specifications", "bogus", "logs_error"],
+            [datetime(2025, 12, 1), datetime(2026, 1, 10, 11, 30), datetime(2020, 1, 1),
+             datetime(2020, 1, 1), datetime(2025, 6, 1)],
+            now=NOW
+        )
+        assert plan["total"] == 5
+        assert plan["permanent"] == 1
+        assert plan["unknown_type"] == 1
+        assert plan["due_now"] == 1
+        assert plan["scheduled"] == 2
+
+    def test_batches_by_day_and_size(self):
+        """Test batches split on deletion day, due boundary and batch size"""
+        created = ["2025-12-01T00:00:00"] * 3 + ["2025-12-11T13:00:00Z"] * 2
+        plan = plan_retention(["metrics"] * 5, created, ids=["a", "b", "c", "d", "e"], now=NOW, batch_size=2)
+        assert [(b["deletion_day"], b["due"], b["ids"]) for b in plan["batches"]] == [
+            ("2025-12-31", True, ["a", "b"]),
+            ("2025-12-31", True, ["c"]),
+            ("2026-01-10", False, ["d", "e"])
+        ]
+        assert [b["batch_id"] for b in plan["batches"]] == [0, 1, 2]
+
+    def test_length_mismatch(self):
+        """Test mismatched columns are rejected"""
+        with pytest.raises(ValueError):
+            plan_retention(["metrics"], [], now=NOW)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
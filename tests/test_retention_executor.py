@@ -0,0 +1,127 @@
+"""
+Unit Tests for BHIV Bucket Retention Executor
+Tests chunked resumable deletes, legal holds and default targets
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from governance.retention_executor import RetentionExecutor, RetentionTarget, default_targets
+
+NOW = datetime(2026, 1, 10)
+
+def _matches(doc, query):
+    for field, condition in query.items():
+        value = doc.get(field)
+        if not isinstance(condition, dict):
+            if value != condition:
+                return False
+            continue
+        for op, operand in condition.items():
+            if op == "$lt" and not (value is not None and value < operand):
+                return False
+            if op == "$gt" and not (value is not None and value > operand):
+                return False
+            if op == "$ne" and value == operand:
+                return False
+            if op == "$in" and value not in operand:
+                return False
+    return True
+
+class FakeCursor(list):
+    def sort(self, field, direction):
+        return FakeCursor(sorted(self, key=lambda doc: doc[field]))
+
+    def limit(self, n):
+        return FakeCursor(self[:n])
+
+class FakeCollection:
+    """Minimal pymongo collection for the executor's queries"""
+
+    def __init__(self, docs=()):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.indexes = []
+
+    def find(self, query, projection=None):
+        return FakeCursor(doc for doc in self.docs.values() if _matches(doc, query))
+
+    def find_one(self, query):
+        return next(iter(self.find(query)), None)
+
+    def delete_many(self, query):
+        ids = [doc["_id"] for doc in self.find(query)]
+        for _id in ids:
+            del self.docs[_id]
+        return SimpleNamespace(deleted_count=len(ids))
+
+    def delete_one(self, query):
+        for doc in self.find(query)[:1]:
+            del self.docs[doc["_id"]]
+
+    def update_one(self, query, update, upsert=False):
+        doc = self.find_one(query) or dict(query)
+        doc.update(update["$set"])
+        self.docs[doc["_id"]] = doc
+
+    def count_documents(self, query):
+        return len(self.find(query))
+
+    def create_index(self, field, **options):
+        self.indexes.append((field, options))
+
+class FakeDB(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+def _logs(count, held=()):
+    old = NOW - timedelta(days=400)
+    return [
+        {"_id": i, "timestamp": old, **({"legal_hold": True} if i in held else {})}
+        for i in range(count)
+    ] + [{"_id": 1000, "timestamp": NOW}]
+
+class TestChunkedDeletes:
+    """Test chunked, resumable retention sweeps"""
+
+    @pytest.mark.asyncio
+    async def test_deletes_expired_and_keeps_holds(self):
+        """Test expired documents are deleted except those on legal hold"""
+        db = FakeDB(logs=FakeCollection(_logs(25, held={3, 17})))
+        executor = RetentionExecutor(db, [RetentionTarget("logs", "timestamp", 365)], chunk_size=10)
+        result = (await executor.run_once(now=NOW))[0]
+        assert result["deleted"] == 23
+        assert result["complete"] and result["backlog"] == 0
+        assert sorted(db["logs"].docs) == [3, 17, 1000]
+        assert executor.stats["logs"]["held"] == 2
+
+    @pytest.mark.asyncio
+    async def test_resume_from_checkpoint(self):
+        """Test an interrupted sweep resumes after the last checkpointed _id"""
+        db = FakeDB(logs=FakeCollection(_logs(25)))
+        executor = RetentionExecutor(db, [RetentionTarget("logs", "timestamp", 365)], chunk_size=10)
+        first = (await executor.run_once(now=NOW, max_chunks=1))[0]
+        assert first["deleted"] == 10 and not first["complete"]
+        assert db["retention_checkpoints"].find_one({"_id": "logs"})["last_id"] == 9
+        assert first["backlog"] == 15
+
+        second = (await executor.run_once(now=NOW))[0]
+        assert second["deleted"] == 15
+        assert db["retention_checkpoints"].find_one({"_id": "logs"}) is None
+
+class TestDefaultTargets:
+    """Test which collections are swept"""
+
+    def test_only_written_collections(self):
+        """Test only db.logs is swept by default; audit logs need an explicit opt-in"""
+        assert [target.collection for target in default_targets(include_audit_logs=False)] == ["logs"]
+        assert [target.collection for target in default_targets(include_audit_logs=True)] == ["logs", "audit_logs"]
+
+    def test_time_field_indexed_without_ttl(self):
+        """Test targets get a plain time-field index, never an expiring one"""
+        db = FakeDB()
+        RetentionExecutor(db, default_targets(include_audit_logs=False)).ensure_indexes()
+        assert db["logs"].indexes == [("timestamp", {})]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,89 @@
+"""
+Unit Tests for BHIV Bucket Singleflight
+Tests call sharing and cancellation hand-over
+"""
+
+import asyncio
+import pytest
+from utils.singleflight import SingleFlight
+
+class TestSingleFlight:
+    """Test per-key call deduplication"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        """Test identical keys share one call while different keys do not"""
+        flights = SingleFlight()
+        calls = []
+
+        async def call(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return value
+
+        results = await asyncio.gather(*(flights.do(k, lambda k=k: call(k)) for k in ("a", "a", "a", "b")))
+        assert results == ["a", "a", "a", "b"]
+        assert sorted(calls) == ["a", "b"] and flights.coalesced == 2
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_leader_running(self):
+        """Test cancelling a waiter cancels only that waiter"""
+        flights = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.03)
+            return "done"
+
+        leader = asyncio.create_task(flights.do("k", call))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flights.do("k", call))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        assert await leader == "done"
+        assert waiter.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_promotes_one_waiter(self):
+        """Test exactly one waiter re-issues the call after the leader is cancelled"""
+        flights = SingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.03)
+            return len(calls)
+
+        leader = asyncio.create_task(flights.do("k", call))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(flights.do("k", call)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await asyncio.gather(*waiters) == [2, 2, 2]
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_leader_base_exception_releases_waiters(self):
+        """Test a leader dying with a non-Exception BaseException does not strand its waiters"""
+        class Abort(BaseException):
+            pass
+
+        flights = SingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            if len(calls) == 1:
+                raise Abort()
+            return "retried"
+
+        leader = asyncio.create_task(flights.do("k", call))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flights.do("k", call))
+        assert await asyncio.wait_for(waiter, 1) == "retried"
+        with pytest.raises(Abort):
+            await leader
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
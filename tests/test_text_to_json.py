@@ -0,0 +1,91 @@
+"""
+Unit Tests for Text-to-JSON Agent
+Tests concurrent endpoint fan-out, JWT caching and health caching
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+from agents.textToJson import text_to_json
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    text_to_json.clear_jwt_cache()
+    text_to_json._health_cache.update(result=None, checked_at=0.0)
+    yield
+
+class SlowClient:
+    """APIClient stand-in where every endpoint takes 50 ms"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def call_endpoint(self, endpoint, method="GET", data=None):
+        self.calls.append(endpoint)
+        await asyncio.sleep(0.05)
+        return {"success": True, "data": endpoint}
+
+class TestFanOut:
+    """Test concurrent endpoint calls"""
+
+    @pytest.mark.asyncio
+    async def test_all_runs_concurrently(self):
+        """Test action=all takes about as long as the slowest call"""
+        client = SlowClient()
+        started = time.monotonic()
+        result = await text_to_json.call_all_endpoints(client, {"action": "all", "spec": {}})
+        assert time.monotonic() - started < 0.2
+        assert list(result["result"]) == ["health", "generate", "evaluate", "iterate", "metrics"]
+        assert result["success"]
+
+    @pytest.mark.asyncio
+    async def test_health_cached_and_skippable(self):
+        """Test health is reused within its TTL and skipped on request"""
+        client = SlowClient()
+        await text_to_json.call_all_endpoints(client, {"action": "metrics"})
+        await text_to_json.call_all_endpoints(client, {"action": "metrics"})
+        result = await text_to_json.call_all_endpoints(client, {"action": "metrics", "skip_health": True})
+        assert client.calls.count("/health") == 1
+        assert "health" not in result["result"]
+
+class TestJWTCache:
+    """Test JWT reuse across invocations"""
+
+    def test_expiry_from_claims(self):
+        """Test token expiry is read from expires_in or the exp claim"""
+        token = "x.eyJleHAiOiAxMDB9.y"  # {"exp": 100}
+        assert text_to_json._token_expiry(token, None) == 100
+        assert text_to_json._token_expiry(token, 60) > time.time()
+
+    @pytest.mark.asyncio
+    async def test_cached_token_skips_authentication(self):
+        """Test a cached, unexpired token is used without re-authenticating"""
+        text_to_json._jwt_cache.update(token="cached", expires_at=time.time() + 3600)
+        async def fake_all(client, input_data):
+            return {"result": {}, "success": client.jwt_token == "cached", "errors": []}
+        with patch.object(text_to_json.APIClient, "authenticate") as authenticate, \
+             patch.object(text_to_json, "call_all_endpoints", fake_all):
+            result = await text_to_json.process({"action": "health"})
+        assert result["success"]
+        authenticate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_401_clears_only_the_cached_token(self):
+        """Test a rejected caller-supplied token leaves the shared cached token alone"""
+        class RejectingClient(SlowClient):
+            def __init__(self, jwt_token):
+                super().__init__()
+                self.jwt_token = jwt_token
+
+            async def call_endpoint(self, endpoint, method="GET", data=None):
+                return {"success": False, "error": "HTTP 401: Unauthorized"}
+
+        text_to_json._jwt_cache.update(token="cached", expires_at=time.time() + 3600)
+        await text_to_json.call_all_endpoints(RejectingClient("callers-own"), {"action": "metrics"})
+        assert text_to_json.get_cached_jwt() == "cached"
+        await text_to_json.call_all_endpoints(RejectingClient("cached"), {"action": "metrics"})
+        assert text_to_json.get_cached_jwt() is None
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
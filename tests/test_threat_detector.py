@@ -63,6 +63,14 @@ class TestMetadataPoisoningDetection:
         metadata = {"content": "<script>alert('xss')</script>"}
         threat = await BucketThreatDetector.detect_metadata_poisoning(metadata)
         assert threat is not None
+    
+    @pytest.mark.asyncio
+    async def test_nested_injection_pattern(self):
+        """Test injection in nested metadata detected"""
+        metadata = {"source": {"tags": ["ok", "Drop  TABLE users"]}}
+        threat = await BucketThreatDetector.detect_metadata_poisoning(metadata)
+        assert threat is not None
+        assert "Injection: source.tags[1]" in threat["details"]["patterns"]
 
 class TestExecutorMisbehaviorDetection:
     """Test T5: Executor misbehavior detection"""
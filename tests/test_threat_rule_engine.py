@@ -0,0 +1,90 @@
+"""
+Unit Tests for BHIV Bucket Threat Rule Engine
+Tests decision table selection and agreement between both detector facades
+"""
+
+import pytest
+from models.threat_rule_engine import ThreatRuleEngine, threat_rule_engine
+from models.threat_detector import BucketThreatDetector
+from utils.threat_validator import BucketThreatModel
+
+class TestDecisionTable:
+    """Test rule selection by present facts"""
+
+    def test_only_rules_with_inputs_run(self):
+        """Test rules missing a required fact are not selected"""
+        rules = threat_rule_engine.applicable_rules(frozenset({"actor", "operation"}))
+        assert {rule.rule_id for rule in rules} == {"T5_EXECUTOR_SCOPE"}
+
+    def test_none_facts_are_absent(self):
+        """Test None values do not trigger rules"""
+        assert threat_rule_engine.evaluate({"actor": "ai_agent", "operation": None}) == []
+
+    def test_table_is_memoized(self):
+        """Test the rule subset is computed once per fact set"""
+        engine = ThreatRuleEngine()
+        engine.evaluate({"operation": "DELETE", "target_type": "audit_log"})
+        engine.evaluate({"operation": "READ", "target_type": "artifact"})
+        assert len(engine._table) == 1
+
+    def test_rule_id_filter(self):
+        """Test evaluation can be restricted to specific rules"""
+        facts = {"actor": "akanksha_parab", "operation": "DELETE"}
+        records = threat_rule_engine.evaluate(facts, ["T6_AI_ESCALATION"])
+        assert records == []
+        assert threat_rule_engine.evaluate(facts)[0]["threat_id"] == "T5_EXECUTOR_OVERRIDE"
+
+class TestFacadeAgreement:
+    """Test both APIs report the same rules"""
+
+    @pytest.mark.asyncio
+    async def test_ai_allowlist_per_facade(self):
+        """Test each facade keeps its own AI allowlist"""
+        assert await BucketThreatDetector.detect_ai_escalation("ai_agent", "CREATE") is None
+        assert await BucketThreatDetector.detect_ai_escalation("ai_agent", "WRITE") is not None
+        assert BucketThreatModel.scan_for_threats({}, {"actor": "ai_agent", "requested_operation": "WRITE"}) == []
+        threats = BucketThreatModel.scan_for_threats({}, {"actor": "ai_agent", "requested_operation": "CREATE"})
+        assert [t["threat_id"] for t in threats] == ["T6_AI_ESCALATION"]
+
+    def test_ai_escalation_without_requested_operation(self):
+        """Test an AI actor with no requested operation is flagged"""
+        threats = BucketThreatModel.scan_for_threats({}, {"actor": "ai_agent", "operation_type": "WRITE"})
+        assert [t["threat_id"] for t in threats] == ["T6_AI_ESCALATION"]
+
+    @pytest.mark.asyncio
+    async def test_cross_product_allowlist_shared(self):
+        """Test product allowlist violations are caught by both facades"""
+        threat = await BucketThreatDetector.detect_cross_product_contamination("AI_ASSISTANT", "MediaArtifact")
+        assert threat["threat_id"] == "T7_CROSS_PRODUCT"
+        threats = BucketThreatModel.scan_for_threats({"product_id": "AI_ASSISTANT", "artifact_type": "MediaArtifact"})
+        assert [t["threat_id"] for t in threats] == ["T7_CROSS_PRODUCT_CONTAMINATION"]
+
+    @pytest.mark.asyncio
+    async def test_missing_product_only_flagged_by_validator(self):
+        """Test the detector ignores unknown/empty products while the validator rejects empty values"""
+        assert await BucketThreatDetector.detect_cross_product_contamination("UNKNOWN", "MediaArtifact") is None
+        assert await BucketThreatDetector.detect_cross_product_contamination("", "") is None
+        assert await BucketThreatDetector.detect_cross_product_contamination("AI_ASSISTANT", None) is not None
+        threats = BucketThreatModel.scan_for_threats({"product_id": "", "artifact_type": "MediaArtifact"})
+        assert [t["threat_id"] for t in threats] == ["T7_CROSS_PRODUCT_CONTAMINATION"]
+        assert BucketThreatModel.scan_for_threats({"product_id": "UNKNOWN", "artifact_type": "MediaArtifact"}) == []
+        threats = BucketThreatModel.scan_for_threats({"product_id": "AI_ASSISTANT", "artifact_type": ""})
+        assert [t["threat_id"] for t in threats] == ["T7_CROSS_PRODUCT_CONTAMINATION"]
+        assert not BucketThreatModel._validate_product_artifact_compatibility("AI_ASSISTANT", None)
+
+    @pytest.mark.asyncio
+    async def test_oversized_metadata_shared(self):
+        """Test oversized metadata fields are poisoning in both facades"""
+        metadata = {"notes": "x" * 20000}
+        assert await BucketThreatDetector.detect_metadata_poisoning(metadata) is not None
+        threats = BucketThreatModel.scan_for_threats({"metadata": metadata})
+        assert "T2_METADATA_POISONING" in [t["threat_id"] for t in threats]
+
+    def test_operation_type_context(self):
+        """Test operation_type drives the audit rule; executor scope is detector-only"""
+        context = {"actor": "akanksha_parab", "operation_type": "DELETE", "target_type": "audit_log"}
+        threat_ids = [t["threat_id"] for t in BucketThreatModel.scan_for_threats({}, context)]
+        assert threat_ids == ["T8_AUDIT_TAMPERING"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
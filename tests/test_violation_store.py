@@ -0,0 +1,102 @@
+"""
+Unit Tests for BHIV Bucket Violation Store
+Tests time-bucketed violation aggregates used by constitutional reports
+"""
+
+import time
+import pytest
+from unittest.mock import Mock
+from utils.violation_store import ViolationStore
+from handlers.core_violation_handler import CoreViolationHandler
+from middleware.constitutional.core_boundary_enforcer import CoreBoundaryEnforcer
+from middleware.constitutional.requester_enforcement import requester_enforcer
+
+class TestViolationStore:
+    """Test bucketed counters and ring buffer"""
+
+    def test_counts_by_dimension(self):
+        """Test counters are maintained per dimension value"""
+        store = ViolationStore("test")
+        store.record({"id": 1}, {"type": "schema_mutation", "severity": "critical"})
+        store.record({"id": 2}, {"type": "schema_mutation", "severity": "high"})
+        summary = store.summarize(24)
+        assert summary["total"] == 2
+        assert summary["by"]["type"] == {"schema_mutation": 2}
+        assert summary["by"]["severity"] == {"critical": 1, "high": 1}
+        assert [event["id"] for event in summary["events"]] == [1, 2]
+
+    def test_window_excludes_old_buckets(self):
+        """Test violations older than the window are not counted"""
+        store = ViolationStore("test")
+        now = time.time()
+        store.record({"id": "old"}, {"type": "a"}, timestamp=now - 5 * 3600)
+        store.record({"id": "new"}, {"type": "a"}, timestamp=now - 60)
+        assert store.summarize(1)["total"] == 1
+        assert store.summarize(1)["events"] == [{"id": "new"}]
+        assert store.summarize(6)["total"] == 2
+
+    def test_partial_first_hour_uses_minute_buckets(self):
+        """Test window edge is resolved at minute granularity"""
+        store = ViolationStore("test")
+        now = time.time()
+        store.record({}, {"type": "a"}, timestamp=now - 2 * 3600 - 600)
+        store.record({}, {"type": "a"}, timestamp=now - 2 * 3600 + 600)
+        assert store.summarize(2)["total"] == 1
+
+    def test_ring_buffer_bounded(self):
+        """Test raw events are bounded while counts stay exact"""
+        store = ViolationStore("test", ring_size=10)
+        for i in range(100):
+            store.record({"id": i}, {"type": "a"})
+        summary = store.summarize(1)
+        assert summary["total"] == 100
+        assert len(summary["events"]) == 10
+
+    def test_old_buckets_pruned(self):
+        """Test buckets beyond the retention window are dropped"""
+        store = ViolationStore("test", max_window_hours=2)
+        now = time.time()
+        store.record({}, {"type": "a"}, timestamp=now - 10 * 3600)
+        store.record({}, {"type": "a"}, timestamp=now)
+        assert len(store.hour_buckets) == 1
+        assert len(store.minute_buckets) == 1
+
+    def test_redis_failure_falls_back(self):
+        """Test local counts are used when Redis errors"""
+        broken = Mock()
+        broken.pipeline.side_effect = ConnectionError("down")
+        broken.lrange.side_effect = ConnectionError("down")
+        store = ViolationStore("test", redis_client=broken)
+        store.record({"id": 1}, {"type": "a"})
+        summary = store.summarize(1)
+        assert summary["total"] == 1
+        assert summary["events"] == [{"id": 1}]
+
+class TestViolationReports:
+    """Test enforcer and handler reports backed by the store"""
+
+    def test_boundary_summary(self):
+        """Test enforcer summary keeps its response shape"""
+        enforcer = CoreBoundaryEnforcer()
+        enforcer.log_violation({"type": "deletion_attempt", "severity": "CRITICAL"})
+        summary = enforcer.get_violation_summary(24)
+        assert summary["total_violations"] == 1
+        assert summary["critical_count"] == 1
+        assert summary["by_type"] == {"deletion_attempt": 1}
+        assert len(enforcer.violation_log) == 1
+
+    def test_handler_report(self):
+        """Test handler report groups by severity, requester and escalation"""
+        handler = CoreViolationHandler()
+        handler.handle_violation("deletion_attempt", "high", {}, "bhiv_core")
+        handler.handle_violation("schema_mutation", "critical", {}, "bhiv_core")
+        report = handler.get_violation_report(24)
+        assert report["total_violations"] == 2
+        assert report["by_severity"] == {"high": 1, "critical": 1}
+        assert report["by_requester"] == {"bhiv_core": 2}
+        assert report["escalations"] == {"advisor": 1, "ceo": 1}
+        assert len(report["violations"]) == 2
+        requester_enforcer.clear("bhiv_core")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,64 @@
+"""
+Unit Tests for Workflow Department Agent Pool
+Tests lazy creation, idle eviction and the pool size bound
+"""
+
+import pytest
+from agents.workflow.agent_pool import DepartmentAgentPool
+
+class Factory:
+    """Records which departments had an agent built"""
+
+    def __init__(self):
+        self.built = []
+
+    def __call__(self, department_id):
+        self.built.append(department_id)
+        return {"department": department_id}
+
+def _pool(**kwargs):
+    factory = Factory()
+    pool = DepartmentAgentPool(factory, **kwargs)
+    pool.register_many([("Eng", "d-eng"), ("Sales", "d-sales"), ("Ops", "d-ops")])
+    return pool, factory
+
+class TestDepartmentAgentPool:
+    """Test department agent pooling"""
+
+    def test_lazy_creation(self):
+        """Test agents are built on first use and reused afterwards"""
+        pool, factory = _pool()
+        assert len(pool) == 0 and factory.built == []
+        assert pool.get("Eng") is pool["Eng"]
+        assert factory.built == ["d-eng"]
+
+    def test_unregistered_departments_rejected(self):
+        """Test only registered departments get agents, consistently with `in`"""
+        pool, factory = _pool()
+        assert pool.get("Nope") is None and "Nope" not in pool
+        with pytest.raises(KeyError):
+            pool["Nope"]
+        assert "Eng" in pool and factory.built == []
+
+    def test_idle_eviction(self):
+        """Test idle agents are dropped and rebuilt on the next use"""
+        pool, factory = _pool(idle_ttl_sec=60)
+        pool.get("Eng")
+        assert pool.evict_idle(now=10 ** 9) == 1
+        assert len(pool) == 0
+        pool.get("Eng")
+        assert factory.built == ["d-eng", "d-eng"]
+
+    def test_max_agents(self):
+        """Test the least recently used agent is evicted beyond the bound"""
+        pool, _ = _pool(max_agents=2)
+        pool.get("Eng")
+        pool.get("Sales")
+        pool.get("Eng")
+        pool.get("Ops")
+        assert pool.get_stats()["active_agents"] == 2
+        assert pool.get_stats()["evicted"] == 1
+        assert "Sales" in pool
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
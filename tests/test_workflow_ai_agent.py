@@ -0,0 +1,142 @@
+"""
+Unit Tests for Workflow AI Agent
+Tests the batched Mongo reads behind task optimization
+"""
+
+import json
+import threading
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from agents.workflow.ai_agent import AIAgent
+
+DEPARTMENT = ObjectId()
+
+def _matches(doc, query):
+    for key, condition in query.items():
+        value = doc.get(key)
+        if isinstance(condition, dict):
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$ne" in condition and value == condition["$ne"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+class FakeCollection:
+    """Records every query and the thread it ran on"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+        self.threads = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        self.threads.append(threading.get_ident())
+        return [doc for doc in self.docs if _matches(doc, query)]
+
+    def find_one(self, query, projection=None):
+        found = self.find(query, projection)
+        return found[0] if found else None
+
+class FakeMongo:
+    def __init__(self, tasks, users):
+        self.db = type("FakeDb", (), {})()
+        self.db.departments = FakeCollection([{"_id": DEPARTMENT}])
+        self.db.tasks = FakeCollection(tasks)
+        self.db.users = FakeCollection(users)
+        self.db.progress = FakeCollection([])
+
+def _user(name):
+    return {"_id": ObjectId(), "name": name, "role": "Engineer", "department": DEPARTMENT}
+
+def _task(title, assignee, due=True, dependencies=()):
+    task = {"_id": ObjectId(), "title": title, "status": "Pending", "priority": "High",
+            "department": DEPARTMENT, "assignee": assignee, "dependencies": list(dependencies)}
+    if due:
+        task["dueDate"] = datetime(2026, 1, 1)
+    return task
+
+def _agent(tasks, users):
+    return AIAgent(str(DEPARTMENT), db=FakeMongo(tasks, users), llm_client=object())
+
+def _assignee_queries(agent):
+    return [query for query in agent.mongo_client.db.users.queries if "_id" in query]
+
+class TestAIAgentOptimization:
+    """Test optimization prompt preparation"""
+
+    @pytest.mark.parametrize("task_count", [1, 25])
+    def test_assignees_resolved_in_one_query(self, task_count):
+        """Test assignees are looked up once with $in whatever the task count"""
+        users = [_user(f"u{i}") for i in range(3)]
+        tasks = [_task(f"t{i}", str(users[i % 3]["_id"])) for i in range(task_count)]
+        agent = _agent(tasks, users)
+
+        prompt = json.loads(agent._prepare_optimization())
+
+        queries = _assignee_queries(agent)
+        assert len(queries) == 1 and "$in" in queries[0]["_id"]
+        assert len(prompt["tasks"]) == task_count
+
+    def test_incomplete_tasks_dropped(self):
+        """Test tasks with a missing or invalid assignee or a missing dueDate are skipped"""
+        user = _user("alice")
+        tasks = [
+            _task("valid", str(user["_id"])),
+            _task("no-assignee", None),
+            _task("bad-assignee", "not-an-object-id"),
+            _task("unknown-assignee", str(ObjectId())),
+            _task("no-due-date", str(user["_id"]), due=False),
+        ]
+        agent = _agent(tasks, [user])
+
+        prompt = json.loads(agent._prepare_optimization())
+
+        assert [task["title"] for task in prompt["tasks"]] == ["valid"]
+        assert prompt["tasks"][0]["assignee"] == "alice"
+        assert len(_assignee_queries(agent)) == 1
+
+    def test_dependency_titles_resolved_in_one_query(self):
+        """Test every task's dependencies are resolved with a single query"""
+        user = _user("alice")
+        first, second = _task("design", str(user["_id"])), _task("review", str(user["_id"]))
+        tasks = [
+            first,
+            second,
+            _task("build", str(user["_id"]), dependencies=[str(first["_id"])]),
+            _task("ship", str(user["_id"]), dependencies=[str(first["_id"]), str(second["_id"]), "not-an-id"]),
+        ]
+        agent = _agent(tasks, [user])
+
+        prompt = json.loads(agent._prepare_optimization())
+
+        dependencies = {task["title"]: task["dependencies"] for task in prompt["tasks"]}
+        assert dependencies["build"] == ["design"]
+        assert dependencies["ship"] == ["design", "review"]
+        dependency_queries = [query for query in agent.mongo_client.db.tasks.queries if "_id" in query]
+        assert len(dependency_queries) == 1
+
+    @pytest.mark.asyncio
+    async def test_mongo_reads_run_off_the_event_loop(self):
+        """Test optimize_tasks does its Mongo work on a worker thread"""
+        user = _user("alice")
+        agent = _agent([_task("valid", str(user["_id"]))], [user])
+        prompts = []
+
+        async def run_llm(prompt):
+            prompts.append(prompt)
+            return {"recommendations": []}
+
+        agent.run_llm = run_llm
+        assert await agent.optimize_tasks() == {"recommendations": []}
+
+        db = agent.mongo_client.db
+        threads = set(db.departments.threads + db.tasks.threads + db.users.threads + db.progress.threads)
+        assert threads and threading.get_ident() not in threads
+        assert len(prompts) == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,96 @@
+"""
+Unit Tests for Workflow LLM Call Coordination
+Tests response caching, coalescing and the concurrency limit with a stub LLM
+"""
+
+import asyncio
+import pytest
+from agents.workflow.llm_cache import LLMCallCoordinator, LLMResponseCache, prompt_key
+
+class StubLLM:
+    """Local stand-in for the Groq completion call"""
+
+    def __init__(self, delay=0.02, cacheable=True):
+        self.delay = delay
+        self.cacheable = cacheable
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, prompt):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return {"recommendations": [{"taskId": prompt}]}, self.cacheable
+
+def _key(prompt):
+    return prompt_key("model", "system", prompt)
+
+class TestLLMCallCoordinator:
+    """Test cached, coalesced and limited LLM calls"""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_llm(self):
+        """Test a repeated prompt is served from cache"""
+        llm, coordinator = StubLLM(), LLMCallCoordinator()
+        first = await coordinator.run(_key("p"), lambda: llm("p"))
+        first["recommendations"].clear()
+        second = await coordinator.run(_key("p"), lambda: llm("p"))
+        assert second == {"recommendations": [{"taskId": "p"}]}
+        assert llm.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_fallback_responses_not_cached(self):
+        """Test error/fallback responses are retried next time"""
+        llm, coordinator = StubLLM(cacheable=False), LLMCallCoordinator()
+        await coordinator.run(_key("p"), lambda: llm("p"))
+        await coordinator.run(_key("p"), lambda: llm("p"))
+        assert llm.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_identical_calls_coalesce(self):
+        """Test concurrent identical prompts share one upstream call"""
+        llm, coordinator = StubLLM(), LLMCallCoordinator()
+        results = await asyncio.gather(*(coordinator.run(_key("p"), lambda: llm("p")) for _ in range(5)))
+        assert llm.calls == 1 and coordinator.coalesced == 4
+        assert all(r == results[0] for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_fail_waiters(self):
+        """Test waiters get a response when the caller making the call is cancelled"""
+        llm, coordinator = StubLLM(delay=0.05), LLMCallCoordinator()
+        leader = asyncio.create_task(coordinator.run(_key("p"), lambda: llm("p")))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(coordinator.run(_key("p"), lambda: llm("p"))) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*waiters)
+        assert results == [{"recommendations": [{"taskId": "p"}]}] * 3
+        assert llm.calls == 2 and coordinator.get_stats()["inflight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """Test distinct prompts never exceed the concurrency limit"""
+        llm, coordinator = StubLLM(), LLMCallCoordinator(max_concurrency=2)
+        await asyncio.gather(*(coordinator.run(_key(str(i)), lambda i=i: llm(str(i))) for i in range(6)))
+        assert llm.calls == 6 and llm.peak == 2
+
+class TestLLMResponseCache:
+    """Test content addressing and cache expiry"""
+
+    def test_changed_prompt_misses(self):
+        """Test a prompt built from changed task state gets a new key"""
+        cache = LLMResponseCache()
+        cache.set(_key("tasks v1"), {"v": 1})
+        assert cache.get(_key("tasks v2")) is None and cache.get(_key("tasks v1")) == {"v": 1}
+
+    def test_ttl(self):
+        """Test expired entries are not served"""
+        cache = LLMResponseCache(ttl_seconds=-1)
+        cache.set(_key("a"), {"v": 1})
+        assert cache.get(_key("a")) is None
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
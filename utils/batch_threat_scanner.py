@@ -0,0 +1,145 @@
+"""
+BHIV Bucket Batch Threat Scanner
+Scans thousands of payloads against the Document 14 detectors in one pass
+Document Reference: 14_bucket_threat_model.md
+
+- Identical payloads are scanned once (content hash over canonical JSON)
+- Context-only detectors (executor override, AI escalation, audit tampering)
+  are evaluated once per batch instead of once per payload
+- Hashing, size classification and scanning all run off the event loop: a
+  worker thread fingerprints the batch and scans small payloads; payloads above
+  POOL_THRESHOLD_BYTES go to a process pool and run in parallel
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Tuple
+from utils.hashing import canonical_json, hash_bytes
+from utils.logger import get_logger
+from utils.threat_validator import BucketThreatModel
+
+logger = get_logger(__name__)
+
+MAX_BATCH_ITEMS = 10000
+POOL_THRESHOLD_BYTES = 1024 * 1024  # 1 MB
+POOL_MAX_WORKERS = 4
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Lazily start the shared process pool (spawn: safe with server threads)"""
+    global _process_pool
+    if _process_pool is None:
+        workers = min(POOL_MAX_WORKERS, multiprocessing.cpu_count())
+        _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        logger.info(f"Batch threat scan process pool started with {workers} workers")
+    return _process_pool
+
+def shutdown_process_pool():
+    """Stop the shared process pool (application shutdown)"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+def _fingerprint_many(items: List[Dict[str, Any]], threshold: int) -> Tuple[List[str], Dict[str, Dict[str, Any]], List[str]]:
+    """Hash every item, keep the first of each duplicate and flag large ones.
+    The canonical JSON encoded for the hash doubles as the size measurement."""
+    hashes, unique, large = [], {}, []
+    for item in items:
+        canonical = canonical_json(item)
+        item_hash = hash_bytes(canonical)
+        hashes.append(item_hash)
+        if item_hash not in unique:
+            unique[item_hash] = item
+            if len(canonical) > threshold:
+                large.append(item_hash)
+    return hashes, unique, large
+
+def _scan_payload(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Payload-only detectors (no context); top-level for process pool pickling"""
+    return BucketThreatModel.scan_for_threats(payload)
+
+def _scan_many(payloads: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    return [_scan_payload(payload) for payload in payloads]
+
+async def scan_batch(items: List[Dict[str, Any]], context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Scan a batch of payloads for threats
+
+    Args:
+        items: Payloads to scan
+        context: Shared operation context (actor, operation_type, target_type, ...)
+
+    Returns:
+        Per-item results (in input order) and aggregate counts
+    """
+    if len(items) > MAX_BATCH_ITEMS:
+        raise ValueError(f"Batch of {len(items)} items exceeds limit of {MAX_BATCH_ITEMS}")
+
+    # Context detectors depend only on the shared context: evaluate once
+    context_threats = BucketThreatModel.scan_for_threats({}, context) if context else []
+
+    # Deduplicate by content hash (in a worker thread: payloads may be multi-MB)
+    hashes, unique, large = await asyncio.to_thread(_fingerprint_many, items, POOL_THRESHOLD_BYTES)
+    offloaded = set(large)
+    small = [item_hash for item_hash in unique if item_hash not in offloaded]
+
+    loop = asyncio.get_running_loop()
+    scans: Dict[str, List[Dict[str, Any]]] = {}
+
+    async def scan_small():
+        results = await asyncio.to_thread(_scan_many, [unique[h] for h in small])
+        scans.update(zip(small, results))
+
+    async def scan_large(item_hash: str):
+        payload = unique[item_hash]
+        try:
+            scans[item_hash] = await loop.run_in_executor(_get_process_pool(), _scan_payload, payload)
+        except (BrokenProcessPool, OSError) as e:
+            logger.error(f"Process pool unavailable, scanning large payload in thread: {e}")
+            shutdown_process_pool()
+            scans[item_hash] = await asyncio.to_thread(_scan_payload, payload)
+
+    await asyncio.gather(scan_small(), *(scan_large(h) for h in large))
+
+    results = []
+    by_threat: Dict[str, int] = {}
+    by_level: Dict[str, int] = {}
+    items_with_threats = 0
+    items_critical = 0
+
+    for index, item_hash in enumerate(hashes):
+        threats = scans[item_hash] + context_threats
+        has_critical = BucketThreatModel.has_critical_threats(threats)
+        if threats:
+            items_with_threats += 1
+        if has_critical:
+            items_critical += 1
+        for threat in threats:
+            by_threat[threat["threat_id"]] = by_threat.get(threat["threat_id"], 0) + 1
+            by_level[threat["level"]] = by_level.get(threat["level"], 0) + 1
+        results.append({
+            "index": index,
+            "content_hash": item_hash,
+            "threats_detected": len(threats),
+            "has_critical_threats": has_critical,
+            "threats": threats,
+            "recommendation": "BLOCK" if has_critical else "ALLOW"
+        })
+
+    return {
+        "total_items": len(items),
+        "unique_items": len(unique),
+        "duplicates_skipped": len(items) - len(unique),
+        "offloaded_items": len(large),
+        "aggregate": {
+            "items_with_threats": items_with_threats,
+            "items_critical": items_critical,
+            "by_threat_id": by_threat,
+            "by_level": by_level
+        },
+        "results": results
+    }
@@ -0,0 +1,22 @@
+"""
+BHIV Bucket Content Hashing
+Stable hashes of JSON-like payloads, for deduplication and cache keys
+
+Payloads are hashed over their canonical JSON form (sorted keys, no
+whitespace), so equal payloads hash equally whatever their key order.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+def canonical_json(payload: Any) -> bytes:
+    """Canonical JSON encoding of a payload"""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def content_hash(payload: Any) -> str:
+    """Stable hash of a payload's canonical JSON form"""
+    return hash_bytes(canonical_json(payload))
@@ -0,0 +1,142 @@
+"""
+BHIV Bucket Shared HTTP Client
+Pooled HTTP client for agents that call remote APIs
+
+- One keep-alive connection pool per upstream origin (scheme://host:port) with a
+  per-host connection limit and default timeouts; HTTP/2 when the h2 package
+  is installed
+- Identical in-flight requests are coalesced (singleflight): concurrent callers
+  asking the same upstream for the same thing share one call. GET/HEAD are
+  coalesced by default; other methods only when the caller opts in, since they
+  may not be idempotent. A cancelled leader hands the call to one of its
+  waiters (utils/singleflight.py)
+"""
+
+import asyncio
+import json
+import os
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlsplit
+import httpx
+from utils.logger import get_logger
+from utils.singleflight import SingleFlight
+
+logger = get_logger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP_TIMEOUT_SEC = float(os.getenv("HTTP_CLIENT_TIMEOUT_SEC", "30"))
+HTTP_CONNECT_TIMEOUT_SEC = 10.0
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST", "20"))
+HTTP_KEEPALIVE_EXPIRY_SEC = 60.0
+COALESCED_METHODS = frozenset({"GET", "HEAD"})
+
+class SharedHTTPClient:
+    """Per-host pooled httpx clients with request coalescing"""
+
+    def __init__(self, timeout: float = HTTP_TIMEOUT_SEC,
+                 max_connections_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+                 keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY_SEC):
+        self.timeout = httpx.Timeout(timeout, connect=min(timeout, HTTP_CONNECT_TIMEOUT_SEC))
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_connections_per_host,
+            keepalive_expiry=keepalive_expiry
+        )
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._stale_clients: List[httpx.AsyncClient] = []
+        self._flights = SingleFlight()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"requests": 0, "upstream_calls": 0, "errors": 0}
+
+    def _client_for(self, url: str) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Connections belong to the loop that opened them
+            self._retire_clients()
+            self._loop = loop
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=HTTP2_AVAILABLE)
+            self._clients[origin] = client
+        return client
+
+    def _retire_clients(self):
+        """Close the previous loop's clients on that loop, or keep them for aclose()"""
+        clients, self._clients = list(self._clients.values()), {}
+        old_loop = self._loop
+        for client in clients:
+            if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+                asyncio.run_coroutine_threadsafe(client.aclose(), old_loop)
+            else:
+                self._stale_clients.append(client)
+
+    @staticmethod
+    def _request_key(method: str, url: str, json_body: Any, params: Optional[Dict], headers: Optional[Dict]) -> Tuple:
+        body = json.dumps(json_body, sort_keys=True, default=str) if json_body is not None else None
+        return (
+            method, url, body,
+            tuple(sorted((params or {}).items())),
+            tuple(sorted((k.lower(), v) for k, v in (headers or {}).items()))
+        )
+
+    async def request(self, method: str, url: str, *, json: Any = None, params: Optional[Dict] = None,
+                      headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+                      coalesce: Optional[bool] = None) -> httpx.Response:
+        """Send a request through the host's pool, sharing identical in-flight calls"""
+        method = method.upper()
+        client = self._client_for(url)
+        self.stats["requests"] += 1
+        if coalesce is None:
+            coalesce = method in COALESCED_METHODS
+        send = lambda: client.request(method, url, json=json, params=params, headers=headers,
+                                      timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT)
+        if not coalesce:
+            return await self._send(send)
+
+        key = self._request_key(method, url, json, params, headers)
+        return await self._flights.do(key, lambda: self._send(send))
+
+    async def _send(self, send) -> httpx.Response:
+        self.stats["upstream_calls"] += 1
+        try:
+            return await send()
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        """Close every pooled connection"""
+        clients, self._clients = list(self._clients.values()), {}
+        clients += self._stale_clients
+        self._stale_clients = []
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Error closing HTTP client: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "coalesced": self._flights.coalesced,
+            "hosts": sorted(self._clients),
+            "inflight": len(self._flights),
+            "http2": HTTP2_AVAILABLE,
+            "max_connections_per_host": self.limits.max_connections
+        }
+
+# Global shared HTTP client instance
+shared_http_client = SharedHTTPClient()
@@ -0,0 +1,131 @@
+"""
+BHIV Bucket Injection Scanner
+Single-pass multi-pattern matcher for metadata poisoning (T2)
+Document Reference: 14_bucket_threat_model.md
+
+All patterns are compiled into one regex whose alternation is factored as a
+prefix trie, so each position in a string is tried against the trie (not
+against every pattern) and scanning cost grows with input size, not with the
+number of patterns. Spaces in a pattern match any run of whitespace.
+Matching is case-insensitive: a string is lowered at most once (never if it is
+already lowercase) - re.IGNORECASE measured ~5x slower on the trie regex.
+Nested metadata is walked once; UTF-8 sizes are computed without encoding
+ASCII strings.
+"""
+
+import os
+import re
+from typing import Dict, Any, Iterable, List, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_INJECTION_PATTERNS = ("drop table", "delete from", "<script>")
+
+class InjectionScanner:
+    """Compiled multi-pattern matcher over arbitrarily nested metadata"""
+
+    def __init__(self, patterns: Iterable[str] = DEFAULT_INJECTION_PATTERNS):
+        self.patterns = sorted({p.lower() for p in patterns if p and p.strip()})
+        self.regex = re.compile(self._trie_regex(self.patterns)) if self.patterns else None
+
+    @classmethod
+    def from_file(cls, path: str, include_defaults: bool = True) -> "InjectionScanner":
+        """Load one pattern per line (blank lines and # comments ignored)"""
+        with open(path, encoding="utf-8") as f:
+            loaded = [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+        return cls(list(DEFAULT_INJECTION_PATTERNS) + loaded if include_defaults else loaded)
+
+    @staticmethod
+    def _trie_regex(patterns: List[str]) -> str:
+        trie: Dict[str, Any] = {}
+        for pattern in patterns:
+            node = trie
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        def emit(node: Dict[str, Any]) -> str:
+            terminal = "" in node
+            branches, single_chars = [], []
+            for char in sorted(key for key in node if key):
+                token = r"\s+" if char == " " else re.escape(char)
+                child = emit(node[char])
+                if child or char == " ":
+                    branches.append(token + child)
+                else:
+                    single_chars.append(token)
+            if single_chars:
+                branches.append(single_chars[0] if len(single_chars) == 1 else "[" + "".join(single_chars) + "]")
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 and not terminal else "(?:" + "|".join(branches) + ")"
+            if terminal:
+                body += "?"
+            return body
+
+        return emit(trie)
+
+    @staticmethod
+    def utf8_size(value: str) -> int:
+        """UTF-8 byte length without encoding ASCII strings"""
+        return len(value) if value.isascii() else len(value.encode("utf-8", "surrogatepass"))
+
+    def find(self, value: str) -> Optional[str]:
+        """First matching pattern text in a string, or None"""
+        if self.regex is None:
+            return None
+        match = self.regex.search(value if value.islower() else value.lower())
+        return match.group(0) if match else None
+
+    def scan(self, metadata: Any, max_field_bytes: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Walk nested dicts/lists once, matching every string value
+
+        Returns:
+            {"injections": [(path, matched_text)], "oversized": [(path, bytes)],
+             "total_bytes": int, "fields_scanned": int}
+        """
+        injections, oversized = [], []
+        total_bytes = 0
+        fields = 0
+        stack = [("", metadata)]
+
+        while stack:
+            path, value = stack.pop()
+            if isinstance(value, str):
+                fields += 1
+                size = self.utf8_size(value)
+                total_bytes += size
+                if max_field_bytes is not None and size > max_field_bytes:
+                    oversized.append((path, size))
+                matched = self.find(value)
+                if matched is not None:
+                    injections.append((path, matched))
+            elif isinstance(value, dict):
+                for key, child in reversed(list(value.items())):
+                    stack.append((f"{path}.{key}" if path else str(key), child))
+            elif isinstance(value, (list, tuple)):
+                for index in range(len(value) - 1, -1, -1):
+                    stack.append((f"{path}[{index}]", value[index]))
+
+        return {
+            "injections": injections,
+            "oversized": oversized,
+            "total_bytes": total_bytes,
+            "fields_scanned": fields
+        }
+
+def _load_default_scanner() -> InjectionScanner:
+    path = os.getenv("INJECTION_PATTERNS_FILE")
+    if path:
+        try:
+            scanner = InjectionScanner.from_file(path)
+            logger.info(f"Loaded {len(scanner.patterns)} injection patterns from {path}")
+            return scanner
+        except OSError as e:
+            logger.error(f"Failed to load injection patterns from {path}: {e}")
+    return InjectionScanner()
+
+# Global scanner instance
+injection_scanner = _load_default_scanner()
@@ -1,6 +1,18 @@
 import logging
 import logging.handlers
 from pathlib import Path
+from typing import Dict
+
+# Records each file handler failed to write, keyed by log file name
+_dropped_records: Dict[str, int] = {}
+
+class CountingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that counts records it failed to write"""
+
+    def handleError(self, record):
+        name = Path(self.baseFilename).name
+        _dropped_records[name] = _dropped_records.get(name, 0) + 1
+        super().handleError(record)
 
 class AIIntegrationLogger:
     """Centralized logging configuration for AI Integration Platform"""
@@ -37,7 +49,7 @@ class AIIntegrationLogger:
 
         # Main application log file
         app_log_file = self.log_dir / 'application.log'
-        app_handler = logging.handlers.RotatingFileHandler(
+        app_handler = CountingRotatingFileHandler(
             app_log_file, maxBytes=10*1024*1024, backupCount=5
         )
         app_handler.setLevel(logging.DEBUG)
@@ -46,7 +58,7 @@ class AIIntegrationLogger:
 
         # Error log file
         error_log_file = self.log_dir / 'errors.log'
-        error_handler = logging.handlers.RotatingFileHandler(
+        error_handler = CountingRotatingFileHandler(
             error_log_file, maxBytes=5*1024*1024, backupCount=3
         )
         error_handler.setLevel(logging.ERROR)
@@ -55,7 +67,7 @@ class AIIntegrationLogger:
 
         # Execution log file (for basket and agent executions)
         execution_log_file = self.log_dir / 'executions.log'
-        execution_handler = logging.handlers.RotatingFileHandler(
+        execution_handler = CountingRotatingFileHandler(
             execution_log_file, maxBytes=10*1024*1024, backupCount=5
         )
         execution_handler.setLevel(logging.INFO)
@@ -87,5 +99,9 @@ def get_execution_logger():
     """Get the execution-specific logger"""
     return _logging_system.get_execution_logger()
 
+def get_dropped_log_counts() -> Dict[str, int]:
+    """Get number of dropped log records per log file"""
+    return dict(_dropped_records)
+
 # Default logger for backward compatibility
 logger = get_logger(__name__)
\ No newline at end of file
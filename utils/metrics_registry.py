@@ -0,0 +1,216 @@
+"""
+BHIV Bucket Metrics Registry
+Pre-aggregated counters/histograms and OpenMetrics (Prometheus) exposition
+Document Reference: 15_scale_readiness.md (Real-time Monitoring)
+
+Every metric is updated in place on the hot path (request, Redis call, Mongo
+command), so rendering a scrape only walks the existing aggregates - its cost
+depends on the number of series, never on traffic volume.
+"""
+
+import time
+from functools import wraps
+from typing import Dict, Any, List, Tuple
+from pymongo import monitoring
+from utils.logger import get_logger, get_dropped_log_counts
+from utils.scale_monitor import LatencyHistogram, ScaleMonitor
+
+logger = get_logger(__name__)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# (system, operation) -> latency histogram for external dependencies
+DEPENDENCY_LATENCY: Dict[Tuple[str, str], LatencyHistogram] = {}
+DEPENDENCY_ERRORS: Dict[Tuple[str, str], int] = {}
+
+def observe_dependency(system: str, operation: str, latency_ms: float, failed: bool = False):
+    """Record one call to an external dependency (redis, mongodb, ...)"""
+    key = (system, operation)
+    histogram = DEPENDENCY_LATENCY.get(key)
+    if histogram is None:
+        histogram = DEPENDENCY_LATENCY[key] = LatencyHistogram()
+    histogram.observe(latency_ms)
+    if failed:
+        DEPENDENCY_ERRORS[key] = DEPENDENCY_ERRORS.get(key, 0) + 1
+
+def instrument_redis(client):
+    """Time every command a redis-py client sends, counting raised errors.
+
+    Instruments the raw client rather than RedisService's methods, which
+    swallow their own exceptions and call each other (is_connected pings).
+    redis-py has no command listener, so execute_command is wrapped per instance.
+    """
+    execute_command = client.execute_command
+
+    @wraps(execute_command)
+    def timed_execute_command(*args, **options):
+        operation = str(args[0]).lower() if args else "unknown"
+        start = time.perf_counter()
+        failed = False
+        try:
+            return execute_command(*args, **options)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            observe_dependency("redis", operation, (time.perf_counter() - start) * 1000, failed)
+
+    client.execute_command = timed_execute_command
+    return client
+
+class MongoCommandListener(monitoring.CommandListener):
+    """pymongo command listener feeding per-command latency histograms"""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        observe_dependency("mongodb", event.command_name, event.duration_micros / 1000)
+
+    def failed(self, event):
+        observe_dependency("mongodb", event.command_name, event.duration_micros / 1000, failed=True)
+
+# ---------------------------------------------------------------------------
+# OpenMetrics exposition
+# ---------------------------------------------------------------------------
+
+def _escape(value: str) -> str:
+    """Escape a label value per the OpenMetrics text format"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+def _family(lines: List[str], name: str, metric_type: str, help_text: str):
+    lines.append(f"# TYPE {name} {metric_type}")
+    lines.append(f"# HELP {name} {help_text}")
+
+_le_labels_cache: Dict[tuple, List[str]] = {}
+
+def _le_labels(bounds: tuple) -> List[str]:
+    """Pre-rendered le="..." label fragments (seconds) for a bucket layout"""
+    rendered = _le_labels_cache.get(bounds)
+    if rendered is None:
+        rendered = _le_labels_cache[bounds] = [f'le="{bound / 1000!r}"' for bound in bounds] + ['le="+Inf"']
+    return rendered
+
+def _histogram_samples(lines: List[str], name: str, labels: Dict[str, str], histogram: LatencyHistogram):
+    """Emit cumulative bucket samples (seconds) for a LatencyHistogram"""
+    base = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    prefix = f"{name}_bucket{{{base},"
+    cumulative = 0
+    for le, bucket_count in zip(_le_labels(histogram.bounds), histogram.counts):
+        cumulative += bucket_count
+        lines.append(f"{prefix}{le}}} {cumulative}")
+    lines.append(f"{name}_count{{{base}}} {histogram.count}")
+    lines.append(f"{name}_sum{{{base}}} {histogram.total_ms / 1000}")
+
+def _histogram_family(lines: List[str], name: str, help_text: str, label_name: str, histograms: Dict[Any, LatencyHistogram]):
+    _family(lines, name, "histogram", help_text)
+    for key, histogram in histograms.items():
+        labels = dict(zip(label_name, key)) if isinstance(label_name, tuple) else {label_name: key}
+        _histogram_samples(lines, name, labels, histogram)
+
+def render_openmetrics(monitor: ScaleMonitor, event_bus=None, admission=None, governance=None, retention=None) -> str:
+    """Render all registered metrics in OpenMetrics text format"""
+    from config.scale_limits import ScaleLimits
+
+    lines: List[str] = []
+
+    # Scale monitor gauges and counters
+    _family(lines, "bucket_active_writes", "gauge", "In-flight write requests")
+    lines.append(f"bucket_active_writes {monitor.active_writes}")
+    _family(lines, "bucket_active_reads", "gauge", "In-flight read requests")
+    lines.append(f"bucket_active_reads {monitor.active_reads}")
+    _family(lines, "bucket_concurrent_writes_limit", "gauge", "Maximum concurrent writes (doc 15)")
+    lines.append(f"bucket_concurrent_writes_limit {ScaleLimits.MAX_CONCURRENT_WRITES}")
+    _family(lines, "bucket_write_rate_per_second", "gauge", "Completed writes in the last full second")
+    lines.append(f"bucket_write_rate_per_second {monitor.write_rate_per_sec}")
+    _family(lines, "bucket_storage_used_gigabytes", "gauge", "Last reported storage usage")
+    lines.append(f"bucket_storage_used_gigabytes {monitor.total_storage_gb}")
+
+    _family(lines, "bucket_requests", "counter", "Tracked HTTP requests by kind")
+    for kind, count in monitor.request_counts.items():
+        lines.append(f"bucket_requests_total{_labels({'kind': kind})} {count}")
+
+    _histogram_family(lines, "bucket_request_duration_seconds", "HTTP request latency by route",
+                      "route", monitor.route_latency)
+    _histogram_family(lines, "bucket_basket_duration_seconds", "Basket execution latency",
+                      "basket", monitor.basket_latency)
+    _histogram_family(lines, "bucket_agent_duration_seconds", "Agent execution latency",
+                      "agent", monitor.agent_latency)
+
+    # Admission control
+    if admission is not None:
+        _family(lines, "bucket_admission_active", "gauge", "Admitted in-flight requests per route class")
+        for kind, limiter in admission.class_limiters.items():
+            lines.append(f"bucket_admission_active{_labels({'kind': kind})} {limiter.active}")
+        _family(lines, "bucket_admission_queued", "gauge", "Requests waiting for admission per route class")
+        for kind, limiter in admission.class_limiters.items():
+            lines.append(f"bucket_admission_queued{_labels({'kind': kind})} {len(limiter.waiters)}")
+        _family(lines, "bucket_admission_admitted", "counter", "Requests admitted per route class")
+        for kind, stats in admission.stats.items():
+            lines.append(f"bucket_admission_admitted_total{_labels({'kind': kind})} {stats['admitted']}")
+        _family(lines, "bucket_admission_shed", "counter", "Requests shed with 429 per route class")
+        for kind, stats in admission.stats.items():
+            for reason in ("concurrency", "throughput"):
+                lines.append(f"bucket_admission_shed_total{_labels({'kind': kind, 'reason': reason})} {stats['shed_' + reason]}")
+
+    # Governance decision cache
+    if governance is not None:
+        caches = {"operation": governance.operation_decisions, "integration": governance.integration_decisions}
+        _family(lines, "bucket_governance_decision_cache_hits", "counter", "Governance decisions served from cache")
+        for kind, cache in caches.items():
+            lines.append(f"bucket_governance_decision_cache_hits_total{_labels({'kind': kind})} {cache.hits}")
+        _family(lines, "bucket_governance_decision_cache_misses", "counter", "Governance decisions evaluated")
+        for kind, cache in caches.items():
+            lines.append(f"bucket_governance_decision_cache_misses_total{_labels({'kind': kind})} {cache.misses}")
+        _family(lines, "bucket_governance_decision_cache_invalidations", "counter", "Decision cache flushes after rule or approval changes")
+        for kind, cache in caches.items():
+            lines.append(f"bucket_governance_decision_cache_invalidations_total{_labels({'kind': kind})} {cache.invalidations}")
+
+    # Retention executor
+    if retention is not None:
+        _family(lines, "bucket_retention_deleted", "counter", "Documents deleted by retention sweeps")
+        for collection, stats in retention.stats.items():
+            lines.append(f"bucket_retention_deleted_total{_labels({'collection': collection})} {stats['deleted_total']}")
+        _family(lines, "bucket_retention_throughput_docs_per_second", "gauge", "Delete throughput of the last sweep")
+        for collection, stats in retention.stats.items():
+            lines.append(f"bucket_retention_throughput_docs_per_second{_labels({'collection': collection})} {stats['docs_per_sec']}")
+        _family(lines, "bucket_retention_backlog", "gauge", "Expired documents still awaiting deletion")
+        for collection, stats in retention.stats.items():
+            if stats["backlog"] is not None:
+                lines.append(f"bucket_retention_backlog{_labels({'collection': collection})} {stats['backlog']}")
+        _family(lines, "bucket_retention_legal_hold", "gauge", "Expired documents retained by legal hold")
+        for collection, stats in retention.stats.items():
+            if stats["held"] is not None:
+                lines.append(f"bucket_retention_legal_hold{_labels({'collection': collection})} {stats['held']}")
+
+    # External dependencies
+    _histogram_family(lines, "bucket_dependency_duration_seconds", "Redis/MongoDB call latency",
+                      ("system", "operation"), DEPENDENCY_LATENCY)
+    _family(lines, "bucket_dependency_errors", "counter", "Failed Redis/MongoDB calls")
+    for (system, operation), count in DEPENDENCY_ERRORS.items():
+        lines.append(f"bucket_dependency_errors_total{_labels({'system': system, 'operation': operation})} {count}")
+
+    # Event bus
+    if event_bus is not None:
+        _family(lines, "bucket_event_bus_pending", "gauge", "Events currently being delivered")
+        for event_type, pending in event_bus.pending.items():
+            lines.append(f"bucket_event_bus_pending{_labels({'event_type': event_type})} {pending}")
+        _family(lines, "bucket_event_bus_published", "counter", "Events published")
+        for event_type, count in event_bus.published.items():
+            lines.append(f"bucket_event_bus_published_total{_labels({'event_type': event_type})} {count}")
+        _family(lines, "bucket_event_bus_subscribers", "gauge", "Subscribers per event type")
+        for event_type, callbacks in event_bus.subscribers.items():
+            lines.append(f"bucket_event_bus_subscribers{_labels({'event_type': event_type})} {len(callbacks)}")
+
+    # Logging
+    _family(lines, "bucket_log_records_dropped", "counter", "Log records a handler failed to write")
+    for log_file, count in get_dropped_log_counts().items():
+        lines.append(f"bucket_log_records_dropped_total{_labels({'log_file': log_file})} {count}")
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,110 @@
+"""
+BHIV Bucket Payload Estimator
+Streaming JSON size and shape measurement without serializing the payload
+Document Reference: 15_scale_readiness.md (Storage Limits)
+
+Walks a payload once and computes the exact byte length json.dumps() would
+produce (default separators, ensure_ascii=True), plus nesting depth and the
+largest container fan-out. The running size is checked after each container and
+the walk stops as soon as it passes the caller's limit, so checking a near-16 MB artifact against a 10 MB warning
+threshold never builds a multi-megabyte temporary string.
+"""
+
+import math
+from json.encoder import encode_basestring_ascii
+from typing import Dict, Any, Optional
+
+_LITERAL_SIZES = {True: 4, False: 5}  # true / false
+
+def json_string_size(value: str) -> int:
+    """Length of a JSON-encoded string including quotes (ensure_ascii)"""
+    if value.isascii() and value.isprintable():
+        # Printable ASCII only needs escaping for quote and backslash
+        return len(value) + 2 + value.count('"') + value.count("\\")
+    # Control or non-ASCII characters: escape widths vary (\n, é, surrogate pairs)
+    return len(encode_basestring_ascii(value))
+
+def _scalar_size(value: Any) -> int:
+    if value is None:
+        return 4
+    if value is True or value is False:
+        return _LITERAL_SIZES[value]
+    if isinstance(value, int):
+        return len(str(value))
+    if isinstance(value, float):
+        if math.isnan(value):
+            return 3  # NaN
+        if math.isinf(value):
+            return 8 if value > 0 else 9  # Infinity / -Infinity
+        return len(repr(value))
+    # Non-JSON types are measured as if serialized with default=str
+    return json_string_size(str(value))
+
+def _key_size(key: Any) -> int:
+    if isinstance(key, str):
+        return json_string_size(key)
+    if key is None or isinstance(key, (bool, int, float)):
+        return _scalar_size(key) + 2  # json.dumps quotes coerced keys
+    return json_string_size(str(key))
+
+def _container_size(count: int) -> int:
+    """Brackets plus ", " separators"""
+    return 2 + 2 * (count - 1) if count else 2
+
+def estimate_payload(data: Any, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Measure a payload's JSON size and shape in one walk
+
+    Args:
+        data: Payload (dicts, lists, scalars)
+        limit: Stop walking once the size exceeds this many bytes
+
+    Returns:
+        {"json_bytes", "max_depth", "max_fanout", "exceeded"}; json_bytes is a
+        lower bound when exceeded is True
+    """
+    size = 0
+    max_depth = 0
+    max_fanout = 0
+    stack = [(data, 0)]
+
+    while stack:
+        value, depth = stack.pop()
+        if isinstance(value, str):
+            size += json_string_size(value)
+            continue
+        if isinstance(value, dict):
+            size += _container_size(len(value))
+            for key, child in value.items():
+                size += _key_size(key) + 2  # ": "
+                # Strings are sized inline; only containers/scalars go on the stack
+                if type(child) is str:
+                    size += json_string_size(child)
+                else:
+                    stack.append((child, depth + 1))
+        elif isinstance(value, (list, tuple)):
+            size += _container_size(len(value))
+            for child in value:
+                if type(child) is str:
+                    size += json_string_size(child)
+                else:
+                    stack.append((child, depth + 1))
+        else:
+            size += _scalar_size(value)
+            continue
+
+        max_depth = max(max_depth, depth + 1)
+        max_fanout = max(max_fanout, len(value))
+        if limit is not None and size > limit:
+            return {"json_bytes": size, "max_depth": max_depth, "max_fanout": max_fanout, "exceeded": True}
+
+    return {
+        "json_bytes": size,
+        "max_depth": max_depth,
+        "max_fanout": max_fanout,
+        "exceeded": limit is not None and size > limit
+    }
+
+def exceeds_size(data: Any, limit: int) -> bool:
+    """True if the JSON encoding of data is larger than limit bytes"""
+    return estimate_payload(data, limit)["exceeded"]
@@ -4,6 +4,7 @@ import time
 import uuid
 from typing import Dict, List, Optional, Any
 from utils.logger import logger
+from utils.metrics_registry import instrument_redis
 import os
 from datetime import datetime, timedelta
 
@@ -32,6 +33,7 @@ class RedisService:
                 retry_on_timeout=True,
                 health_check_interval=30
             )
+            instrument_redis(self.client)
             
             # Test connection
             self.client.ping()
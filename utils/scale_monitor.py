@@ -5,11 +5,63 @@ Real-time monitoring of scale limits with automated alerts and graceful degradat
 
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
+from collections import deque
+from bisect import bisect_left
 from utils.logger import get_logger
 import asyncio
+import time
 
 logger = get_logger(__name__)
 
+# Histogram bucket upper bounds in milliseconds (aligned with doc 15 latency targets)
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 200, 500, 1000, 2500, 5000, 10000)
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram, O(log buckets) per observation"""
+    
+    __slots__ = ("bounds", "counts", "count", "total_ms", "max_ms")
+    
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def observe(self, latency_ms: float):
+        """Record a single latency observation"""
+        self.counts[bisect_left(self.bounds, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+    
+    def quantile(self, q: float) -> float:
+        """Estimate quantile as the upper bound of the bucket containing it"""
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.bounds[i] if i < len(self.bounds) else self.max_ms
+        return self.max_ms
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get histogram summary"""
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0,
+            "max_ms": round(self.max_ms, 2),
+            "p50_ms": self.quantile(0.5),
+            "p99_ms": self.quantile(0.99),
+            "buckets": {
+                (f"le_{bound}" if i < len(self.bounds) else "le_inf"): self.counts[i]
+                for i, bound in enumerate(self.bounds + (None,))
+            }
+        }
+
 class ScaleMonitor:
     """Real-time scale monitoring with automated alerts"""
     
@@ -20,7 +72,17 @@ class ScaleMonitor:
         self.active_reads = 0
         self.total_storage_gb = 0
         self.write_rate_per_sec = 0
-        self.query_latencies = []
+        self.query_latencies = deque(maxlen=1000)
+        
+        # Request latency histograms (fed by RequestInstrumentationMiddleware)
+        self.route_latency: Dict[str, LatencyHistogram] = {}
+        self.basket_latency: Dict[str, LatencyHistogram] = {}
+        self.agent_latency: Dict[str, LatencyHistogram] = {}
+        self.request_counts = {"read": 0, "write": 0, "errors": 0}
+        
+        # Completed writes in the current wall-clock second
+        self._write_window_second = 0
+        self._write_window_count = 0
         
     async def track_write_start(self):
         """Track start of write operation"""
@@ -29,6 +91,17 @@ class ScaleMonitor:
     async def track_write_end(self):
         """Track end of write operation"""
         self.active_writes = max(0, self.active_writes - 1)
+        self._count_completed_write()
+    
+    def _count_completed_write(self):
+        """Roll the per-second write counter into write_rate_per_sec"""
+        second = int(time.time())
+        if second != self._write_window_second:
+            # Previous window becomes the current rate; a gap means no writes
+            self.write_rate_per_sec = self._write_window_count if second - self._write_window_second == 1 else 0
+            self._write_window_second = second
+            self._write_window_count = 0
+        self._write_window_count += 1
         
     async def track_read_start(self):
         """Track start of read operation"""
@@ -40,13 +113,44 @@ class ScaleMonitor:
         
     async def record_query_latency(self, latency_ms: float):
         """Record query latency"""
+        # deque(maxlen=1000) keeps only the last 1000 measurements
         self.query_latencies.append({
             "latency_ms": latency_ms,
             "timestamp": datetime.utcnow().isoformat()
         })
-        # Keep only last 1000 measurements
-        if len(self.query_latencies) > 1000:
-            self.query_latencies = self.query_latencies[-1000:]
+    
+    def observe_request(self, route: str, kind: str, latency_ms: float, failed: bool = False):
+        """Record a completed HTTP request in the per-route histogram"""
+        histogram = self.route_latency.get(route)
+        if histogram is None:
+            histogram = self.route_latency[route] = LatencyHistogram()
+        histogram.observe(latency_ms)
+        self.request_counts[kind] = self.request_counts.get(kind, 0) + 1
+        if failed:
+            self.request_counts["errors"] += 1
+    
+    def observe_execution(self, basket: Optional[str] = None, agent: Optional[str] = None, latency_ms: float = 0.0):
+        """Record basket and/or agent execution latency"""
+        if basket:
+            histogram = self.basket_latency.get(basket)
+            if histogram is None:
+                histogram = self.basket_latency[basket] = LatencyHistogram()
+            histogram.observe(latency_ms)
+        if agent:
+            histogram = self.agent_latency.get(agent)
+            if histogram is None:
+                histogram = self.agent_latency[agent] = LatencyHistogram()
+            histogram.observe(latency_ms)
+    
+    async def get_latency_status(self) -> Dict[str, Any]:
+        """Get latency histograms per route, basket and agent"""
+        return {
+            "requests": dict(self.request_counts),
+            "in_flight": {"reads": self.active_reads, "writes": self.active_writes},
+            "routes": {route: h.snapshot() for route, h in self.route_latency.items()},
+            "baskets": {name: h.snapshot() for name, h in self.basket_latency.items()},
+            "agents": {name: h.snapshot() for name, h in self.agent_latency.items()}
+        }
     
     async def get_concurrent_writes_status(self) -> Dict[str, Any]:
         """Get concurrent writes status with thresholds"""
@@ -91,7 +195,7 @@ class ScaleMonitor:
         """Get write throughput status"""
         from config.scale_limits import ScaleLimits
         
-        current = self.write_rate_per_sec
+        current = self.write_rate_per_sec if int(time.time()) - self._write_window_second <= 1 else 0
         limit = ScaleLimits.MAX_WRITE_THROUGHPUT_PER_SEC
         percentage = (current / limit * 100) if limit > 0 else 0
         
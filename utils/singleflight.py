@@ -0,0 +1,79 @@
+"""
+BHIV Bucket Singleflight
+Shares one in-flight call among concurrent callers asking for the same key
+
+- The first caller for a key (the leader) makes the call; callers arriving while
+  it runs wait for its result or exception instead of calling again
+- If the leader is cancelled (or dies with a BaseException such as
+  KeyboardInterrupt), its waiters are not: the first of them to resume
+  re-issues the call as the new leader and the rest join it
+- State is per event loop, since futures belong to the loop that created them
+"""
+
+import asyncio
+from typing import Dict, Any, Awaitable, Callable, Hashable, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def _cancelling() -> bool:
+    """Whether the current task itself has been asked to cancel"""
+    task = asyncio.current_task()
+    return task is not None and task.cancelling() > 0
+
+class SingleFlight:
+    """Per-key deduplication of concurrent async calls"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.coalesced = 0
+
+    def _calls_for_loop(self) -> Dict[Hashable, asyncio.Future]:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._calls = {}
+            self._loop = loop
+        return self._calls
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `call`, or share the result of an identical call already in flight"""
+        while True:
+            leader = self._calls_for_loop().get(key)
+            if leader is None:
+                return await self._lead(key, call)
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(leader)
+            except asyncio.CancelledError:
+                # Only the leader was cancelled: take over instead of failing
+                if not leader.cancelled() or _cancelling():
+                    raise
+                logger.debug(f"Singleflight leader cancelled, re-issuing call for {key!r}")
+
+    async def _lead(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        calls = self._calls
+        future = asyncio.get_running_loop().create_future()
+        # Avoid "exception never retrieved" when nobody joined the call
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        calls[key] = future
+        try:
+            result = await call()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            # KeyboardInterrupt, SystemExit, ...: never leave waiters hanging
+            future.cancel()
+            raise
+        finally:
+            if calls.get(key) is future:
+                del calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
@@ -1,11 +1,15 @@
 """
 BHIV Bucket Threat Validator
 Implements threat detection patterns from Document 14 (Threat Model)
+Detection runs through the shared threat rule engine (models/threat_rule_engine.py)
 """
 
 from typing import Dict, List, Any
-from datetime import datetime
 from utils.logger import get_logger
+from models.threat_rule_engine import (
+    threat_rule_engine, payload_facts, is_valid_owner_id, is_backdated, has_schema_drift, is_large_artifact,
+    MODEL_AI_ALLOWED_OPERATIONS
+)
 
 logger = get_logger(__name__)
 
@@ -21,7 +25,7 @@ class BucketThreatModel:
         },
         "T2_METADATA_POISONING": {
             "severity": "CRITICAL",
-            "patterns": ["forged_owner", "backdated_timestamp", "invalid_integration"],
+            "patterns": ["forged_owner", "backdated_timestamp", "invalid_integration", "injection_pattern"],
             "description": "False provenance metadata"
         },
         "T3_SCHEMA_EVOLUTION": {
@@ -66,6 +70,12 @@ class BucketThreatModel:
         }
     }
     
+    # Rules evaluated by scan_for_threats (storage capacity and executor scope are detector-only checks)
+    SCAN_RULES = tuple(
+        rule.rule_id for rule in threat_rule_engine.rules
+        if rule.rule_id not in ("T1_STORAGE_CAPACITY", "T5_EXECUTOR_SCOPE")
+    )
+    
     @classmethod
     def get_all_threats(cls) -> List[Dict[str, Any]]:
         """Get all threat definitions"""
@@ -96,111 +106,34 @@ class BucketThreatModel:
     @classmethod
     def scan_for_threats(cls, data: Dict[str, Any], context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Scan data for threat patterns with escalation paths"""
-        detected_threats = []
         context = context or {}
+        facts = payload_facts(data)
+        facts.update({
+            "actor": context.get("actor"),
+            "operation": context.get("operation_type"),
+            "requested_operation": context.get("requested_operation"),
+            "target_type": context.get("target_type"),
+            "override_attempted": context.get("override_attempted") or None
+        })
         
-        # T2: Metadata Poisoning Detection
-        if "owner_id" in data and not cls._validate_owner_id(data.get("owner_id")):
-            detected_threats.append({
-                "threat_id": "T2_METADATA_POISONING",
-                "name": "Metadata Poisoning",
-                "level": "critical",
-                "pattern_matched": "forged_owner",
-                "description": "Invalid or forged owner_id detected",
-                "escalation": "CEO",
-                "action": "HALT_OPERATIONS"
-            })
-        
-        # T2: Backdated Timestamp Detection
-        if "timestamp" in data:
-            if cls._is_backdated(data.get("timestamp")):
-                detected_threats.append({
-                    "threat_id": "T2_METADATA_POISONING",
-                    "name": "Backdated Timestamp",
-                    "level": "critical",
-                    "pattern_matched": "backdated_timestamp",
-                    "description": "Timestamp is in the past beyond acceptable threshold",
-                    "escalation": "CEO",
-                    "action": "REJECT_OPERATION"
-                })
-        
-        # T3: Schema Evolution Detection
-        if cls._detect_schema_changes(data):
-            detected_threats.append({
-                "threat_id": "T3_SCHEMA_EVOLUTION",
-                "name": "Schema Drift",
-                "level": "high",
-                "pattern_matched": "new_required_field",
-                "description": "Unexpected schema changes detected",
-                "escalation": "Vijay_Dhawan",
-                "action": "REQUIRE_REVIEW"
-            })
-        
-        # T5: Executor Override Detection
-        if context.get("actor") == "akanksha_parab" and context.get("override_attempted"):
-            detected_threats.append({
-                "threat_id": "T5_EXECUTOR_OVERRIDE",
-                "name": "Executor Authority Violation",
-                "level": "critical",
-                "pattern_matched": "governance_bypass",
-                "description": "Executor attempted action outside defined scope",
-                "escalation": "Vijay_Dhawan",
-                "action": "BLOCK_AND_ESCALATE"
-            })
-        
-        # T6: AI Escalation Detection
-        if context.get("actor", "").startswith("ai_") and context.get("requested_operation") not in ["WRITE", "APPEND_AUDIT"]:
-            detected_threats.append({
-                "threat_id": "T6_AI_ESCALATION",
-                "name": "AI Authority Escalation",
-                "level": "critical",
-                "pattern_matched": "automated_request",
-                "description": f"AI actor requested unauthorized operation: {context.get('requested_operation')}",
-                "escalation": "Vijay_Dhawan",
-                "action": "REJECT_AND_ALERT"
-            })
-        
-        # T7: Cross-Product Contamination
-        if "product_id" in data and "artifact_type" in data:
-            if not cls._validate_product_artifact_compatibility(
-                data.get("product_id"), 
-                data.get("artifact_type")
-            ):
-                detected_threats.append({
-                    "threat_id": "T7_CROSS_PRODUCT_CONTAMINATION",
-                    "name": "Product Artifact Mismatch",
-                    "level": "high",
-                    "pattern_matched": "wrong_product_id",
-                    "description": "Artifact type not allowed for this product",
-                    "escalation": "Security_Team",
-                    "action": "REJECT_OPERATION"
-                })
-        
-        # T8: Audit Tampering Detection
-        if context.get("operation_type") in ["DELETE", "UPDATE"] and context.get("target_type") == "audit_log":
-            detected_threats.append({
-                "threat_id": "T8_AUDIT_TAMPERING",
-                "name": "Audit Trail Tampering Attempt",
-                "level": "critical",
-                "pattern_matched": "log_deletion",
-                "description": "Attempt to modify or delete audit logs",
-                "escalation": "CEO",
-                "action": "HALT_AND_INVESTIGATE"
-            })
-        
-        # T1: Storage Exhaustion (Large Artifact)
-        if cls._is_large_artifact(data):
-            detected_threats.append({
-                "threat_id": "T1_STORAGE_EXHAUSTION",
-                "name": "Large Artifact Warning",
-                "level": "medium",
-                "pattern_matched": "large_artifacts",
-                "description": "Artifact size approaching limit",
-                "escalation": "Ops_Team",
-                "action": "MONITOR"
-            })
-        
-        return detected_threats
+        return cls.scan_facts(facts)
+    
+    @classmethod
+    def scan_facts(cls, facts: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Evaluate pre-extracted threat facts (see models/threat_rule_engine.py)"""
+        facts = {"ai_allowed_operations": MODEL_AI_ALLOWED_OPERATIONS, **facts}
+        return [
+            {
+                "threat_id": record["threat_id"],
+                "name": record["name"],
+                "level": record["severity"].lower(),
+                "pattern_matched": record["pattern"],
+                "description": record["description"],
+                "escalation": record["escalation"],
+                "action": record["action"]
+            }
+            for record in threat_rule_engine.evaluate(facts, cls.SCAN_RULES)
+        ]
     
     @classmethod
     def has_critical_threats(cls, threats: List[Dict[str, Any]]) -> bool:
@@ -223,52 +156,33 @@ class BucketThreatModel:
         
         return matching_threats
     
-    # Private validation methods
+    # Private validation methods (shared with the threat rule engine)
     
     @staticmethod
     def _validate_owner_id(owner_id: str) -> bool:
         """Validate owner_id format"""
-        if not owner_id or not isinstance(owner_id, str):
-            return False
-        # Basic validation: non-empty string
-        return len(owner_id) > 0 and len(owner_id) < 256
+        return is_valid_owner_id(owner_id)
     
     @staticmethod
     def _is_backdated(timestamp: str) -> bool:
         """Check if timestamp is backdated beyond acceptable threshold"""
-        try:
-            if isinstance(timestamp, str):
-                ts = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            else:
-                ts = timestamp
-            
-            now = datetime.now(ts.tzinfo) if ts.tzinfo else datetime.now()
-            # Allow 5 minutes clock skew
-            delta = (now - ts).total_seconds()
-            return delta > 300  # 5 minutes
-        except:
-            return True  # Invalid timestamp format is suspicious
+        return is_backdated(timestamp)
     
     @staticmethod
     def _detect_schema_changes(data: Dict[str, Any]) -> bool:
         """Detect unexpected schema changes"""
-        # Check for suspicious nested structures
-        for key, value in data.items():
-            if isinstance(value, dict) and len(str(value)) > 10000:
-                return True  # Suspiciously large nested object
-        return False
+        return has_schema_drift(data)
     
     @staticmethod
     def _validate_product_artifact_compatibility(product_id: str, artifact_type: str) -> bool:
-        """Validate product can use this artifact type"""
-        # This would check against PRODUCT_RULES in governance_gate.py
-        # For now, basic validation
-        return bool(product_id and artifact_type)
+        """Validate product can use this artifact type (both values must be set)"""
+        return not threat_rule_engine.evaluate(
+            {"product_id": product_id, "artifact_type": artifact_type,
+             "product_artifact_missing": not (product_id and artifact_type)},
+            ("T7_PRODUCT_ARTIFACT", "T7_PRODUCT_ARTIFACT_MISSING")
+        )
     
     @staticmethod
     def _is_large_artifact(data: Dict[str, Any]) -> bool:
         """Check if artifact is approaching size limit"""
-        import sys
-        size = sys.getsizeof(str(data))
-        # Warn if > 10MB (limit is 16MB)
-        return size > 10 * 1024 * 1024
+        return is_large_artifact(data)
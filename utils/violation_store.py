@@ -0,0 +1,172 @@
+"""
+BHIV Bucket Violation Store
+Time-bucketed aggregates and bounded raw history for constitutional violations
+Document Reference: 15_scale_readiness.md (Real-time Monitoring)
+
+Counts by dimension (type, severity, requester, ...) are maintained on insert in
+per-minute and per-hour buckets, so a report for the last N hours reads at most
+N hour buckets plus the minute buckets of the partial first hour, regardless of
+how many violations were ever recorded. Raw events are kept in a ring buffer.
+When a Redis client is attached the aggregates and ring buffer are shared by all
+workers; any Redis failure falls back to the in-process copy.
+"""
+
+import json
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+VIOLATION_RING_SIZE = 1000
+MAX_WINDOW_HOURS = 168  # matches the le=168 bound on /constitutional/violations/*
+
+TOTAL_FIELD = "total"
+
+class ViolationStore:
+    """Per-minute/hour violation counters with a bounded raw-event ring buffer"""
+
+    def __init__(
+        self,
+        name: str,
+        ring_size: int = VIOLATION_RING_SIZE,
+        max_window_hours: int = MAX_WINDOW_HOURS,
+        redis_client=None
+    ):
+        self.name = name
+        self.ring_size = ring_size
+        self.max_window_hours = max_window_hours
+        self.events: deque = deque(maxlen=ring_size)  # (epoch seconds, event)
+        self.minute_buckets: Dict[int, Dict[str, int]] = {}
+        self.hour_buckets: Dict[int, Dict[str, int]] = {}
+        self.redis = redis_client
+
+    def attach_redis(self, redis_client):
+        """Share aggregates and raw events with other workers through Redis"""
+        self.redis = redis_client
+        logger.info(f"Violation store '{self.name}' persisting to Redis")
+
+    def _key(self, suffix: str) -> str:
+        return f"violations:{self.name}:{suffix}"
+
+    def record(self, event: Dict[str, Any], dimensions: Dict[str, str], timestamp: Optional[float] = None):
+        """Store a violation and update the counters of each dimension"""
+        timestamp = time.time() if timestamp is None else timestamp
+        minute = int(timestamp // 60)
+        hour = minute // 60
+        fields = [TOTAL_FIELD] + [f"{dim}|{value}" for dim, value in dimensions.items()]
+
+        retention_hours = self.max_window_hours + 1
+        self.events.append((timestamp, event))
+        for buckets, index, retention in (
+            (self.minute_buckets, minute, retention_hours * 60),
+            (self.hour_buckets, hour, retention_hours)
+        ):
+            bucket = buckets.get(index)
+            if bucket is None:
+                bucket = buckets[index] = {}
+                self._prune(buckets, index - retention)
+            for field in fields:
+                bucket[field] = bucket.get(field, 0) + 1
+
+        if self.redis is not None:
+            try:
+                ttl = retention_hours * 3600
+                pipe = self.redis.pipeline(transaction=False)
+                for key in (self._key(f"m:{minute}"), self._key(f"h:{hour}")):
+                    for field in fields:
+                        pipe.hincrby(key, field, 1)
+                    pipe.expire(key, ttl)
+                pipe.lpush(self._key("events"), json.dumps([timestamp, event], default=str))
+                pipe.ltrim(self._key("events"), 0, self.ring_size - 1)
+                pipe.execute()
+            except Exception as e:
+                logger.error(f"Violation store Redis write failed: {e}")
+
+    @staticmethod
+    def _prune(buckets: Dict[int, Dict[str, int]], oldest: int):
+        """Drop buckets older than the retention window (keys are inserted in time order)"""
+        while buckets:
+            first = next(iter(buckets))
+            if first >= oldest:
+                break
+            del buckets[first]
+
+    def _window_indexes(self, hours: int, now: float):
+        """Minute indexes of the partial first hour and hour indexes fully inside the window"""
+        start = now - hours * 3600
+        start_minute = int(start // 60)
+        start_hour = start_minute // 60
+        minutes = range(start_minute, (start_hour + 1) * 60)
+        hour_range = range(start_hour + 1, int(now // 3600) + 1)
+        return start, minutes, hour_range
+
+    def _aggregate(self, hours: int, now: float) -> Dict[str, int]:
+        _, minutes, hour_range = self._window_indexes(hours, now)
+
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for minute in minutes:
+                    pipe.hgetall(self._key(f"m:{minute}"))
+                for hour in hour_range:
+                    pipe.hgetall(self._key(f"h:{hour}"))
+                buckets = pipe.execute()
+            except Exception as e:
+                logger.error(f"Violation store Redis read failed, using local counts: {e}")
+                buckets = None
+        else:
+            buckets = None
+
+        if buckets is None:
+            buckets = [self.minute_buckets.get(minute) for minute in minutes]
+            buckets += [self.hour_buckets.get(hour) for hour in hour_range]
+
+        totals: Dict[str, int] = {}
+        for bucket in buckets:
+            if bucket:
+                for field, count in bucket.items():
+                    totals[field] = totals.get(field, 0) + int(count)
+        return totals
+
+    def recent(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Raw events (oldest first) recorded at or after since"""
+        entries = None
+        if self.redis is not None:
+            try:
+                entries = [json.loads(raw) for raw in self.redis.lrange(self._key("events"), 0, self.ring_size - 1)]
+                entries.reverse()
+            except Exception as e:
+                logger.error(f"Violation store Redis read failed, using local events: {e}")
+        if entries is None:
+            entries = self.events
+        if since is None:
+            return [event for _, event in entries]
+        return [event for timestamp, event in entries if timestamp >= since]
+
+    def summarize(self, hours: int, include_events: bool = True) -> Dict[str, Any]:
+        """
+        Aggregate counts for the last N hours
+
+        Returns:
+            {"total": int, "by": {dimension: {value: count}}, "events": [...]}
+        """
+        now = time.time()
+        hours = min(hours, self.max_window_hours)
+        start = now - hours * 3600
+
+        by: Dict[str, Dict[str, int]] = {}
+        total = 0
+        for field, count in self._aggregate(hours, now).items():
+            if field == TOTAL_FIELD:
+                total = count
+                continue
+            dim, _, value = field.partition("|")
+            by.setdefault(dim, {})[value] = count
+
+        return {
+            "total": total,
+            "by": by,
+            "events": self.recent(start) if include_events else []
+        }
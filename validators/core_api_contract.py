@@ -11,6 +11,81 @@ from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+CONTRACT_BATCH_MAX_ITEMS = 10000
+
+TYPE_MAP = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict
+}
+
+class CompiledSchema:
+    """
+    Channel schema compiled into a validator
+    
+    Required fields, property types and the additionalProperties flag are
+    resolved once. Calling the schema with a payload returns its violations
+    (empty list when valid); check_field_types does the same from precomputed
+    top-level field types (e.g. RequestDigest.field_types) without reading the
+    payload again.
+    """
+    
+    __slots__ = ("required", "required_set", "field_types", "type_names", "closed")
+    
+    def __init__(self, schema: Dict[str, Any]):
+        self.required = tuple(schema.get("required", []))
+        self.required_set = frozenset(self.required)
+        # field -> python type (None: declared without a known type)
+        self.field_types = {
+            field: TYPE_MAP.get(spec.get("type"))
+            for field, spec in schema.get("properties", {}).items()
+        }
+        self.type_names = {field: spec.get("type") for field, spec in schema.get("properties", {}).items()}
+        self.closed = schema.get("additionalProperties") is False
+    
+    def __call__(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return self.check_field_types({field: type(value) for field, value in data.items()})
+    
+    def check_field_types(self, field_types: Dict[str, type]) -> List[Dict[str, Any]]:
+        violations = []
+        
+        if not self.required_set <= field_types.keys():
+            for field in self.required:
+                if field not in field_types:
+                    violations.append({
+                        "type": ContractViolationType.MISSING_REQUIRED_FIELD.value,
+                        "message": f"Missing required field: {field}",
+                        "severity": "HIGH",
+                        "field": field
+                    })
+        
+        for field, value_type in field_types.items():
+            if field in self.field_types:
+                expected = self.field_types[field]
+                if expected is not None and not issubclass(value_type, expected):
+                    violations.append({
+                        "type": ContractViolationType.INVALID_DATA_TYPE.value,
+                        "message": f"Field {field} has invalid type. Expected {self.type_names[field]}",
+                        "severity": "MEDIUM",
+                        "field": field
+                    })
+            elif self.closed:
+                violations.append({
+                    "type": ContractViolationType.UNAUTHORIZED_FIELD.value,
+                    "message": f"Unauthorized field: {field}",
+                    "severity": "LOW",
+                    "field": field
+                })
+        
+        return violations
+
+def compile_schema(schema: Dict[str, Any]) -> CompiledSchema:
+    """Compile a channel schema into a validator"""
+    return CompiledSchema(schema)
+
 class InputChannel(Enum):
     """Allowed input channels from Core to Bucket"""
     ARTIFACT_WRITE = "artifact_write"
@@ -35,19 +110,29 @@ class ContractViolationType(Enum):
     INVALID_DATA_TYPE = "invalid_data_type"
     UNAUTHORIZED_FIELD = "unauthorized_field"
 
+INPUT_CHANNELS = frozenset(c.value for c in InputChannel)
+OUTPUT_CHANNELS = frozenset(c.value for c in OutputChannel)
+
 class CoreAPIContract:
     """Validates Core requests against published API contract"""
     
     def __init__(self):
         self.input_schemas = self._define_input_schemas()
         self.output_schemas = self._define_output_schemas()
+        self.compile()
         logger.info("Core API Contract initialized")
     
+    def compile(self):
+        """Compile channel schemas into validators (call again after editing schemas)"""
+        self.input_validators = {channel: compile_schema(schema) for channel, schema in self.input_schemas.items()}
+        self.output_validators = {channel: compile_schema(schema) for channel, schema in self.output_schemas.items()}
+    
     def validate_input(
         self,
         channel: str,
         data: Dict[str, Any],
-        requester_id: str
+        requester_id: str,
+        field_types: Optional[Dict[str, type]] = None
     ) -> Dict[str, Any]:
         """
         Validate input from Core against contract
@@ -56,6 +141,7 @@ class CoreAPIContract:
             channel: Input channel being used
             data: Input data payload
             requester_id: ID of requesting system
+            field_types: Precomputed top-level field types (validated instead of data)
             
         Returns:
             Validation result
@@ -80,8 +166,8 @@ class CoreAPIContract:
             return validation_result
         
         # Check 2: Validate against schema
-        schema = self.input_schemas.get(channel)
-        if not schema:
+        validator = self.input_validators.get(channel)
+        if not validator:
             validation_result["violations"].append({
                 "type": ContractViolationType.SCHEMA_MISMATCH.value,
                 "message": f"No schema defined for channel: {channel}",
@@ -90,9 +176,9 @@ class CoreAPIContract:
             return validation_result
         
         # Check 3: Validate required fields
-        schema_validation = self._validate_against_schema(data, schema, "input")
-        if not schema_validation["valid"]:
-            validation_result["violations"].extend(schema_validation["violations"])
+        violations = validator(data) if field_types is None else validator.check_field_types(field_types)
+        if violations:
+            validation_result["violations"].extend(violations)
             return validation_result
         
         # All checks passed
@@ -133,11 +219,11 @@ class CoreAPIContract:
             return validation_result
         
         # Check 2: Validate against schema
-        schema = self.output_schemas.get(channel)
-        if schema:
-            schema_validation = self._validate_against_schema(data, schema, "output")
-            if not schema_validation["valid"]:
-                validation_result["violations"].extend(schema_validation["violations"])
+        validator = self.output_validators.get(channel)
+        if validator:
+            violations = validator(data)
+            if violations:
+                validation_result["violations"].extend(violations)
                 return validation_result
         
         # All checks passed
@@ -145,13 +231,104 @@ class CoreAPIContract:
         
         return validation_result
     
+    def validate_input_many(
+        self,
+        channel: str,
+        items: List[Dict[str, Any]],
+        requester_id: str
+    ) -> Dict[str, Any]:
+        """
+        Validate a batch of inputs from Core on one channel
+        
+        Args:
+            channel: Input channel used by every item
+            items: Input data payloads
+            requester_id: ID of requesting system
+            
+        Returns:
+            Batch result with violations for invalid items only
+        """
+        result = self._validate_many(channel, items, "input")
+        result["requester_id"] = requester_id
+        logger.info(f"Input batch validated for channel {channel}: {result['valid_count']}/{result['total']} valid")
+        return result
+    
+    def validate_output_many(
+        self,
+        channel: str,
+        items: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Validate a batch of outputs to Core on one channel
+        
+        Args:
+            channel: Output channel used by every item
+            items: Output data payloads
+            
+        Returns:
+            Batch result with violations for invalid items only
+        """
+        return self._validate_many(channel, items, "output")
+    
+    def _validate_many(
+        self,
+        channel: str,
+        items: List[Dict[str, Any]],
+        direction: str
+    ) -> Dict[str, Any]:
+        """Validate items on one channel; the channel is checked once for the whole batch"""
+        if len(items) > CONTRACT_BATCH_MAX_ITEMS:
+            raise ValueError(f"Batch of {len(items)} items exceeds limit of {CONTRACT_BATCH_MAX_ITEMS}")
+        
+        result = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "channel": channel,
+            "total": len(items),
+            "valid": False,
+            "valid_count": 0,
+            "invalid_count": len(items),
+            "violations": [],
+            "invalid_items": []
+        }
+        
+        if direction == "input":
+            channel_valid = self._is_valid_input_channel(channel)
+            violation_type = ContractViolationType.INVALID_INPUT_CHANNEL
+            validators = self.input_validators
+        else:
+            channel_valid = self._is_valid_output_channel(channel)
+            violation_type = ContractViolationType.INVALID_OUTPUT_CHANNEL
+            validators = self.output_validators
+        
+        if not channel_valid:
+            result["violations"].append({
+                "type": violation_type.value,
+                "message": f"Invalid {direction} channel: {channel}",
+                "severity": "HIGH"
+            })
+            logger.warning(f"Invalid channel attempted for batch: {channel}")
+            return result
+        
+        validator = validators.get(channel)
+        invalid_items = result["invalid_items"]
+        if validator:
+            for index, data in enumerate(items):
+                violations = validator(data)
+                if violations:
+                    invalid_items.append({"index": index, "violations": violations})
+        
+        result["invalid_count"] = len(invalid_items)
+        result["valid_count"] = len(items) - len(invalid_items)
+        result["valid"] = not invalid_items
+        return result
+    
     def _is_valid_input_channel(self, channel: str) -> bool:
         """Check if input channel is allowed"""
-        return channel in [c.value for c in InputChannel]
+        return channel in INPUT_CHANNELS
     
     def _is_valid_output_channel(self, channel: str) -> bool:
         """Check if output channel is allowed"""
-        return channel in [c.value for c in OutputChannel]
+        return channel in OUTPUT_CHANNELS
     
     def _validate_against_schema(
         self,
@@ -159,42 +336,8 @@ class CoreAPIContract:
         schema: Dict[str, Any],
         direction: str
     ) -> Dict[str, Any]:
-        """Validate data against schema"""
-        violations = []
-        
-        # Check required fields
-        required_fields = schema.get("required", [])
-        for field in required_fields:
-            if field not in data:
-                violations.append({
-                    "type": ContractViolationType.MISSING_REQUIRED_FIELD.value,
-                    "message": f"Missing required field: {field}",
-                    "severity": "HIGH",
-                    "field": field
-                })
-        
-        # Check field types
-        properties = schema.get("properties", {})
-        for field, value in data.items():
-            if field in properties:
-                expected_type = properties[field].get("type")
-                if expected_type and not self._check_type(value, expected_type):
-                    violations.append({
-                        "type": ContractViolationType.INVALID_DATA_TYPE.value,
-                        "message": f"Field {field} has invalid type. Expected {expected_type}",
-                        "severity": "MEDIUM",
-                        "field": field
-                    })
-            else:
-                # Field not in schema - might be unauthorized
-                if schema.get("additionalProperties") is False:
-                    violations.append({
-                        "type": ContractViolationType.UNAUTHORIZED_FIELD.value,
-                        "message": f"Unauthorized field: {field}",
-                        "severity": "LOW",
-                        "field": field
-                    })
-        
+        """Validate data against an uncompiled schema"""
+        violations = compile_schema(schema)(data)
         return {
             "valid": len(violations) == 0,
             "violations": violations
@@ -202,16 +345,7 @@ class CoreAPIContract:
     
     def _check_type(self, value: Any, expected_type: str) -> bool:
         """Check if value matches expected type"""
-        type_map = {
-            "string": str,
-            "integer": int,
-            "number": (int, float),
-            "boolean": bool,
-            "array": list,
-            "object": dict
-        }
-        
-        expected_python_type = type_map.get(expected_type)
+        expected_python_type = TYPE_MAP.get(expected_type)
         if not expected_python_type:
             return True  # Unknown type, allow
         